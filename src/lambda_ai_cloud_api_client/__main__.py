@@ -1,25 +1,102 @@
 import os
 from collections.abc import Callable
+from datetime import datetime
 from functools import wraps
 from http import HTTPStatus
-from typing import TypeVar
+from pathlib import Path
+from typing import TextIO, TypeVar
 
 import click
 from click import UsageError
+from rich import print
 
+from lambda_ai_cloud_api_client.cli.audit import (
+    AUDIT_EVENT_COLUMNS,
+    archive_audit_events,
+    export_audit_events,
+    iter_audit_events,
+    query_audit_events,
+    render_audit_events_table,
+    scan_audit_archive,
+    sync_audit_events,
+)
+from lambda_ai_cloud_api_client.cli.cost import (
+    COST_COLUMNS,
+    enforce_budgets,
+    parse_budget,
+    print_breaches,
+    render_cost_table,
+    report_costs,
+    track_costs,
+)
+from lambda_ai_cloud_api_client.cli.daemon import socket_path
+from lambda_ai_cloud_api_client.cli.daemon_server import daemon_pid, serve, start_daemon, stop_daemon
+from lambda_ai_cloud_api_client.cli.firewall import apply_firewall
+from lambda_ai_cloud_api_client.cli.fleet import apply_fleet
 from lambda_ai_cloud_api_client.cli.get import get_instance
-from lambda_ai_cloud_api_client.cli.images import filter_images, list_images, render_images_table
-from lambda_ai_cloud_api_client.cli.keys import filter_keys, list_keys, render_keys_table
-from lambda_ai_cloud_api_client.cli.ls import filter_instances, list_instances, render_instances_table
+from lambda_ai_cloud_api_client.cli.images import (
+    IMAGE_COLUMNS,
+    filter_images,
+    list_images,
+    list_images_json,
+    list_images_raw,
+    render_images_table,
+)
+from lambda_ai_cloud_api_client.cli.keys import (
+    KEY_COLUMNS,
+    filter_keys,
+    list_keys,
+    list_keys_json,
+    list_keys_raw,
+    render_keys_table,
+)
+from lambda_ai_cloud_api_client.cli.ls import (
+    INSTANCE_COLUMNS,
+    filter_instances,
+    list_instances,
+    list_instances_json,
+    list_instances_raw,
+    render_instances_table,
+)
+from lambda_ai_cloud_api_client.cli.profiling import start_profiling
+from lambda_ai_cloud_api_client.cli.ranking import (
+    COMBINATION_COLUMNS,
+    MAX_INSTANCES,
+    RANK_METRICS,
+    cheapest_combination,
+    pareto_front,
+    parse_requirements,
+    render_combination_table,
+    render_ranked_types_table,
+    score_instance_type,
+)
+from lambda_ai_cloud_api_client.cli.reaper import reap_idle_instances
 from lambda_ai_cloud_api_client.cli.rename import rename_instance
-from lambda_ai_cloud_api_client.cli.response import print_json
+from lambda_ai_cloud_api_client.cli.response import (
+    OUTPUT_FORMATS,
+    print_json,
+    print_output,
+    print_raw_json,
+    resolve_output_format,
+)
 from lambda_ai_cloud_api_client.cli.restart import restart_instances
 from lambda_ai_cloud_api_client.cli.run import run_remote
 from lambda_ai_cloud_api_client.cli.ssh import get_instance_by_name_or_id, ssh_into_instance
 from lambda_ai_cloud_api_client.cli.start import start_instance
 from lambda_ai_cloud_api_client.cli.stop import stop_instances
-from lambda_ai_cloud_api_client.cli.types import filter_instance_types, list_instance_types, render_types_table
-from lambda_ai_cloud_api_client.errors import HttpError
+from lambda_ai_cloud_api_client.cli.timings import print_timings, timings_collector
+from lambda_ai_cloud_api_client.cli.type_index import parse_type_query
+from lambda_ai_cloud_api_client.cli.types import (
+    INSTANCE_TYPE_COLUMNS,
+    RANKED_INSTANCE_TYPE_COLUMNS,
+    filter_instance_types,
+    list_instance_types,
+    list_instance_types_raw,
+    render_types_table,
+)
+from lambda_ai_cloud_api_client.cli.watch import watch_instances
+from lambda_ai_cloud_api_client.cost import REPORT_GROUPS, Budget
+from lambda_ai_cloud_api_client.errors import CircuitOpenError, HttpError
 
 DEFAULT_BASE_URL = os.getenv("LAMBDA_CLOUD_BASE_URL", "https://cloud.lambdalabs.com")
 TOKEN_ENV_VARS = ("LAMBDA_CLOUD_TOKEN", "LAMBDA_CLOUD_API_TOKEN", "LAMBDA_API_TOKEN")
@@ -32,23 +109,49 @@ def raise_error_as_usage_error(f: Callable[..., T]) -> Callable[..., T]:
     def wrapper(*args, **kwargs) -> T:
         try:
             return f(*args, **kwargs)
-        except (HttpError, RuntimeError) as e:
+        except (HttpError, CircuitOpenError, RuntimeError) as e:
             raise UsageError(str(e)) from e
 
     return wrapper
 
 
+def _validate_type_query(ctx: click.Context, param: click.Parameter, value: str | None) -> str | None:
+    # Before any request is made, parsed queries are cached.
+    if value:
+        try:
+            parse_type_query(value)
+        except RuntimeError as e:
+            raise click.BadParameter(str(e)) from e
+    return value
+
+
 def _instance_type_filter_options(func: Callable[..., T]) -> Callable[..., T]:
     func = click.option("--instance-type", help="Instance type name (optional if filters narrow to one).")(func)
     func = click.option("--available", is_flag=True, help="Show only types with available capacity.")(func)
     func = click.option("--cheapest", is_flag=True, help="Show only the cheapest type(s).")(func)
     func = click.option("--region", multiple=True, help="Filter by region (repeat allowed).")(func)
-    func = click.option("--gpu", multiple=True, help="Filter by GPU description substring (repeat allowed).")(func)
+    func = click.option(
+        "--gpu", multiple=True, help="Filter by GPU description substring, case-insensitive (repeat allowed)."
+    )(func)
     func = click.option("--min-gpus", type=int, default=None, help="Minimum GPUs.")(func)
     func = click.option("--min-vcpus", type=int, default=None, help="Minimum vCPUs.")(func)
     func = click.option("--min-memory", type=int, default=None, help="Minimum memory (GiB).")(func)
     func = click.option("--min-storage", type=int, default=None, help="Minimum storage (GiB).")(func)
     func = click.option("--max-price", type=float, default=None, help="Maximum price (cents/hour).")(func)
+    func = click.option(
+        "--where",
+        default=None,
+        callback=_validate_type_query,
+        help="Instance type query, e.g. 'gpus>=8 and gpu~H100 and region in (us-east-1, us-west-1)'. Fields: name, "
+        "gpu, region, gpus, vcpus, memory, storage, price ($/hr) and available.",
+    )(func)
+    func = click.option(
+        "--rank",
+        type=click.Choice(RANK_METRICS),
+        default=None,
+        help="Order by value for money: price per GPU, per GiB of GPU memory or per vCPU. With --cheapest, pick the "
+        "best by it instead of by price.",
+    )(func)
     return func
 
 
@@ -101,27 +204,95 @@ def _start_options(func: Callable[..., T]) -> Callable[..., T]:
     return func
 
 
+def _output_options(func: Callable[..., T]) -> Callable[..., T]:
+    func = click.option("--json", is_flag=True, help="Output raw JSON instead of a table.")(func)
+    func = click.option(
+        "--output",
+        type=click.Choice(OUTPUT_FORMATS),
+        default=None,
+        help="Output format. ndjson writes one compact JSON object per line, csv/tsv/parquet/arrow flatten nested fields "
+        "into columns (parquet/arrow need the [arrow] extra). [default: table]",
+    )(func)
+    return func
+
+
 class OrderedGroup(click.Group):
     def list_commands(self, ctx):
         return self.commands
 
 
 @click.group(cls=OrderedGroup)
-def main() -> None:
+@click.option("--timings", is_flag=True, help="Print the time, size and cache result of every API call to stderr.")
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Print where the command spent its time (import, auth, network, parse, filter, render) to stderr.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="With --profile, also write a cProfile stats file, or a speedscope trace of the phases if it ends in .json.",
+)
+@click.pass_context
+def main(ctx: click.Context, timings: bool, profile: bool, profile_output: Path | None) -> None:
     """Interact with Lambda Cloud from the CLI."""
+    if profile or profile_output:
+        ctx.call_on_close(start_profiling(profile_output))
+    if timings:
+        collector = timings_collector()
+        ctx.call_on_close(lambda: print_timings(collector.calls))
 
 
 @main.command("ls", help="List instances.")
 @click.option("--status", multiple=True, help="Filter by status (repeat to include multiple).")
 @click.option("--region", multiple=True, help="Filter by region (repeat to include multiple).")
-@click.option("--json", is_flag=True, help="Output raw JSON instead of a table.")
+@_output_options
+@click.option("--watch", is_flag=True, help="Keep polling and update the table in place when instances change.")
+@click.option(
+    "--interval-seconds",
+    type=float,
+    default=2,
+    show_default=True,
+    help="Polling interval for --watch.",
+)
+@click.option(
+    "--events-log",
+    type=click.File("a"),
+    default=None,
+    help="With --watch, append launched/status/ip/terminated events as JSON lines to this file ('-' for stdout, the "
+    "table is then drawn on stderr).",
+)
 @raise_error_as_usage_error
-def ls_cmd(status: tuple[str, ...], region: tuple[str, ...], json: bool) -> None:
+def ls_cmd(
+    status: tuple[str, ...],
+    region: tuple[str, ...],
+    json: bool,
+    output: str | None,
+    watch: bool,
+    interval_seconds: float,
+    events_log: TextIO | None,
+) -> None:
+    output = resolve_output_format(json, output)
+    if watch:
+        if output != "table":
+            raise UsageError("--watch only supports table output.")
+        watch_instances(region, status, max(interval_seconds, 0.5), events_log)
+        return
+
+    if output != "table" and not (status or region):
+        # Nothing to filter, pass the API payload through without building models.
+        if output == "json":
+            print_raw_json(list_instances_json())
+        else:
+            print_output(list_instances_raw(), output, INSTANCE_COLUMNS)
+        return
+
     instances = list_instances()
     filtered_instances = filter_instances(instances, region, status)
 
-    if json:
-        print_json([i.to_dict() for i in instances])
+    if output != "table":
+        print_output((i.to_dict() for i in filtered_instances), output, INSTANCE_COLUMNS)
         return
 
     render_instances_table(filtered_instances)
@@ -159,6 +330,8 @@ def start_cmd(
     min_memory: int | None,
     min_storage: int | None,
     max_price: float | None,
+    where: str | None,
+    rank: str | None,
     ssh_key: tuple[str, ...],
     dry_run: bool,
     name: str | None,
@@ -183,6 +356,8 @@ def start_cmd(
         min_memory=min_memory,
         min_storage=min_storage,
         max_price=max_price,
+        where=where,
+        rank=rank,
         ssh_key=ssh_key,
         dry_run=dry_run,
         name=name,
@@ -230,6 +405,98 @@ def stop_cmd(
     print_json([i.to_dict() for i in instances])
 
 
+@main.command(
+    name="reap",
+    short_help="Terminate tagged instances that sit idle.",
+    help="Watch the active instances with the given tags and terminate the ones that stay idle. An instance is idle "
+    "while no one is logged in and its busiest GPU is at or below --gpu-threshold; it gets a wall message --grace-minutes "
+    "before it is terminated. Probes run over one multiplexed SSH connection per instance.",
+)
+@click.option(
+    "--tag",
+    multiple=True,
+    required=True,
+    help="Only instances with this tag, formatted as key=value (repeat to require several).",
+)
+@click.option(
+    "--idle-minutes",
+    type=click.FloatRange(min=0),
+    default=60,
+    show_default=True,
+    help="Terminate instances idle for this long.",
+)
+@click.option(
+    "--grace-minutes",
+    type=click.FloatRange(min=0),
+    default=10,
+    show_default=True,
+    help="Warn logged in users this long before terminating.",
+)
+@click.option(
+    "--gpu-threshold",
+    type=click.FloatRange(min=0, max=100),
+    default=5,
+    show_default=True,
+    help="GPU utilisation in percent at or below which a GPU counts as idle.",
+)
+@click.option(
+    "--interval",
+    "interval_seconds",
+    type=click.FloatRange(min=0, min_open=True),
+    default=300,
+    show_default=True,
+    help="Seconds between samples.",
+)
+@click.option("--samples", type=click.IntRange(min=1), default=None, help="Stop after this many samples.")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Probe this many instances at a time.",
+)
+@click.option("--dry-run", is_flag=True, help="Only report what would be warned and terminated.")
+@raise_error_as_usage_error
+def reap_cmd(
+    tag: tuple[str, ...],
+    idle_minutes: float,
+    grace_minutes: float,
+    gpu_threshold: float,
+    interval_seconds: float,
+    samples: int | None,
+    concurrency: int,
+    dry_run: bool,
+) -> None:
+    reap_idle_instances(
+        tag, idle_minutes, grace_minutes, gpu_threshold, interval_seconds, samples, concurrency, dry_run
+    )
+
+
+@main.command(
+    name="apply",
+    short_help="Bring a fleet of instances in line with a spec file.",
+    help="Launch, rename and terminate instances until the fleet matches FILE, a YAML (needs the [yaml] extra) or "
+    "JSON spec of named instance groups. The fleet's instances are found by their fleet tags, so applying an "
+    "unchanged spec again changes nothing. SSH keys, filesystems, firewall rulesets and images only apply at launch.",
+)
+@click.argument("file", type=click.Path(dir_okay=False, path_type=Path))
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=16,
+    show_default=True,
+    help="Launch and rename this many instances at a time.",
+)
+@click.option("--dry-run", is_flag=True, help="Only print the plan.")
+@raise_error_as_usage_error
+def apply_cmd(
+    file: Path,
+    concurrency: int,
+    dry_run: bool,
+) -> None:
+    apply_fleet(file, dry_run, concurrency)
+
+
 @main.command(name="rename", help="Rename an instance.")
 @click.argument("id")
 @click.argument("name")
@@ -303,6 +570,8 @@ def run_cmd(
     min_memory: int | None,
     min_storage: int | None,
     max_price: float | None,
+    where: str | None,
+    rank: str | None,
     ssh_key: tuple[str, ...],
     dry_run: bool,
     name: str | None,
@@ -322,7 +591,20 @@ def run_cmd(
     # If we haven't set filters then we assume the first arg is the name or id.
     name_or_id = None
     if not any(
-        [instance_type, available, cheapest, region, gpu, min_gpus, min_vcpus, min_memory, min_storage, max_price]
+        [
+            instance_type,
+            available,
+            cheapest,
+            region,
+            gpu,
+            min_gpus,
+            min_vcpus,
+            min_memory,
+            min_storage,
+            max_price,
+            where,
+            rank,
+        ]
     ):
         name_or_id = command[0]
         command = command[1:]
@@ -342,6 +624,8 @@ def run_cmd(
             min_memory=min_memory,
             min_storage=min_storage,
             max_price=max_price,
+            where=where,
+            rank=rank,
             ssh_key=ssh_key,
             dry_run=dry_run,
             name=name,
@@ -376,7 +660,26 @@ def run_cmd(
 
 @main.command(name="types", help="List instance types.")
 @_instance_type_filter_options
-@click.option("--json", is_flag=True, help="Output raw JSON instead of a table.")
+@click.option(
+    "--pareto",
+    is_flag=True,
+    help="Show only the types no other type beats on price and GPUs, GPU memory, vCPUs and memory at once.",
+)
+@click.option(
+    "--need",
+    multiple=True,
+    metavar="RESOURCE=AMOUNT",
+    help="Find the cheapest combination of instances with capacity that adds up to this, e.g. --need gpus=8. "
+    "Resources: gpus, gpu-memory (GiB), vcpus, memory (GiB). Repeat allowed.",
+)
+@click.option(
+    "--max-instances",
+    type=click.IntRange(min=1, max=MAX_INSTANCES),
+    default=8,
+    show_default=True,
+    help="With --need, the most instances a combination may have.",
+)
+@_output_options
 @raise_error_as_usage_error
 def types_cmd(
     instance_type: str | None,
@@ -389,8 +692,37 @@ def types_cmd(
     min_memory: int | None,
     min_storage: int | None,
     max_price: int | None,
+    where: str | None,
+    rank: str | None,
+    pareto: bool,
+    need: tuple[str, ...],
+    max_instances: int,
     json: bool,
+    output: str | None,
 ) -> None:
+    output = resolve_output_format(json, output)
+    requirements = parse_requirements(need)
+    if output != "table" and not any(
+        [
+            instance_type,
+            available,
+            cheapest,
+            region,
+            gpu,
+            min_gpus,
+            min_vcpus,
+            min_memory,
+            min_storage,
+            max_price,
+            where,
+            rank,
+            pareto,
+            requirements,
+        ]
+    ):
+        print_output(list_instance_types_raw(), output, INSTANCE_TYPE_COLUMNS)
+        return
+
     instance_types = list_instance_types()
     instance_types = filter_instance_types(
         instance_types,
@@ -404,10 +736,37 @@ def types_cmd(
         min_memory=min_memory,
         min_storage=min_storage,
         max_price=max_price,
+        where=where,
+        rank=rank,
     )
 
-    if json:
-        print_json([i.to_dict() for i in instance_types])
+    if requirements:
+        with_capacity = [i for i in instance_types if i.regions_with_capacity_available]
+        combination = cheapest_combination(with_capacity, requirements, max_instances)
+        if combination is None:
+            raise RuntimeError(f"No combination of at most {max_instances} instances with capacity meets --need.")
+        if output == "json":
+            print_json(combination.to_dict())
+        elif output != "table":
+            print_output(combination.to_dict()["instances"], output, COMBINATION_COLUMNS)
+        else:
+            render_combination_table(combination)
+        return
+
+    if pareto or rank:
+        scores = [score_instance_type(i) for i in instance_types]
+        if pareto:
+            # Cheapest first, or in --rank order.
+            front = {id(s.item) for s in pareto_front(instance_types)}
+            scores = [s for s in scores if id(s.item) in front] if rank else pareto_front(instance_types)
+        if output != "table":
+            print_output((s.to_dict() for s in scores), output, RANKED_INSTANCE_TYPE_COLUMNS)
+            return
+        render_ranked_types_table(scores, title="Pareto front" if pareto else f"Instance Types by {rank}")
+        return
+
+    if output != "table":
+        print_output((i.to_dict() for i in instance_types), output, INSTANCE_TYPE_COLUMNS)
         return
 
     render_types_table(instance_types)
@@ -434,11 +793,7 @@ def types_cmd(
     multiple=True,
     help="Filter images by region name (repeat to include multiple).",
 )
-@click.option(
-    "--json",
-    is_flag=True,
-    help="Output raw JSON instead of a table.",
-)
+@_output_options
 @raise_error_as_usage_error
 def images_cmd(
     family: tuple[str, ...],
@@ -446,12 +801,21 @@ def images_cmd(
     arch: tuple[str, ...],
     region: tuple[str, ...],
     json: bool,
+    output: str | None,
 ) -> None:
+    output = resolve_output_format(json, output)
+    if output != "table" and not any([family, version, arch, region]):
+        if output == "json":
+            print_raw_json(list_images_json())
+        else:
+            print_output(list_images_raw(), output, IMAGE_COLUMNS)
+        return
+
     images = list_images()
     images = filter_images(images, family, version, arch, region)
 
-    if json:
-        print_json([i.to_dict() for i in images])
+    if output != "table":
+        print_output((i.to_dict() for i in images), output, IMAGE_COLUMNS)
         return
 
     render_images_table(images)
@@ -468,26 +832,377 @@ def images_cmd(
     multiple=True,
     help="Filter key by name (repeat to include multiple).",
 )
-@click.option(
-    "--json",
-    is_flag=True,
-    help="Output raw JSON instead of a table.",
-)
+@_output_options
 @raise_error_as_usage_error
 def ssh_keys_cmd(
     id: tuple[str, ...] | None,
     name: tuple[str, ...] | None,
     json: bool,
+    output: str | None,
 ) -> None:
+    output = resolve_output_format(json, output)
+    if output != "table" and not (id or name):
+        if output == "json":
+            print_raw_json(list_keys_json())
+        else:
+            print_output(list_keys_raw(), output, KEY_COLUMNS)
+        return
+
     keys = list_keys()
     keys = filter_keys(keys, id, name)
 
-    if json:
-        print_json([i.to_dict() for i in keys])
+    if output != "table":
+        print_output((i.to_dict() for i in keys), output, KEY_COLUMNS)
         return
 
     render_keys_table(keys)
 
 
+@main.group(
+    name="audit",
+    cls=OrderedGroup,
+    invoke_without_command=True,
+    short_help="Stream the account's audit events.",
+    help="Stream the account's audit events, or keep a local copy to query offline with `sync` and `query`.",
+)
+@click.option("--start", type=click.DateTime(), default=None, help="Only events at or after this time (UTC).")
+@click.option("--end", type=click.DateTime(), default=None, help="Only events at or before this time (UTC).")
+@click.option("--resource-type", default=None, help="Only events of this resource type, e.g. cloud.instance.")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Split --start..--end into shards and fetch this many shards concurrently, for exporting long periods.",
+)
+@click.option(
+    "--shard-hours",
+    type=click.FloatRange(min=0, min_open=True),
+    default=24,
+    show_default=True,
+    help="With --workers, the length of each shard.",
+)
+@_output_options
+@click.pass_context
+@raise_error_as_usage_error
+def audit_group(
+    ctx: click.Context,
+    start: datetime | None,
+    end: datetime | None,
+    resource_type: str | None,
+    workers: int,
+    shard_hours: float,
+    json: bool,
+    output: str | None,
+) -> None:
+    if ctx.invoked_subcommand is not None:
+        return
+
+    output = resolve_output_format(json, output)
+    if workers > 1:
+        events = export_audit_events(start, end, resource_type, workers, shard_hours)
+    else:
+        events = iter_audit_events(start, end, resource_type)
+
+    if output != "table":
+        print_output((e.to_dict() for e in events), output, AUDIT_EVENT_COLUMNS)
+        return
+
+    render_audit_events_table(events)
+
+
+_audit_db_option = click.option(
+    "--db",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="The local audit store. [default: $LAMBDA_CLOUD_AUDIT_DB or ~/.local/share/lai/audit.sqlite]",
+)
+
+
+@audit_group.command(name="sync", help="Fetch the audit events newer than the last sync into the local store.")
+@_audit_db_option
+@click.option("--since", type=click.DateTime(), default=None, help="On the first sync, start at this time (UTC).")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Fetch day long shards of the missing range this many at a time.",
+)
+@raise_error_as_usage_error
+def audit_sync_cmd(db: Path | None, since: datetime | None, workers: int) -> None:
+    added, total = sync_audit_events(db, since, workers)
+    print(f"Synced {added} new audit events ({total} stored).")
+
+
+@audit_group.command(name="query", help="Search the local audit store, without calling the API.")
+@_audit_db_option
+@click.option("--actor", default=None, help="Only events by this actor LRN.")
+@click.option("--action", default=None, help="Only events with this action, e.g. launched.")
+@click.option("--resource", default=None, help="Only events that affected this resource LRN.")
+@click.option("--resource-type", default=None, help="Only events of this resource type, e.g. cloud.instance.")
+@click.option("--since", type=click.DateTime(), default=None, help="Only events at or after this time (UTC).")
+@click.option("--until", type=click.DateTime(), default=None, help="Only events at or before this time (UTC).")
+@click.option("--limit", type=click.IntRange(min=1), default=None, help="Return at most this many events.")
+@_output_options
+@raise_error_as_usage_error
+def audit_query_cmd(
+    db: Path | None,
+    actor: str | None,
+    action: str | None,
+    resource: str | None,
+    resource_type: str | None,
+    since: datetime | None,
+    until: datetime | None,
+    limit: int | None,
+    json: bool,
+    output: str | None,
+) -> None:
+    output = resolve_output_format(json, output)
+    events = query_audit_events(db, actor, action, resource, resource_type, since, until, limit)
+
+    if output != "table":
+        print_output((e.to_dict() for e in events), output, AUDIT_EVENT_COLUMNS)
+        return
+
+    render_audit_events_table(events)
+
+
+@audit_group.command(name="archive", help="Append audit events to a Parquet archive partitioned by day and resource.")
+@click.argument("root", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--start", type=click.DateTime(), default=None, help="Only events at or after this time (UTC).")
+@click.option("--end", type=click.DateTime(), default=None, help="Only events at or before this time (UTC).")
+@click.option("--resource-type", default=None, help="Only events of this resource type, e.g. cloud.instance.")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Split --start..--end into shards and fetch this many shards concurrently.",
+)
+@click.option(
+    "--shard-hours",
+    type=click.FloatRange(min=0, min_open=True),
+    default=24,
+    show_default=True,
+    help="With --workers, the length of each shard.",
+)
+@raise_error_as_usage_error
+def audit_archive_cmd(
+    root: Path,
+    start: datetime | None,
+    end: datetime | None,
+    resource_type: str | None,
+    workers: int,
+    shard_hours: float,
+) -> None:
+    if workers > 1:
+        events = export_audit_events(start, end, resource_type, workers, shard_hours)
+    else:
+        events = iter_audit_events(start, end, resource_type)
+    count, files = archive_audit_events(events, root)
+    print(f"Archived {count} audit events in {files} files under {root}.")
+
+
+@audit_group.command(name="scan", help="Search a Parquet archive, reading only the partitions the filters match.")
+@click.argument("root", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--actor", default=None, help="Only events by this actor LRN.")
+@click.option("--action", default=None, help="Only events with this action, e.g. launched.")
+@click.option("--resource-type", default=None, help="Only events of this resource type, e.g. cloud.instance.")
+@click.option("--since", type=click.DateTime(), default=None, help="Only events at or after this time (UTC).")
+@click.option("--until", type=click.DateTime(), default=None, help="Only events at or before this time (UTC).")
+@_output_options
+@raise_error_as_usage_error
+def audit_scan_cmd(
+    root: Path,
+    actor: str | None,
+    action: str | None,
+    resource_type: str | None,
+    since: datetime | None,
+    until: datetime | None,
+    json: bool,
+    output: str | None,
+) -> None:
+    output = resolve_output_format(json, output)
+    events = scan_audit_archive(root, actor, action, resource_type, since, until)
+
+    if output != "table":
+        print_output((e.to_dict() for e in events), output, AUDIT_EVENT_COLUMNS)
+        return
+
+    render_audit_events_table(events)
+
+
+def _validate_budgets(ctx: click.Context, param: click.Parameter, value: tuple[str, ...]) -> tuple[Budget, ...]:
+    try:
+        return tuple(parse_budget(raw) for raw in value)
+    except RuntimeError as e:
+        raise click.BadParameter(str(e)) from None
+
+
+def _cost_group_by(ctx: click.Context, param: click.Parameter, value: str) -> str:
+    if value in REPORT_GROUPS or (value.startswith("tag:") and len(value) > 4):
+        return value
+    raise click.BadParameter(f"{value!r} is not one of {', '.join(REPORT_GROUPS)} or tag:<key>.")
+
+
+def _cost_options(func: Callable[..., T]) -> Callable[..., T]:
+    func = click.option(
+        "--db",
+        type=click.Path(dir_okay=False, path_type=Path),
+        default=None,
+        help="The local cost store. [default: $LAMBDA_CLOUD_COST_DB or ~/.local/share/lai/cost.sqlite]",
+    )(func)
+    return func
+
+
+def _budget_options(func: Callable[..., T]) -> Callable[..., T]:
+    func = click.option(
+        "--budget",
+        "budgets",
+        multiple=True,
+        callback=_validate_budgets,
+        help="Cap the lifetime cost of the instances with a tag, as <key>=<value>:<dollars> (repeatable). Instances "
+        "tagged budget=<dollars> are always capped on their own.",
+    )(func)
+    func = click.option(
+        "--terminate",
+        is_flag=True,
+        help="Terminate the running instances of every exceeded budget instead of only warning.",
+    )(func)
+    return func
+
+
+@main.group(
+    name="cost",
+    cls=OrderedGroup,
+    invoke_without_command=True,
+    short_help="Show what the instances have cost so far.",
+    help="Show what the instances have cost so far, as recorded by `lai cost sample`.",
+)
+@_cost_options
+@click.option(
+    "--by",
+    default="instance",
+    show_default=True,
+    callback=_cost_group_by,
+    help="Group by instance, type, region, user (who launched it, needs `sample --audit-db`) or tag:<key>.",
+)
+@_output_options
+@click.pass_context
+@raise_error_as_usage_error
+def cost_group(ctx: click.Context, db: Path | None, by: str, json: bool, output: str | None) -> None:
+    if ctx.invoked_subcommand is not None:
+        return
+
+    output = resolve_output_format(json, output)
+    rows = report_costs(db, by)
+
+    if output != "table":
+        print_output((row.to_dict() for row in rows), output, COST_COLUMNS)
+        return
+
+    render_cost_table(rows, by)
+
+
+@cost_group.command(name="sample", help="List the instances and add the cost since the last sample to the store.")
+@_cost_options
+@click.option(
+    "--audit-db",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="A local audit store (`lai audit sync`) to take launch and termination times and launchers from.",
+)
+@click.option(
+    "--interval",
+    "interval_seconds",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Keep sampling at this interval in seconds until interrupted.",
+)
+@click.option("--samples", type=click.IntRange(min=1), default=None, help="With --interval, stop after this many.")
+@_budget_options
+@raise_error_as_usage_error
+def cost_sample_cmd(
+    db: Path | None,
+    audit_db: Path | None,
+    interval_seconds: float | None,
+    samples: int | None,
+    budgets: tuple[Budget, ...],
+    terminate: bool,
+) -> None:
+    if interval_seconds is None:
+        interval_seconds, samples = 0, 1
+    track_costs(db, audit_db, budgets, terminate, interval_seconds, samples)
+
+
+@cost_group.command(name="enforce", help="Warn about, or terminate, the instances over their budget.")
+@_cost_options
+@_budget_options
+@raise_error_as_usage_error
+def cost_enforce_cmd(db: Path | None, budgets: tuple[Budget, ...], terminate: bool) -> None:
+    breaches, terminated = enforce_budgets(db, budgets, terminate)
+    if not breaches:
+        print("All budgets are within their caps.")
+        return
+    print_breaches(breaches, terminated)
+
+
+@main.group(name="firewall", cls=OrderedGroup, help="Manage inbound firewall rules.")
+def firewall_group() -> None:
+    pass
+
+
+@firewall_group.command(
+    name="apply",
+    short_help="Bring the firewall rules in line with a spec file.",
+    help="Set the account's firewall rules, the global ruleset and named rulesets to the rules in FILE, a YAML (needs "
+    "the [yaml] extra) or JSON spec. Overlapping and adjacent source networks and port ranges are aggregated first, "
+    "and only the rule lists that differ from the current ones are written.",
+)
+@click.argument("file", type=click.Path(dir_okay=False, path_type=Path))
+@click.option("--dry-run", is_flag=True, help="Only print the changes.")
+@raise_error_as_usage_error
+def firewall_apply_cmd(file: Path, dry_run: bool) -> None:
+    apply_firewall(file, dry_run)
+
+
+@main.group(name="daemon", cls=OrderedGroup, help="Keep a warm API client in a background process for faster calls.")
+def daemon_group() -> None:
+    pass
+
+
+@daemon_group.command(name="start", help="Start the daemon in the background.")
+@raise_error_as_usage_error
+def daemon_start_cmd() -> None:
+    pid = start_daemon()
+    print(f"Daemon running (pid {pid}) on {socket_path()}")
+
+
+@daemon_group.command(name="stop", help="Stop the running daemon.")
+@raise_error_as_usage_error
+def daemon_stop_cmd() -> None:
+    pid = stop_daemon()
+    if pid is None:
+        print("No daemon running.")
+        return
+    print(f"Stopped daemon (pid {pid}).")
+
+
+@daemon_group.command(name="status", help="Show whether a daemon is running.")
+def daemon_status_cmd() -> None:
+    pid = daemon_pid()
+    if pid is None:
+        print("No daemon running.")
+        return
+    print(f"Daemon running (pid {pid}) on {socket_path()}")
+
+
+@daemon_group.command(name="serve", help="Run the daemon in the foreground.")
+@raise_error_as_usage_error
+def daemon_serve_cmd() -> None:
+    serve()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,37 @@
+"""The account's audit log: lazy and sharded iteration over the API pages and a local store to query offline.
+
+::
+
+    for event in iter_audit_events(client, start=datetime(2025, 10, 1, tzinfo=timezone.utc)):
+        print(event.event_time, event.action)
+
+    with AuditStore(default_audit_db_path()) as store:
+        store.sync(client)
+        for event in store.query(actor="lrn:cloud:identity:...", since=datetime(2025, 10, 1)):
+            ...
+"""
+
+from .pagination import (
+    afetch_audit_events_page,
+    aiter_audit_event_pages,
+    aiter_audit_events,
+    export_audit_events,
+    fetch_audit_events_page,
+    iter_audit_event_pages,
+    iter_audit_events,
+    shard_time_range,
+)
+from .store import AuditStore, default_audit_db_path
+
+__all__ = (
+    "AuditStore",
+    "afetch_audit_events_page",
+    "aiter_audit_event_pages",
+    "aiter_audit_events",
+    "default_audit_db_path",
+    "export_audit_events",
+    "fetch_audit_events_page",
+    "iter_audit_event_pages",
+    "iter_audit_events",
+    "shard_time_range",
+)
@@ -0,0 +1,214 @@
+"""A columnar archive of the audit log, for long-term retention.
+
+Events are written as zstd compressed Parquet files, hive partitioned by day and resource::
+
+    archive/date=2025-10-02/resource_name=instance/part-<uuid>-0.parquet
+
+``service_name``, ``action`` and ``catalog_version`` are dictionary encoded and ``additional_details`` is kept as a
+JSON string column. :func:`read_audit_archive` only opens the partitions a time or resource filter can match, so
+looking into one resource type over a year never reads the other resources' files::
+
+    write_audit_archive(export_audit_events(client, start, end), "archive")
+    table = read_audit_archive("archive", start=start, resource_type="cloud.instance", action="terminated")
+
+Needs the ``[arrow]`` extra.
+"""
+
+import datetime
+import json
+import uuid
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError as e:
+    raise ImportError("pyarrow is required for the audit archive, install lambda-ai-cloud-api-client[arrow].") from e
+
+from ..models import AuditEvent
+
+_DICTIONARY = pa.dictionary(pa.int32(), pa.string())
+_TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+AUDIT_ARCHIVE_SCHEMA = pa.schema(
+    [
+        ("event_id", pa.string()),
+        ("event_time", _TIMESTAMP),
+        ("date", pa.date32()),
+        ("service_name", _DICTIONARY),
+        ("resource_name", pa.string()),
+        ("action", _DICTIONARY),
+        ("catalog_version", _DICTIONARY),
+        ("actor_lrn", pa.string()),
+        ("resource_lrns", pa.list_(pa.string())),
+        ("resource_owner_lrn", pa.string()),
+        ("request_api_key_lrn", pa.string()),
+        ("additional_details", pa.string()),
+    ]
+)
+_PARTITIONING = ds.partitioning(
+    pa.schema([AUDIT_ARCHIVE_SCHEMA.field("date"), AUDIT_ARCHIVE_SCHEMA.field("resource_name")]), flavor="hive"
+)
+_BATCH_SIZE = 10_000
+_EVENT_COLUMNS = [name for name in AUDIT_ARCHIVE_SCHEMA.names if name != "date"]
+_SORT_KEYS = [("event_time", "ascending"), ("event_id", "ascending")]
+
+
+def _timestamp(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(datetime.timezone.utc)
+
+
+def _utc(value: datetime.datetime) -> datetime.datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc)
+
+
+def _record_batch(events: list[tuple[datetime.datetime, AuditEvent]]) -> pa.RecordBatch:
+    columns = {
+        "event_id": [e.event_id for _, e in events],
+        "event_time": [t for t, _ in events],
+        "date": [t.date() for t, _ in events],
+        "service_name": [e.service_name for _, e in events],
+        "resource_name": [e.resource_name for _, e in events],
+        "action": [e.action for _, e in events],
+        "catalog_version": [e.catalog_version for _, e in events],
+        "actor_lrn": [e.actor_lrn for _, e in events],
+        "resource_lrns": [e.resource_lrns for _, e in events],
+        "resource_owner_lrn": [e.resource_owner_lrn for _, e in events],
+        "request_api_key_lrn": [e.request_api_key_lrn for _, e in events],
+        "additional_details": [json.dumps(e.additional_details.to_dict(), separators=(",", ":")) for _, e in events],
+    }
+    return pa.RecordBatch.from_pydict(columns, schema=AUDIT_ARCHIVE_SCHEMA)
+
+
+def _record_batches(events: Iterable[AuditEvent]) -> Iterator[pa.RecordBatch]:
+    # One batch per (date, resource_name) partition: write_dataset refuses a batch that spans more than max_partitions
+    # partitions, which a long export easily does (a year is ~1800 of them).
+    events = iter(events)
+    while chunk := list(islice(events, _BATCH_SIZE)):
+        partitions: dict[tuple[datetime.date, str], list[tuple[datetime.datetime, AuditEvent]]] = {}
+        for event in chunk:
+            time = _timestamp(event.event_time)
+            partitions.setdefault((time.date(), event.resource_name), []).append((time, event))
+        for partition in partitions.values():
+            yield _record_batch(partition)
+
+
+def write_audit_archive(events: Iterable[AuditEvent], root: Path | str, compression: str = "zstd") -> list[Path]:
+    """Append ``events`` to the archive at ``root``, returns the files written.
+
+    Every call writes new files next to the existing ones, archiving the same events twice stores them twice.
+    """
+    written: list[Path] = []
+    file_format = ds.ParquetFileFormat()
+    ds.write_dataset(
+        _record_batches(events),
+        root,
+        schema=AUDIT_ARCHIVE_SCHEMA,
+        format=file_format,
+        file_options=file_format.make_write_options(
+            compression=compression, use_dictionary=["service_name", "action", "catalog_version"]
+        ),
+        partitioning=_PARTITIONING,
+        basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_visitor=lambda file: written.append(Path(file.path)),
+    )
+    return written
+
+
+def _filter(
+    start: datetime.datetime | None,
+    end: datetime.datetime | None,
+    resource_type: str | None,
+    actor: str | None,
+    action: str | None,
+) -> Any:
+    # Conditions on the partition fields (date, resource_name) prune whole directories, the others are pushed down
+    # into the Parquet row group statistics.
+    conditions = []
+    if start is not None:
+        start = _utc(start)
+        conditions += [ds.field("date") >= start.date(), ds.field("event_time") >= pa.scalar(start, _TIMESTAMP)]
+    if end is not None:
+        end = _utc(end)
+        conditions += [ds.field("date") <= end.date(), ds.field("event_time") <= pa.scalar(end, _TIMESTAMP)]
+    if resource_type:
+        service_name, _, resource_name = resource_type.partition(".")
+        conditions += [ds.field("resource_name") == resource_name, ds.field("service_name") == service_name]
+    if actor:
+        conditions.append(ds.field("actor_lrn") == actor)
+    if action:
+        conditions.append(ds.field("action") == action)
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def audit_archive_dataset(root: Path | str) -> ds.Dataset:
+    return ds.dataset(root, schema=AUDIT_ARCHIVE_SCHEMA, format="parquet", partitioning=_PARTITIONING)
+
+
+def read_audit_archive(
+    root: Path | str,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    actor: str | None = None,
+    action: str | None = None,
+    columns: list[str] | None = None,
+) -> pa.Table:
+    """The archived events matching every given filter as an Arrow table, sorted by ``event_time``.
+
+    ``resource_type`` is ``<service>.<resource>``, e.g. ``cloud.instance``. Pass ``columns`` to read only those.
+    """
+    table = audit_archive_dataset(root).to_table(
+        columns=columns, filter=_filter(start, end, resource_type, actor, action)
+    )
+    if "event_time" in table.column_names:
+        table = table.take(pc.sort_indices(table, sort_keys=_SORT_KEYS))
+    return table
+
+
+def _event(row: dict[str, Any]) -> AuditEvent:
+    return AuditEvent.from_dict(
+        {
+            **row,
+            "event_time": row["event_time"].isoformat().replace("+00:00", "Z"),
+            "additional_details": json.loads(row["additional_details"]),
+        }
+    )
+
+
+def iter_audit_archive(
+    root: Path | str,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    actor: str | None = None,
+    action: str | None = None,
+) -> Iterator[AuditEvent]:
+    """The archived events matching every given filter as :class:`AuditEvent`, see :func:`read_audit_archive`.
+
+    Reads one day at a time, so memory use is bounded by the busiest day rather than the whole period.
+    """
+    dataset = audit_archive_dataset(root)
+    expression = _filter(start, end, resource_type, actor, action)
+    days: dict[datetime.date, list[ds.Fragment]] = {}
+    for fragment in dataset.get_fragments(expression):
+        days.setdefault(ds.get_partition_keys(fragment.partition_expression)["date"], []).append(fragment)
+    for _, fragments in sorted(days.items()):
+        table = pa.concat_tables(
+            fragment.to_table(schema=dataset.schema, filter=expression, columns=_EVENT_COLUMNS)
+            for fragment in fragments
+        )
+        for batch in table.take(pc.sort_indices(table, sort_keys=_SORT_KEYS)).to_batches():
+            for row in batch.to_pylist():
+                yield _event(row)
@@ -0,0 +1,219 @@
+"""Walk the pages of the audit log.
+
+``get_audit_events`` returns one page of events at a time. The iterators here follow its ``page_token`` for you and
+yield the events one by one, while the next page is already being fetched::
+
+    for event in iter_audit_events(client, start=datetime(2025, 10, 1, tzinfo=timezone.utc)):
+        print(event.event_time, event.action)
+
+At most two pages are held in memory, the one being consumed and the one being fetched.
+
+Page chains are serial, every page needs the token of the previous one. :func:`export_audit_events` instead splits a
+long time range into shards and walks the shards' page chains concurrently.
+"""
+
+import asyncio
+import datetime
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from ..api.audit_events import get_audit_events
+from ..client import AuthenticatedClient
+from ..models import AuditEvent, AuditEventsPage
+from ..types import UNSET, Unset
+
+
+def _params(
+    start: datetime.datetime | None, end: datetime.datetime | None, resource_type: str | None
+) -> dict[str, datetime.datetime | str | Unset]:
+    return {
+        "start": UNSET if start is None else start,
+        "end": UNSET if end is None else end,
+        "resource_type": resource_type or UNSET,
+    }
+
+
+def fetch_audit_events_page(
+    client: AuthenticatedClient,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    page_token: str | None = None,
+) -> AuditEventsPage:
+    """One page of audit events, raises ``HttpError`` when the API answers with an error."""
+    response = get_audit_events.sync_detailed(
+        client=client, page_token=page_token or UNSET, **_params(start, end, resource_type)
+    )
+    response.raise_for_status()
+    return response.parsed.data
+
+
+async def afetch_audit_events_page(
+    client: AuthenticatedClient,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    page_token: str | None = None,
+) -> AuditEventsPage:
+    response = await get_audit_events.asyncio_detailed(
+        client=client, page_token=page_token or UNSET, **_params(start, end, resource_type)
+    )
+    response.raise_for_status()
+    return response.parsed.data
+
+
+def iter_audit_event_pages(
+    client: AuthenticatedClient,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    page_token: str | None = None,
+    prefetch: bool = True,
+) -> Iterator[AuditEventsPage]:
+    """Every page of audit events from ``page_token`` (or the first page) on, fetching the next page in a background
+    thread while the caller works on the current one."""
+    if not prefetch:
+        while True:
+            page = fetch_audit_events_page(client, start, end, resource_type, page_token)
+            yield page
+            if not page.page_token:
+                return
+            page_token = page.page_token
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lai-audit")
+    future: Future[AuditEventsPage] | None = executor.submit(
+        fetch_audit_events_page, client, start, end, resource_type, page_token
+    )
+    try:
+        while future is not None:
+            page = future.result()
+            future = None
+            if page.page_token:
+                future = executor.submit(fetch_audit_events_page, client, start, end, resource_type, page.page_token)
+            yield page
+    finally:
+        # The caller stopped early (or a page failed), do not wait for a page nobody will read.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_audit_events(
+    client: AuthenticatedClient,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    prefetch: bool = True,
+) -> Iterator[AuditEvent]:
+    """Every audit event between ``start`` and ``end`` (optionally only of ``resource_type``, e.g.
+    ``cloud.instance``), following the pages lazily."""
+    for page in iter_audit_event_pages(client, start, end, resource_type, prefetch=prefetch):
+        yield from page.events
+
+
+async def aiter_audit_event_pages(
+    client: AuthenticatedClient,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    page_token: str | None = None,
+    prefetch: bool = True,
+) -> AsyncIterator[AuditEventsPage]:
+    """Async :func:`iter_audit_event_pages`, the next page is fetched by a task while the current one is consumed."""
+    if not prefetch:
+        while True:
+            page = await afetch_audit_events_page(client, start, end, resource_type, page_token)
+            yield page
+            if not page.page_token:
+                return
+            page_token = page.page_token
+
+    task: asyncio.Task[AuditEventsPage] | None = asyncio.ensure_future(
+        afetch_audit_events_page(client, start, end, resource_type, page_token)
+    )
+    try:
+        while task is not None:
+            page = await task
+            task = None
+            if page.page_token:
+                task = asyncio.ensure_future(
+                    afetch_audit_events_page(client, start, end, resource_type, page.page_token)
+                )
+            yield page
+    finally:
+        if task is not None:
+            task.cancel()
+
+
+async def aiter_audit_events(
+    client: AuthenticatedClient,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    prefetch: bool = True,
+) -> AsyncIterator[AuditEvent]:
+    """Async :func:`iter_audit_events`."""
+    async for page in aiter_audit_event_pages(client, start, end, resource_type, prefetch=prefetch):
+        for event in page.events:
+            yield event
+
+
+def shard_time_range(
+    start: datetime.datetime, end: datetime.datetime, shard_duration: datetime.timedelta
+) -> list[tuple[datetime.datetime, datetime.datetime]]:
+    """Split ``[start, end]`` into consecutive ``(start, end)`` shards of at most ``shard_duration``. Each shard ends
+    exactly where the next one starts."""
+    if shard_duration <= datetime.timedelta(0):
+        raise ValueError("shard_duration must be positive.")
+    shards = []
+    while start < end:
+        shards.append((start, min(start + shard_duration, end)))
+        start = shards[-1][1]
+    return shards
+
+
+def _fetch_shard(
+    client: AuthenticatedClient, start: datetime.datetime, end: datetime.datetime, resource_type: str | None
+) -> list[AuditEvent]:
+    events = list(iter_audit_events(client, start, end, resource_type, prefetch=False))
+    events.sort(key=lambda e: (e.event_time, e.event_id))
+    return events
+
+
+def export_audit_events(
+    client: AuthenticatedClient,
+    start: datetime.datetime,
+    end: datetime.datetime | None = None,
+    resource_type: str | None = None,
+    shard_duration: datetime.timedelta = datetime.timedelta(days=1),
+    max_workers: int = 8,
+) -> Iterator[AuditEvent]:
+    """Every audit event between ``start`` and ``end`` (default: now) ordered by ``event_time``, fetched as time
+    shards of ``shard_duration`` whose page chains are walked by up to ``max_workers`` threads at once.
+
+    Events on a shard boundary can be returned by both shards, they are yielded once. Only the shards being fetched
+    and those waiting for an earlier shard to finish are held in memory, at most ``max_workers`` of them.
+    """
+    end = end or datetime.datetime.now(datetime.timezone.utc)
+    shards = deque(shard_time_range(start, end, shard_duration))
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lai-audit-export")
+    pending: deque[Future[list[AuditEvent]]] = deque()
+
+    def submit() -> None:
+        shard_start, shard_end = shards.popleft()
+        pending.append(executor.submit(_fetch_shard, client, shard_start, shard_end, resource_type))
+
+    try:
+        while shards and len(pending) < max_workers:
+            submit()
+        # Event ids of the previous shard, duplicates can only come from the boundary with the shard before.
+        previous_ids: set[str] = set()
+        while pending:
+            events = pending.popleft().result()
+            if shards:
+                submit()
+            for event in events:
+                if event.event_id not in previous_ids:
+                    yield event
+            previous_ids = {event.event_id for event in events}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,210 @@
+import datetime
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from ..client import AuthenticatedClient
+from ..models import AuditEvent
+from .pagination import export_audit_events, iter_audit_events
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+    event_id TEXT PRIMARY KEY,
+    event_time TEXT NOT NULL,
+    service_name TEXT NOT NULL,
+    resource_name TEXT NOT NULL,
+    action TEXT NOT NULL,
+    actor_lrn TEXT,
+    resource_owner_lrn TEXT,
+    request_api_key_lrn TEXT,
+    event TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS audit_event_resources (
+    resource_lrn TEXT NOT NULL,
+    event_id TEXT NOT NULL REFERENCES audit_events (event_id),
+    PRIMARY KEY (resource_lrn, event_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS audit_events_time ON audit_events (event_time, event_id);
+CREATE INDEX IF NOT EXISTS audit_events_actor ON audit_events (actor_lrn, event_time);
+CREATE INDEX IF NOT EXISTS audit_events_action ON audit_events (action, event_time);
+CREATE INDEX IF NOT EXISTS audit_events_resource_type ON audit_events (service_name, resource_name, event_time);
+CREATE TABLE IF NOT EXISTS audit_sync (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    event_time TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    synced_at TEXT NOT NULL
+);
+"""
+
+# Events are written in transactions of this many events, those of an interrupted sync stay stored and are skipped when
+# the next sync fetches them again.
+_BATCH_SIZE = 500
+
+
+def default_audit_db_path() -> Path:
+    path = os.getenv("LAMBDA_CLOUD_AUDIT_DB")
+    if path:
+        return Path(path)
+    data_home = os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "lai" / "audit.sqlite"
+
+
+def _parse_time(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _time(value: datetime.datetime) -> str:
+    # Stored like the API sends them, ISO 8601 in UTC with a Z suffix, so that string order is time order.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class AuditStore:
+    """A local SQLite copy of the audit log that :meth:`sync` keeps up to date and :meth:`query` searches offline.
+
+    The store remembers the newest event of the last complete sync and every sync only asks the API for events from
+    that time on.
+    Events are indexed by time, actor, action, resource type and affected resource (``resource_lrns``). Keep one
+    database per account.
+    """
+
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "AuditStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def checkpoint(self) -> tuple[str, str] | None:
+        """``(event_time, event_id)`` of the newest synced event, ``None`` before the first sync."""
+        row = self._db.execute("SELECT event_time, event_id FROM audit_sync WHERE id = 1").fetchone()
+        return (row[0], row[1]) if row else None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM audit_events").fetchone()[0]
+
+    def add(self, events: Iterable[AuditEvent]) -> int:
+        """Store ``events`` (events already stored are skipped), returns how many were new.
+
+        The checkpoint only moves to the newest event once all of ``events`` are stored: nothing says they come in time
+        order, so after an interruption an event older than the newest one stored may still be missing.
+        """
+        added = 0
+        newest: tuple[str, str] | None = None
+        events = iter(events)
+        while batch := list(islice(events, _BATCH_SIZE)):
+            added += self._add_batch(batch)
+            newest = max(newest or ("", ""), max((e.event_time, e.event_id) for e in batch))
+        if newest is not None:
+            with self._db:
+                self._db.execute(
+                    "INSERT INTO audit_sync VALUES (1, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                    "event_time = excluded.event_time, event_id = excluded.event_id, synced_at = excluded.synced_at "
+                    "WHERE (excluded.event_time, excluded.event_id) > (audit_sync.event_time, audit_sync.event_id)",
+                    (*newest, _time(datetime.datetime.now(datetime.timezone.utc))),
+                )
+        return added
+
+    def _add_batch(self, events: list[AuditEvent]) -> int:
+        with self._db:
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO audit_events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e.event_id,
+                        e.event_time,
+                        e.service_name,
+                        e.resource_name,
+                        e.action,
+                        e.actor_lrn,
+                        e.resource_owner_lrn,
+                        e.request_api_key_lrn,
+                        json.dumps(e.to_dict(), separators=(",", ":")),
+                    )
+                    for e in events
+                ],
+            )
+            added = self._db.total_changes - before
+            self._db.executemany(
+                "INSERT OR IGNORE INTO audit_event_resources VALUES (?, ?)",
+                [(lrn, e.event_id) for e in events for lrn in e.resource_lrns],
+            )
+        return added
+
+    def sync(
+        self,
+        client: AuthenticatedClient,
+        since: datetime.datetime | None = None,
+        max_workers: int = 1,
+    ) -> int:
+        """Fetch the events newer than the checkpoint (or since ``since`` on the first sync, the API's default range
+        without it) and store them, returns how many were new. With ``max_workers`` the range is fetched as
+        concurrent day long shards, see :func:`export_audit_events`."""
+        checkpoint = self.checkpoint()
+        # The checkpoint time itself is asked for again, events that share it may not all have been seen yet.
+        start = _parse_time(checkpoint[0]) if checkpoint else since
+        if max_workers > 1 and start is not None:
+            events = export_audit_events(client, start, max_workers=max_workers)
+        else:
+            events = iter_audit_events(client, start=start)
+        return self.add(events)
+
+    def query(
+        self,
+        actor: str | None = None,
+        action: str | None = None,
+        resource: str | None = None,
+        resource_type: str | None = None,
+        since: datetime.datetime | None = None,
+        until: datetime.datetime | None = None,
+        limit: int | None = None,
+    ) -> Iterator[AuditEvent]:
+        """Stored events matching every given filter, oldest first. ``resource`` is an LRN the event affected,
+        ``resource_type`` is ``<service>.<resource>``, e.g. ``cloud.instance``."""
+        where, params = [], []
+        if actor:
+            where.append("e.actor_lrn = ?")
+            params.append(actor)
+        if action:
+            where.append("e.action = ?")
+            params.append(action)
+        if resource:
+            where.append("e.event_id IN (SELECT event_id FROM audit_event_resources WHERE resource_lrn = ?)")
+            params.append(resource)
+        if resource_type:
+            service, _, resource_name = resource_type.partition(".")
+            where.append("e.service_name = ? AND e.resource_name = ?")
+            params.extend((service, resource_name))
+        if since:
+            where.append("e.event_time >= ?")
+            params.append(_time(since))
+        if until:
+            where.append("e.event_time <= ?")
+            params.append(_time(until))
+
+        sql = "SELECT e.event FROM audit_events e"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY e.event_time, e.event_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        for (event,) in self._db.execute(sql, params):
+            yield AuditEvent.from_dict(json.loads(event))
@@ -0,0 +1,165 @@
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from rich import print
+from rich.table import Table
+from rich.text import Text
+
+from lambda_ai_cloud_api_client.audit import AuditStore, default_audit_db_path
+from lambda_ai_cloud_api_client.audit import export_audit_events as _export_audit_events
+from lambda_ai_cloud_api_client.audit import iter_audit_events as _iter_audit_events
+from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.response import Columns
+from lambda_ai_cloud_api_client.models import AuditEvent
+
+AUDIT_EVENT_COLUMNS: Columns = (
+    ("event_time", str),
+    ("service_name", str),
+    ("resource_name", str),
+    ("action", str),
+    ("event_id", str),
+    ("actor_lrn", str),
+    ("resource_lrns", str),
+    ("resource_owner_lrn", str),
+    ("request_api_key_lrn", str),
+    ("catalog_version", str),
+)
+# The table is printed in batches as the events arrive, minimum widths keep the batches aligned for the usual values.
+# The short columns are never truncated, the two LRN columns share the rest of the terminal and are cut with an ellipsis.
+_TABLE_COLUMNS = (("Time", 20), ("Service", 7), ("Resource", 16), ("Action", 10))
+_TABLE_LRN_COLUMNS = ("Actor", "Resources")
+_TABLE_BATCH_SIZE = 100
+
+
+def _utc(dt: datetime | None) -> datetime | None:
+    # click.DateTime gives naive datetimes, the API wants UTC.
+    if dt is None or dt.tzinfo is not None:
+        return dt
+    return dt.replace(tzinfo=timezone.utc)
+
+
+def iter_audit_events(
+    start: datetime | None = None, end: datetime | None = None, resource_type: str | None = None
+) -> Iterator[AuditEvent]:
+    return _iter_audit_events(auth_client(), start=_utc(start), end=_utc(end), resource_type=resource_type)
+
+
+def export_audit_events(
+    start: datetime | None,
+    end: datetime | None,
+    resource_type: str | None,
+    workers: int,
+    shard_hours: float,
+) -> Iterator[AuditEvent]:
+    if start is None:
+        raise RuntimeError("--workers needs --start to split the time range into shards.")
+    return _export_audit_events(
+        auth_client(),
+        start=_utc(start),
+        end=_utc(end),
+        resource_type=resource_type,
+        shard_duration=timedelta(hours=shard_hours),
+        max_workers=workers,
+    )
+
+
+def sync_audit_events(db: Path | None, since: datetime | None, workers: int) -> tuple[int, int]:
+    """Sync the store at ``db`` (default: :func:`default_audit_db_path`), returns the new and total event counts."""
+    with AuditStore(db or default_audit_db_path()) as store:
+        added = store.sync(auth_client(), since=_utc(since), max_workers=workers)
+        return added, len(store)
+
+
+def query_audit_events(
+    db: Path | None,
+    actor: str | None = None,
+    action: str | None = None,
+    resource: str | None = None,
+    resource_type: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    limit: int | None = None,
+) -> Iterator[AuditEvent]:
+    path = db or default_audit_db_path()
+    if not path.exists():
+        raise RuntimeError(f"No audit store at {path}, run `lai audit sync` first.")
+    with AuditStore(path) as store:
+        yield from store.query(actor, action, resource, resource_type, _utc(since), _utc(until), limit)
+
+
+def _import_archive() -> Any:
+    try:
+        from lambda_ai_cloud_api_client.audit import archive
+    except ImportError as e:
+        raise RuntimeError(str(e)) from e
+    return archive
+
+
+def archive_audit_events(events: Iterable[AuditEvent], root: Path) -> tuple[int, int]:
+    """Write ``events`` into the Parquet archive at ``root``, returns the event and file counts."""
+    archive = _import_archive()
+    count = 0
+
+    def counted() -> Iterator[AuditEvent]:
+        nonlocal count
+        for event in events:
+            count += 1
+            yield event
+
+    files = archive.write_audit_archive(counted(), root)
+    return count, len(files)
+
+
+def scan_audit_archive(
+    root: Path,
+    actor: str | None = None,
+    action: str | None = None,
+    resource_type: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Iterator[AuditEvent]:
+    if not root.is_dir():
+        raise RuntimeError(f"No audit archive at {root}.")
+    archive = _import_archive()
+    return archive.iter_audit_archive(root, _utc(since), _utc(until), resource_type, actor, action)
+
+
+def audit_event_row(event: AuditEvent) -> tuple[str, ...]:
+    return (
+        event.event_time,
+        event.service_name,
+        event.resource_name,
+        event.action,
+        event.actor_lrn or "-",
+        ", ".join(event.resource_lrns) or "-",
+    )
+
+
+def build_audit_events_table(rows: Iterable[tuple[str, ...]], show_header: bool = True) -> Table:
+    table = Table(show_header=show_header, box=None, pad_edge=False, expand=True)
+    for name, min_width in _TABLE_COLUMNS:
+        table.add_column(name, min_width=min_width, no_wrap=True)
+    for name in _TABLE_LRN_COLUMNS:
+        table.add_column(name, ratio=1, no_wrap=True, overflow="ellipsis")
+
+    for row in rows:
+        # Text, so that LRNs like lrn:cloud:... are not turned into emoji.
+        table.add_row(*(Text(cell) for cell in row))
+
+    return table
+
+
+@profiled("render")
+def render_audit_events_table(events: Iterable[AuditEvent]) -> None:
+    events = iter(events)
+    first = True
+    while batch := [audit_event_row(e) for e in islice(events, _TABLE_BATCH_SIZE)]:
+        print(build_audit_events_table(batch, show_header=first))
+        first = False
+
+    if first:
+        print("No audit events found.")
@@ -1,8 +1,25 @@
+import importlib.util
+import json
 import os
-from functools import cache
-from typing import TypeVar
+from collections.abc import Callable, Iterator
+from functools import cache, partial
+from http import HTTPStatus
+from typing import Any, TypeVar
 
-from lambda_ai_cloud_api_client.client import AuthenticatedClient
+import httpx
+
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.client import DEFAULT_LIMITS, AuthenticatedClient
+from lambda_ai_cloud_api_client.instrumentation import Instrumentation
+from lambda_ai_cloud_api_client.transport import (
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    ConditionalGetTransport,
+    HedgingTransport,
+    SingleFlightTransport,
+    ValidatorCache,
+)
+from lambda_ai_cloud_api_client.types import Response
 
 DEFAULT_BASE_URL = os.getenv("LAMBDA_CLOUD_BASE_URL", "https://cloud.lambdalabs.com")
 TOKEN_ENV_VARS = ("LAMBDA_CLOUD_TOKEN", "LAMBDA_CLOUD_API_TOKEN", "LAMBDA_API_TOKEN")
@@ -20,15 +37,146 @@ def _load_token() -> str:
     )
 
 
+def _env_number(env_var: str, type_: type[T], default: T | None) -> T | None:
+    value = os.getenv(env_var)
+    if not value:
+        return default
+    try:
+        return type_(value)
+    except ValueError as e:
+        raise RuntimeError(f"{env_var} must be a number, got '{value}'.") from e
+
+
+def _http2_enabled() -> bool:
+    value = os.getenv("LAMBDA_CLOUD_HTTP2", "auto").lower()
+    if value == "auto":
+        return importlib.util.find_spec("h2") is not None
+    return value in ("1", "true", "yes")
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_env_number("LAMBDA_CLOUD_MAX_CONNECTIONS", int, DEFAULT_LIMITS.max_connections),
+        max_keepalive_connections=_env_number(
+            "LAMBDA_CLOUD_MAX_KEEPALIVE_CONNECTIONS", int, DEFAULT_LIMITS.max_keepalive_connections
+        ),
+        keepalive_expiry=_env_number("LAMBDA_CLOUD_KEEPALIVE_EXPIRY", float, DEFAULT_LIMITS.keepalive_expiry),
+    )
+
+
+def _timeout() -> httpx.Timeout | None:
+    timeouts = {
+        "connect": _env_number("LAMBDA_CLOUD_CONNECT_TIMEOUT", float, None),
+        "read": _env_number("LAMBDA_CLOUD_READ_TIMEOUT", float, None),
+        "write": _env_number("LAMBDA_CLOUD_WRITE_TIMEOUT", float, None),
+        "pool": _env_number("LAMBDA_CLOUD_POOL_TIMEOUT", float, None),
+    }
+    if all(t is None for t in timeouts.values()):
+        return None
+    return httpx.Timeout(None, **timeouts)
+
+
+@cache
+def validator_cache() -> ValidatorCache:
+    # Set LAMBDA_CLOUD_HTTP_CACHE_DIR to also revalidate across separate `lai` invocations.
+    return ValidatorCache(directory=os.getenv("LAMBDA_CLOUD_HTTP_CACHE_DIR") or None)
+
+
+def _resilience_wrappers() -> tuple[Callable[[Any], Any], ...]:
+    wrappers: list[Callable[[Any], Any]] = []
+    if os.getenv("LAMBDA_CLOUD_HEDGE_GETS", "").lower() in ("1", "true", "yes"):
+        wrappers.append(HedgingTransport)
+    threshold = _env_number("LAMBDA_CLOUD_BREAKER_THRESHOLD", int, 5)
+    if threshold > 0:
+        breaker = CircuitBreaker(
+            failure_threshold=threshold,
+            recovery_seconds=_env_number("LAMBDA_CLOUD_BREAKER_RECOVERY_SECONDS", float, 30.0),
+        )
+        wrappers.append(partial(CircuitBreakerTransport, breaker=breaker))
+    return tuple(wrappers)
+
+
+def _record_replay() -> tuple[tuple[Callable[[Any], Any], ...], dict[str, Any]]:
+    # LAMBDA_CLOUD_RECORD appends every API exchange to a file, LAMBDA_CLOUD_REPLAY answers from such a file instead
+    # of the API. Returns the innermost transport wrappers and the httpx arguments for that.
+    record, replay = os.getenv("LAMBDA_CLOUD_RECORD"), os.getenv("LAMBDA_CLOUD_REPLAY")
+    if not record and not replay:
+        return (), {}
+    from lambda_ai_cloud_api_client.mock import RecordingTransport, ReplayTransport
+
+    wrappers = (partial(RecordingTransport, path=record),) if record else ()
+    return wrappers, {"transport": ReplayTransport(replay)} if replay else {}
+
+
+@cache
+def instrumentation() -> Instrumentation:
+    # Hooks are only registered when asked for, e.g. by --timings.
+    return Instrumentation()
+
+
 @cache
+@profiled("auth")
 def auth_client() -> AuthenticatedClient:
     base_url = os.getenv("LAMBDA_CLOUD_BASE_URL", DEFAULT_BASE_URL)
     token = _load_token()
     verify_ssl = os.getenv("LAMBDA_CLOUD_VERIFY_SSL", True)
+    recording_wrappers, httpx_args = _record_replay()
 
     client = AuthenticatedClient(
         base_url=base_url,
         token=token,
         verify_ssl=verify_ssl,
+        timeout=_timeout(),
+        http2=_http2_enabled(),
+        limits=_limits(),
+        # Hooks (--timings, --profile) are registered before the first command asks for a client, without any the
+        # transport isn't wrapped at all.
+        instrumentation=instrumentation() if instrumentation().listens() else None,
+        httpx_args=httpx_args,
+        transport_wrappers=(
+            *recording_wrappers,
+            *_resilience_wrappers(),
+            partial(ConditionalGetTransport, cache=validator_cache()),
+            # Identical GETs in flight at the same time (or within the reuse window) share one request.
+            partial(SingleFlightTransport, reuse_seconds=_env_number("LAMBDA_CLOUD_COALESCE_SECONDS", float, 0.0)),
+        ),
     )
+    # Building the httpx client loads the TLS context, which takes longer than anything else here. Do it now so that
+    # --profile reports it as part of "auth" rather than of the first request.
+    client.get_httpx_client()
     return client
+
+
+def _request_raw(request_kwargs: dict[str, Any]) -> httpx.Response:
+    client = auth_client()
+    response = client.get_httpx_client().request(**request_kwargs)
+    Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=None,
+    ).raise_for_status()
+    return response
+
+
+def raw_data_json(content: bytes) -> bytes:
+    """The "data" of a response body, without building models.
+
+    The body is decoded once with the json module's C code to check that ``data`` holds a list and is its only key.
+    The list then spans from the body's first ``[`` (the key can't contain one) to its last ``]``, and is returned as
+    the API encoded it. Any other shape is re-encoded.
+    """
+    document = json.loads(content)
+    if document.keys() == {"data"} and isinstance(document["data"], list):
+        return content[content.index(b"[") : content.rindex(b"]") + 1]
+    return json.dumps(document["data"]).encode()
+
+
+def request_raw_data_json(request_kwargs: dict[str, Any]) -> bytes:
+    return raw_data_json(_request_raw(request_kwargs).content)
+
+
+def request_raw_items(request_kwargs: dict[str, Any]) -> Iterator[dict]:
+    # The response's data elements (the values when it's an object), decoded in one go by the json module's C code.
+    data = _request_raw(request_kwargs).json()["data"]
+    return iter(data.values() if isinstance(data, dict) else data)
@@ -0,0 +1,169 @@
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from rich import print
+from rich.table import Table
+
+from lambda_ai_cloud_api_client.audit import AuditStore
+from lambda_ai_cloud_api_client.cli.ls import list_instances
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.response import Columns
+from lambda_ai_cloud_api_client.cli.stop import terminate_instances
+from lambda_ai_cloud_api_client.cost import (
+    Budget,
+    BudgetBreach,
+    CostRow,
+    CostStore,
+    Launch,
+    Sample,
+    default_cost_db_path,
+)
+
+COST_COLUMNS: Columns = (
+    ("key", str),
+    ("instances", int),
+    ("running", int),
+    ("cents_per_hour", int),
+    ("cost_cents", float),
+)
+_INSTANCE_LRN = "lrn:cloud:instance:"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def parse_budget(raw: str) -> Budget:
+    """``team=research:500`` as a $500 cap on the instances tagged team=research."""
+    tag, _, dollars = raw.rpartition(":")
+    key, _, value = tag.partition("=")
+    try:
+        cap = float(dollars)
+    except ValueError:
+        cap = -1.0
+    if not key or not value or cap < 0:
+        raise RuntimeError(f"Invalid budget '{raw}'. Use <tag-key>=<tag-value>:<dollars>, e.g. team=research:500.")
+    return Budget(key, value, cap * 100)
+
+
+def audit_instance_lifetimes(audit_db: Path) -> tuple[dict[str, Launch], dict[str, datetime]]:
+    """Launch times and launchers, and termination times, of the instances in the local audit store."""
+    if not audit_db.exists():
+        raise RuntimeError(f"No audit store at {audit_db}, run `lai audit sync` first.")
+    launches: dict[str, Launch] = {}
+    terminations: dict[str, datetime] = {}
+    with AuditStore(audit_db) as store:
+        for event in store.query(resource_type="cloud.instance"):
+            event_time = datetime.fromisoformat(event.event_time.replace("Z", "+00:00"))
+            for lrn in event.resource_lrns:
+                if not lrn.startswith(_INSTANCE_LRN):
+                    continue
+                id = lrn[len(_INSTANCE_LRN) :]
+                if event.action == "launched":
+                    launches[id] = Launch(event_time, event.actor_lrn)
+                elif event.action == "terminated":
+                    terminations[id] = event_time
+    return launches, terminations
+
+
+def sample_costs(db: Path | None, audit_db: Path | None = None) -> Sample:
+    """List the instances once and charge them in the store at ``db`` (default: :func:`default_cost_db_path`)."""
+    launches, terminations = audit_instance_lifetimes(audit_db) if audit_db else ({}, {})
+    instances = list_instances()
+    with CostStore(db or default_cost_db_path()) as store:
+        return store.sample(instances, _now(), launches, terminations)
+
+
+def _open_store(db: Path | None) -> CostStore:
+    path = db or default_cost_db_path()
+    if not path.exists():
+        raise RuntimeError(f"No cost store at {path}, run `lai cost sample` first.")
+    return CostStore(path)
+
+
+def report_costs(db: Path | None, by: str) -> list[CostRow]:
+    with _open_store(db) as store:
+        try:
+            return store.report(by)
+        except ValueError as e:
+            raise RuntimeError(str(e)) from None
+
+
+def enforce_budgets(
+    db: Path | None, budgets: tuple[Budget, ...], terminate: bool
+) -> tuple[list[BudgetBreach], list[str]]:
+    """Check ``budgets`` and the instances' own ``budget`` tags, returns the breaches and the terminated instance ids.
+
+    With ``terminate`` the running instances of every breached budget are terminated in a single API call.
+    """
+    with _open_store(db) as store:
+        breaches = store.check_budgets(budgets)
+    ids = sorted({id for breach in breaches for id in breach.instance_ids})
+    if not terminate or not ids:
+        return breaches, []
+    return breaches, [instance.id for instance in terminate_instances(ids)]
+
+
+def print_sample(sample: Sample) -> None:
+    print(
+        f"{sample.sampled_at:%Y-%m-%d %H:%M:%S} {sample.instances} billed instances, "
+        f"${sample.cents_per_hour / 100:.2f}/hr, ${sample.cost_cents / 100:.2f} so far."
+    )
+
+
+def print_breaches(breaches: list[BudgetBreach], terminated: list[str]) -> None:
+    for breach in breaches:
+        running = ", ".join(breach.instance_ids) or "none running"
+        print(
+            f"[bold red]Budget {breach.budget} exceeded[/bold red]: ${breach.spent_cents / 100:.2f} of "
+            f"${breach.cap_cents / 100:.2f} ({running})."
+        )
+    if terminated:
+        print(f"Terminated {len(terminated)} instances: {', '.join(terminated)}.")
+
+
+def track_costs(
+    db: Path | None,
+    audit_db: Path | None,
+    budgets: tuple[Budget, ...],
+    terminate: bool,
+    interval_seconds: float,
+    samples: int | None,
+) -> None:
+    """Sample every ``interval_seconds`` (``samples`` times, or until interrupted) and enforce the budgets each time."""
+    taken = 0
+    try:
+        while True:
+            print_sample(sample_costs(db, audit_db))
+            print_breaches(*enforce_budgets(db, budgets, terminate))
+            taken += 1
+            if samples is not None and taken >= samples:
+                return
+            time.sleep(interval_seconds)
+    except KeyboardInterrupt:
+        pass
+
+
+@profiled("render")
+def render_cost_table(rows: list[CostRow], by: str) -> None:
+    if not rows:
+        print("No costs recorded.")
+        return
+
+    table = Table(title=f"Cost by {by}", show_lines=False)
+    key = by[4:] if by.startswith("tag:") else by.capitalize()
+    for column in (key, "Instances", "Running", "Running ($/hr)", "Cost ($)"):
+        table.add_column(column)
+
+    for row in rows:
+        table.add_row(
+            row.key,
+            str(row.instances),
+            str(row.running),
+            f"{row.cents_per_hour / 100:.2f}",
+            f"{row.cost_cents / 100:.2f}",
+        )
+
+    table.caption = f"${sum(row.cost_cents for row in rows) / 100:.2f} in total"
+    print(table)
@@ -0,0 +1,152 @@
+# This module is the `lai` entry point, keep its imports to the standard library so that forwarding a command to a
+# running daemon does not pay for importing httpx, rich, click and the generated models.
+import hashlib
+import json
+import os
+import shutil
+import socket
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+SOCKET_ENV_VAR = "LAMBDA_CLOUD_DAEMON_SOCKET"
+NO_DAEMON_ENV_VAR = "LAMBDA_CLOUD_NO_DAEMON"
+TOKEN_ENV_VARS = ("LAMBDA_CLOUD_TOKEN", "LAMBDA_CLOUD_API_TOKEN", "LAMBDA_API_TOKEN")
+
+# Commands that only talk to the API and print, these can be served by the daemon. ssh/run hand the terminal over to
+# ssh and `ls --watch` draws a live display, they always run in the calling process.
+FORWARDED_COMMANDS = ("ls", "get", "start", "restart", "stop", "rename", "types", "images", "keys")
+LOCAL_ONLY_OPTIONS = ("--watch",)
+
+# As close to process start as the CLI gets, --profile reports everything until the command runs as "import".
+STARTED_AT = time.perf_counter()
+
+
+def socket_path() -> Path:
+    path = os.getenv(SOCKET_ENV_VAR)
+    if path:
+        return Path(path)
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "lai" / "daemon.sock"
+    return Path(tempfile.gettempdir()) / f"lai-{os.getuid()}" / "daemon.sock"
+
+
+def unsafe_socket_reason(path: Path) -> str | None:
+    # The default directory sits at a predictable path in a shared /tmp. Only trust it, and the socket in it, when they
+    # are ours, not symlinks and nobody else can get into the directory. Returns why not, or None when they're fine.
+    uid = os.getuid()
+    try:
+        directory = os.lstat(path.parent)
+    except FileNotFoundError:
+        return f"{path.parent} does not exist"
+    if stat.S_ISLNK(directory.st_mode):
+        return f"{path.parent} is a symlink"
+    if not stat.S_ISDIR(directory.st_mode):
+        return f"{path.parent} is not a directory"
+    if directory.st_uid != uid:
+        return f"{path.parent} is not owned by uid {uid}"
+    if stat.S_IMODE(directory.st_mode) != 0o700:
+        return f"{path.parent} has mode {stat.S_IMODE(directory.st_mode):o}, not 700"
+    try:
+        sock = os.lstat(path)
+    except FileNotFoundError:
+        return None
+    if stat.S_ISLNK(sock.st_mode):
+        return f"{path} is a symlink"
+    if not stat.S_ISSOCK(sock.st_mode):
+        return f"{path} is not a socket"
+    if sock.st_uid != uid:
+        return f"{path} is not owned by uid {uid}"
+    return None
+
+
+def _identity() -> str:
+    # The daemon answers with its own token and base url, only use it when the caller would have used the same ones.
+    token = next((os.environ[v] for v in TOKEN_ENV_VARS if os.getenv(v)), "")
+    base_url = os.getenv("LAMBDA_CLOUD_BASE_URL", "")
+    return hashlib.sha256(f"{token}\0{base_url}".encode()).hexdigest()
+
+
+def _recv_exact(conn: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = conn.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Daemon closed the connection.")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _send_message(conn: socket.socket, header: dict[str, Any], *payloads: bytes) -> None:
+    conn.sendall(json.dumps(header).encode() + b"\n" + b"".join(payloads))
+
+
+def _recv_header(conn: socket.socket) -> dict[str, Any]:
+    buf = b""
+    while not buf.endswith(b"\n"):
+        chunk = conn.recv(1)
+        if not chunk:
+            raise ConnectionError("Daemon closed the connection.")
+        buf += chunk
+    return json.loads(buf)
+
+
+def request(message: dict[str, Any], timeout: float | None = None) -> tuple[dict[str, Any], bytes, bytes]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(str(socket_path()))
+        _send_message(conn, {**message, "identity": _identity()})
+        header = _recv_header(conn)
+        stdout = _recv_exact(conn, header.get("stdout", 0))
+        stderr = _recv_exact(conn, header.get("stderr", 0))
+    return header, stdout, stderr
+
+
+def forward(argv: list[str]) -> int | None:
+    # Returns the exit code of the command run by the daemon, or None when it has to run in this process.
+    if not argv or argv[0] not in FORWARDED_COMMANDS or any(a in LOCAL_ONLY_OPTIONS for a in argv):
+        return None
+    path = socket_path()
+    if os.getenv(NO_DAEMON_ENV_VAR) or not path.exists():
+        return None
+    reason = unsafe_socket_reason(path)
+    if reason:
+        sys.stderr.write(f"Not using the daemon socket {path}: {reason}.\n")
+        return None
+
+    columns, lines = shutil.get_terminal_size()
+    try:
+        header, stdout, stderr = request(
+            {
+                "argv": argv,
+                "env": {"COLUMNS": str(columns), "LINES": str(lines)},
+                "isatty": sys.stdout.isatty(),
+                "cwd": os.getcwd(),
+            }
+        )
+    except OSError:
+        # Stale socket or the daemon died, fall back to direct mode.
+        return None
+    if "exit_code" not in header:
+        return None
+
+    sys.stdout.buffer.write(stdout)
+    sys.stdout.buffer.flush()
+    sys.stderr.buffer.write(stderr)
+    sys.stderr.buffer.flush()
+    return header["exit_code"]
+
+
+def entrypoint() -> None:
+    exit_code = forward(sys.argv[1:])
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    from lambda_ai_cloud_api_client.__main__ import main
+
+    main()
@@ -0,0 +1,197 @@
+import io
+import os
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager, redirect_stderr, redirect_stdout, suppress
+from pathlib import Path
+
+import click
+
+from lambda_ai_cloud_api_client.cli.daemon import (
+    _identity,
+    _recv_header,
+    _send_message,
+    request,
+    socket_path,
+    unsafe_socket_reason,
+)
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    # Requests are handled one at a time on purpose, every command swaps sys.stdout/sys.stderr while it runs.
+
+    def __init__(self, path: Path) -> None:
+        self.identity = _identity()
+        super().__init__(str(path), _DaemonHandler)
+
+
+class _DaemonHandler(socketserver.BaseRequestHandler):
+    server: _DaemonServer
+
+    def handle(self) -> None:
+        message = _recv_header(self.request)
+        if message.get("identity") != self.server.identity:
+            _send_message(self.request, {"error": "Daemon runs with a different token or base url."})
+            return
+
+        command = message.get("command", "run")
+        if command == "ping":
+            _send_message(self.request, {"pid": os.getpid()})
+            return
+        if command == "shutdown":
+            _send_message(self.request, {"pid": os.getpid()})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return
+
+        exit_code, stdout, stderr = run_command(
+            message["argv"], message.get("env") or {}, message.get("isatty", False), message.get("cwd")
+        )
+        _send_message(
+            self.request,
+            {"exit_code": exit_code, "stdout": len(stdout), "stderr": len(stderr)},
+            stdout,
+            stderr,
+        )
+
+
+class _CapturedOutput(io.TextIOWrapper):
+    # A text stream with a binary .buffer like sys.stdout, that reports whether the caller's stream is a terminal.
+
+    def __init__(self, isatty: bool = False) -> None:
+        super().__init__(io.BytesIO(), encoding="utf-8", write_through=True)
+        self._isatty = isatty
+
+    def isatty(self) -> bool:
+        return self._isatty
+
+    def getvalue(self) -> bytes:
+        self.flush()
+        return self.buffer.getvalue()
+
+
+@contextmanager
+def _environ(env: dict[str, str]) -> Iterator[None]:
+    old = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key, value in old.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+@contextmanager
+def _cwd(path: str | None) -> Iterator[None]:
+    old = os.getcwd()
+    if path is not None:
+        os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(old)
+
+
+def run_command(argv: list[str], env: dict[str, str], isatty: bool, cwd: str | None = None) -> tuple[int, bytes, bytes]:
+    # Runs a command like `lai` would, with its output captured: click errors as click reports them, anything else as
+    # a traceback on stderr. Relative paths in the arguments, like `start --user-data-file ./init.sh`, are resolved
+    # against the caller's working directory `cwd`.
+    from lambda_ai_cloud_api_client.__main__ import main
+
+    stdout, stderr = _CapturedOutput(isatty), _CapturedOutput()
+    old_stdin, sys.stdin = sys.stdin, io.StringIO()
+    try:
+        with _environ(env), _cwd(cwd), redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                result = main.main(argv, prog_name="lai", standalone_mode=False)
+                exit_code = result if isinstance(result, int) else 0
+            except click.ClickException as e:
+                e.show()
+                exit_code = e.exit_code
+            except click.Abort:
+                click.echo("Aborted!", err=True)
+                exit_code = 1
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        sys.stdin = old_stdin
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+def daemon_pid() -> int | None:
+    if not socket_path().exists() or unsafe_socket_reason(socket_path()):
+        return None
+    try:
+        header, _, _ = request({"command": "ping"}, timeout=2)
+    except OSError:
+        return None
+    return header.get("pid")
+
+
+def serve() -> None:
+    path = socket_path()
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    reason = unsafe_socket_reason(path)
+    if reason:
+        raise RuntimeError(f"Refusing to serve on {path}: {reason}.")
+    if daemon_pid() is not None:
+        raise RuntimeError(f"A daemon is already listening on {path}.")
+    path.unlink(missing_ok=True)
+
+    # Warm up everything a command needs so the first forwarded call is as fast as the next ones.
+    from lambda_ai_cloud_api_client.__main__ import main  # noqa: F401
+    from lambda_ai_cloud_api_client.cli.client import auth_client
+
+    auth_client().get_httpx_client()
+
+    old_umask = os.umask(0o177)
+    try:
+        server = _DaemonServer(path)
+    finally:
+        os.umask(old_umask)
+
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        path.unlink(missing_ok=True)
+
+
+def start_daemon(timeout_seconds: float = 10) -> int:
+    pid = daemon_pid()
+    if pid is not None:
+        return pid
+
+    subprocess.Popen(
+        [sys.executable, "-m", "lambda_ai_cloud_api_client", "daemon", "serve"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        pid = daemon_pid()
+        if pid is not None:
+            return pid
+        time.sleep(0.1)
+    raise RuntimeError(f"Daemon did not start listening on {socket_path()} within {timeout_seconds} seconds.")
+
+
+def stop_daemon() -> int | None:
+    pid = daemon_pid()
+    if pid is None:
+        return None
+    with suppress(OSError):
+        request({"command": "shutdown"}, timeout=2)
+    return pid
@@ -0,0 +1,372 @@
+import ipaddress
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from rich import print
+from rich.markup import escape
+
+from lambda_ai_cloud_api_client.api.firewalls.firewall_rules_list import sync_detailed as _list_firewall_rules
+from lambda_ai_cloud_api_client.api.firewalls.firewall_rules_set import sync_detailed as _set_firewall_rules
+from lambda_ai_cloud_api_client.api.firewalls.firewall_rulesets_list import sync_detailed as _list_firewall_rulesets
+from lambda_ai_cloud_api_client.api.firewalls.get_global_firewall_ruleset import (
+    sync_detailed as _get_global_firewall_ruleset,
+)
+from lambda_ai_cloud_api_client.api.firewalls.update_firewall_ruleset import sync_detailed as _update_firewall_ruleset
+from lambda_ai_cloud_api_client.api.firewalls.update_global_firewall_ruleset import (
+    sync_detailed as _update_global_firewall_ruleset,
+)
+from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.spec_file import load_spec_document, spec_error
+from lambda_ai_cloud_api_client.models import (
+    FirewallRule,
+    FirewallRulesetPatchRequest,
+    FirewallRulesPutRequest,
+    GlobalFirewallRulesetPatchRequest,
+    NetworkProtocol,
+)
+from lambda_ai_cloud_api_client.types import Unset
+
+Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+_PROTOCOLS = tuple(protocol.value for protocol in NetworkProtocol)
+_SECTIONS = ("rules", "global", "rulesets")
+_RULE_FIELDS = ("protocol", "port_range", "source_network", "description")
+_MAX_PORT = 65535
+
+
+class Rule(NamedTuple):
+    """One inbound rule with its source network parsed, ``ports`` is ``None`` for icmp."""
+
+    protocol: str
+    network: Network
+    ports: tuple[int, int] | None
+    description: str
+
+    def sort_key(self) -> tuple:
+        return self.protocol, self.network.version, self.network, self.ports or (0, 0), self.description
+
+    def to_model(self) -> FirewallRule:
+        rule = FirewallRule(NetworkProtocol(self.protocol), str(self.network), self.description)
+        if self.ports is not None:
+            rule.port_range = list(self.ports)
+        return rule
+
+    def __str__(self) -> str:
+        rule = self.protocol
+        if self.ports is not None:
+            first, last = self.ports
+            rule += f" {first}" if first == last else f" {first}-{last}"
+        rule += f" from {self.network}"
+        return f"{rule} ({self.description})" if self.description else rule
+
+
+class FirewallSpec(NamedTuple):
+    rules: tuple[Rule, ...] | None  # the account's rules, None to leave them alone
+    global_rules: tuple[Rule, ...] | None  # the global ruleset's
+    rulesets: dict[str, tuple[Rule, ...]]  # by ruleset name
+    entries: int  # rules in the file, one per source network, before aggregation
+
+
+class FirewallChange(NamedTuple):
+    target: str  # rules | global | ruleset <name>
+    ruleset_id: str | None  # for named rulesets
+    rules: tuple[Rule, ...]  # the complete, aggregated list to write
+    added: tuple[Rule, ...]
+    removed: tuple[Rule, ...]
+
+
+def _spec_error(path: Path, reason: str) -> RuntimeError:
+    return spec_error(path, "firewall spec", reason)
+
+
+def _ports(path: Path, where: str, protocol: str, raw: Any) -> tuple[int, int] | None:
+    if protocol == NetworkProtocol.ICMP.value:
+        if raw is not None:
+            raise _spec_error(path, f"{where}: icmp rules take no port_range.")
+        return None
+    if isinstance(raw, str) and "-" in raw:
+        raw = raw.split("-", 1)
+    elif isinstance(raw, int | str):
+        raw = [raw, raw]
+    try:
+        first, last = (int(port) for port in raw)
+    except (TypeError, ValueError):
+        raise _spec_error(
+            path, f"{where}: {protocol} rules need a port_range such as 22, 8000-8100 or [8000, 8100]."
+        ) from None
+    if not 1 <= first <= last <= _MAX_PORT:
+        raise _spec_error(path, f"{where}: invalid port_range {first}-{last}.")
+    return first, last
+
+
+def _parse_rules(path: Path, section: str, raw: Any) -> list[Rule]:
+    """A list of rules in the API's format, except that ``source_network`` may be a list of networks."""
+    if not isinstance(raw, list):
+        raise _spec_error(path, f"{section} must be a list of rules.")
+    rules = []
+    for position, entry in enumerate(raw):
+        where = f"{section}[{position}]"
+        if not isinstance(entry, dict):
+            raise _spec_error(path, f"{where} must be a mapping.")
+        if unknown := sorted(set(entry) - set(_RULE_FIELDS)):
+            raise _spec_error(
+                path,
+                f"{where} has unknown fields {', '.join(unknown)}, use {', '.join(_RULE_FIELDS)}.",
+            )
+        protocol = entry.get("protocol")
+        if protocol not in _PROTOCOLS:
+            raise _spec_error(path, f"{where}: protocol must be one of {', '.join(_PROTOCOLS)}.")
+        ports = _ports(path, where, protocol, entry.get("port_range"))
+        sources = entry.get("source_network")
+        sources = [sources] if isinstance(sources, str) else sources
+        if not sources or not isinstance(sources, list):
+            raise _spec_error(path, f"{where} needs a source_network.")
+        for source in sources:
+            try:
+                network = ipaddress.IPv4Network(str(source), strict=False)
+            except ValueError:
+                raise _spec_error(path, f"{where}: {source!r} is not an IPv4 network.") from None
+            rules.append(Rule(protocol, network, ports, str(entry.get("description") or "")))
+    return rules
+
+
+def load_firewall_spec(path: Path) -> FirewallSpec:
+    """Read the desired rules from YAML (needs the ``[yaml]`` extra) or, for ``.json`` files, JSON::
+
+    rules:  # the account's inbound rules
+      - protocol: tcp
+        port_range: 22
+        source_network: [203.0.113.0/25, 203.0.113.128/25]
+        description: office
+    global: []  # the global ruleset
+    rulesets:  # existing rulesets by name
+      training:
+        - {protocol: tcp, port_range: 8000-8100, source_network: 198.51.100.0/24}
+
+    Sections that are left out aren't touched.
+    """
+    document = load_spec_document(path, "firewall spec")
+    if not isinstance(document, dict) or not set(document) & set(_SECTIONS):
+        raise _spec_error(path, f"it needs at least one of {', '.join(_SECTIONS)}.")
+    if unknown := sorted(set(document) - set(_SECTIONS)):
+        raise _spec_error(path, f"unknown sections {', '.join(unknown)}, use {', '.join(_SECTIONS)}.")
+
+    parsed: dict[str, list[Rule]] = {}
+    for section in ("rules", "global"):
+        if section in document:
+            parsed[section] = _parse_rules(path, section, document[section] or [])
+    rulesets = document.get("rulesets") or {}
+    if not isinstance(rulesets, dict):
+        raise _spec_error(path, "rulesets must map ruleset names to lists of rules.")
+    for name, raw in rulesets.items():
+        parsed[f"ruleset {name}"] = _parse_rules(path, f"rulesets.{name}", raw or [])
+
+    return FirewallSpec(
+        rules=tuple(aggregate_rules(parsed["rules"])) if "rules" in parsed else None,
+        global_rules=tuple(aggregate_rules(parsed["global"])) if "global" in parsed else None,
+        rulesets={name: tuple(aggregate_rules(parsed[f"ruleset {name}"])) for name in rulesets},
+        entries=sum(len(rules) for rules in parsed.values()),
+    )
+
+
+# Rules are aggregated as {(protocol, network, ports): descriptions}.
+_Entries = dict[tuple[str, Network, tuple[int, int] | None], frozenset[str]]
+
+
+def _supernets(network: Network) -> Iterable[Network]:
+    """``network`` itself and every network containing it, narrowest first."""
+    for prefixlen in range(network.prefixlen, -1, -1):
+        yield network.supernet(new_prefix=prefixlen)
+
+
+def _collapse_networks(entries: _Entries) -> _Entries:
+    """Merge overlapping and adjacent source networks of rules with the same protocol and ports."""
+    groups: dict[tuple, list[tuple[Network, frozenset[str]]]] = defaultdict(list)
+    for (protocol, network, ports), descriptions in entries.items():
+        groups[protocol, ports, network.version].append((network, descriptions))
+    collapsed: _Entries = {}
+    for (protocol, ports, _), members in groups.items():
+        networks = set(ipaddress.collapse_addresses(network for network, _ in members))
+        for member, descriptions in members:
+            network = next(n for n in _supernets(member) if n in networks)
+            collapsed[protocol, network, ports] = collapsed.get((protocol, network, ports), frozenset()) | descriptions
+    return collapsed
+
+
+def _merge_ports(entries: _Entries) -> _Entries:
+    """Merge overlapping and adjacent port ranges of rules with the same protocol and source network."""
+    groups: dict[tuple, list[tuple[tuple[int, int] | None, frozenset[str]]]] = defaultdict(list)
+    for (protocol, network, ports), descriptions in entries.items():
+        groups[protocol, network].append((ports, descriptions))
+    merged: _Entries = {}
+    for (protocol, network), members in groups.items():
+        ranges: list[tuple[tuple[int, int] | None, frozenset[str]]] = []
+        for ports, descriptions in sorted(members, key=lambda member: member[0] or (0, 0)):
+            previous = ranges[-1][0] if ranges else None
+            if ports is not None and previous is not None and ports[0] <= previous[1] + 1:
+                ranges[-1] = ((previous[0], max(previous[1], ports[1])), ranges[-1][1] | descriptions)
+            else:
+                ranges.append((ports, descriptions))
+        for ports, descriptions in ranges:
+            merged[protocol, network, ports] = descriptions
+    return merged
+
+
+def _covers(outer: tuple[int, int] | None, inner: tuple[int, int] | None) -> bool:
+    return outer == inner or (outer is not None and inner is not None and outer[0] <= inner[0] <= inner[1] <= outer[1])
+
+
+def _breadth(entry: tuple[tuple[str, Network, tuple[int, int] | None], frozenset[str]]) -> tuple[int, int]:
+    (_, network, ports), _ = entry
+    return network.prefixlen, -(ports[1] - ports[0]) if ports else 0
+
+
+def _drop_covered(entries: _Entries) -> _Entries:
+    """Drop the rules another rule of the same protocol already allows, a wider network on at least the same ports."""
+    kept: _Entries = {}
+    kept_ports: dict[tuple[str, Network], list[tuple[int, int] | None]] = defaultdict(list)
+    # The widest networks and port ranges first, so that a rule can only be covered by one kept before it.
+    for (protocol, network, ports), descriptions in sorted(entries.items(), key=_breadth):
+        if any(
+            _covers(other_ports, ports)
+            for supernet in _supernets(network)
+            for other_ports in kept_ports.get((protocol, supernet), ())
+        ):
+            continue
+        kept[protocol, network, ports] = descriptions
+        kept_ports[protocol, network].append(ports)
+    return kept
+
+
+def aggregate_rules(rules: Iterable[Rule]) -> list[Rule]:
+    """The smallest equivalent list of ``rules``, sorted.
+
+    Per protocol, overlapping and adjacent source networks on the same ports are collapsed into their supernets,
+    overlapping and adjacent port ranges from the same network are merged, and rules that another rule already
+    covers are dropped, until nothing changes. A merged rule keeps the distinct descriptions of its parts, joined by
+    ``; ``. Rules of different protocols are never merged.
+    """
+    entries: _Entries = {}
+    for rule in rules:
+        key = (rule.protocol, rule.network, rule.ports)
+        entries[key] = entries.get(key, frozenset()) | ({rule.description} if rule.description else frozenset())
+    while True:
+        # Every step only ever removes entries, so this stops once a round changes nothing.
+        aggregated = _drop_covered(_merge_ports(_collapse_networks(entries)))
+        if aggregated == entries:
+            break
+        entries = aggregated
+    result = [
+        Rule(protocol, network, ports, "; ".join(sorted(descriptions)))
+        for (protocol, network, ports), descriptions in entries.items()
+    ]
+    return sorted(result, key=Rule.sort_key)
+
+
+def rule_from_model(rule: FirewallRule) -> Rule:
+    ports = None if isinstance(rule.port_range, Unset) or not rule.port_range else tuple(rule.port_range)
+    return Rule(rule.protocol.value, ipaddress.ip_network(rule.source_network, strict=False), ports, rule.description)
+
+
+def diff_rules(current: Iterable[Rule], desired: Iterable[Rule]) -> tuple[tuple[Rule, ...], tuple[Rule, ...]]:
+    """The rules to add and to remove to turn ``current`` into ``desired``, regardless of their order."""
+    current_counts, desired_counts = Counter(current), Counter(desired)
+    added = sorted((desired_counts - current_counts).elements(), key=Rule.sort_key)
+    removed = sorted((current_counts - desired_counts).elements(), key=Rule.sort_key)
+    return tuple(added), tuple(removed)
+
+
+def _fetch(call: Any, *args: Any) -> Any:
+    response = call(*args, client=auth_client())
+    response.raise_for_status()
+    return response.parsed.data
+
+
+@profiled("parse")
+def fetch_firewall_state(spec: FirewallSpec) -> tuple[list[Rule] | None, list[Rule] | None, dict[str, Any]]:
+    """The current account rules, global rules and rulesets by name, each only when ``spec`` has the section.
+
+    The listings run concurrently.
+    """
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="lai-firewall") as executor:
+        rules = executor.submit(_fetch, _list_firewall_rules) if spec.rules is not None else None
+        global_ruleset = (
+            executor.submit(_fetch, _get_global_firewall_ruleset) if spec.global_rules is not None else None
+        )
+        rulesets = executor.submit(_fetch, _list_firewall_rulesets) if spec.rulesets else None
+        return (
+            [rule_from_model(rule) for rule in rules.result()] if rules else None,
+            [rule_from_model(rule) for rule in global_ruleset.result().rules] if global_ruleset else None,
+            {ruleset.name: ruleset for ruleset in rulesets.result()} if rulesets else {},
+        )
+
+
+def plan_firewall(
+    spec: FirewallSpec, rules: list[Rule] | None, global_rules: list[Rule] | None, rulesets: dict[str, Any]
+) -> list[FirewallChange]:
+    """The rule lists that differ from ``spec``, unchanged ones are left out."""
+    targets: list[tuple[str, str | None, list[Rule], tuple[Rule, ...]]] = []
+    if spec.rules is not None:
+        targets.append(("rules", None, rules or [], spec.rules))
+    if spec.global_rules is not None:
+        targets.append(("global", None, global_rules or [], spec.global_rules))
+    for name, desired in spec.rulesets.items():
+        ruleset = rulesets.get(name)
+        if ruleset is None:
+            raise RuntimeError(f"No firewall ruleset named {name}, create it first.")
+        targets.append((f"ruleset {name}", ruleset.id, [rule_from_model(rule) for rule in ruleset.rules], desired))
+
+    changes = []
+    for target, ruleset_id, current, desired in targets:
+        added, removed = diff_rules(current, desired)
+        if added or removed:
+            changes.append(FirewallChange(target, ruleset_id, desired, added, removed))
+    return changes
+
+
+def _write(change: FirewallChange) -> None:
+    rules = [rule.to_model() for rule in change.rules]
+    if change.target == "rules":
+        response = _set_firewall_rules(client=auth_client(), body=FirewallRulesPutRequest(data=rules))
+    elif change.target == "global":
+        response = _update_global_firewall_ruleset(
+            client=auth_client(), body=GlobalFirewallRulesetPatchRequest(rules=rules)
+        )
+    else:
+        response = _update_firewall_ruleset(
+            change.ruleset_id, client=auth_client(), body=FirewallRulesetPatchRequest(rules=rules)
+        )
+    response.raise_for_status()
+
+
+def apply_firewall(path: Path, dry_run: bool) -> None:
+    spec = load_firewall_spec(path)
+    changes = plan_firewall(spec, *fetch_firewall_state(spec))
+    render_firewall_plan(spec, changes)
+    if not changes or dry_run:
+        if changes:
+            print("Dry-run, exiting without applying the changes...")
+        return
+    # Only the lists that changed are written, each in one call, and the calls run concurrently.
+    with ThreadPoolExecutor(max_workers=len(changes), thread_name_prefix="lai-firewall") as executor:
+        list(executor.map(_write, changes))
+    print(f"Updated {', '.join(change.target for change in changes)}.")
+
+
+@profiled("render")
+def render_firewall_plan(spec: FirewallSpec, changes: list[FirewallChange]) -> None:
+    aggregated = sum(len(rules) for rules in (spec.rules, spec.global_rules, *spec.rulesets.values()) if rules)
+    print(f"{spec.entries} rules in the spec, {aggregated} after aggregation.")
+    if not changes:
+        print("No changes, the firewall matches the spec.")
+        return
+    for change in changes:
+        print(f"{change.target}: +{len(change.added)} -{len(change.removed)}, {len(change.rules)} in total")
+        for rule in change.added:
+            print(f"[green]+ {escape(str(rule))}[/green]")
+        for rule in change.removed:
+            print(f"[red]- {escape(str(rule))}[/red]")
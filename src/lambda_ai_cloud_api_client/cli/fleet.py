@@ -0,0 +1,370 @@
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from rich import print
+from rich.table import Table
+
+from lambda_ai_cloud_api_client.api.instances.launch_instance import sync_detailed as launch_instance
+from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.cli.ls import list_instances
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.ranking import RANK_METRICS, rank_instance_types
+from lambda_ai_cloud_api_client.cli.rename import rename_instance
+from lambda_ai_cloud_api_client.cli.spec_file import load_spec_document, spec_error
+from lambda_ai_cloud_api_client.cli.stop import terminate_instances
+from lambda_ai_cloud_api_client.cli.type_index import InstanceTypeIndex, parse_type_query
+from lambda_ai_cloud_api_client.cli.types import list_instance_types, type_filter_conditions
+from lambda_ai_cloud_api_client.models import (
+    FirewallRulesetEntry,
+    ImageSpecificationFamily,
+    ImageSpecificationID,
+    Instance,
+    InstanceLaunchRequest,
+    InstanceStatus,
+    InstanceTypesItem,
+    PublicRegionCode,
+    RequestedTagEntry,
+)
+from lambda_ai_cloud_api_client.types import Unset
+
+# Every instance of a fleet carries these two tags, they are how apply finds its instances again.
+FLEET_TAG = "fleet"
+GROUP_TAG = "fleet-group"
+_GONE_STATUSES = (InstanceStatus.TERMINATING, InstanceStatus.TERMINATED, InstanceStatus.PREEMPTED)
+_GROUP_FIELDS = (
+    "name",
+    "count",
+    "instance_type",
+    "where",
+    "rank",
+    "regions",
+    "ssh_keys",
+    "filesystems",
+    "firewall_rulesets",
+    "tags",
+    "image_family",
+    "image_id",
+)
+
+
+class FleetGroup(NamedTuple):
+    name: str
+    count: int
+    ssh_keys: tuple[str, ...]
+    instance_type: str | None = None
+    where: str | None = None  # a --where query, see parse_type_query
+    rank: str | None = None  # how to pick among the matching types, the cheapest without it
+    regions: tuple[str, ...] = ()  # in order of preference, any region without them
+    filesystems: tuple[str, ...] = ()
+    firewall_rulesets: tuple[str, ...] = ()
+    tags: tuple[tuple[str, str], ...] = ()
+    image_family: str | None = None
+    image_id: str | None = None
+
+    def instance_names(self) -> list[str]:
+        return [f"{self.name}-{i}" for i in range(self.count)]
+
+
+class FleetSpec(NamedTuple):
+    name: str
+    groups: tuple[FleetGroup, ...]
+
+
+class FleetChange(NamedTuple):
+    action: str  # launch | rename | terminate
+    group: str
+    name: str  # the instance's name after the change, its current one for terminate
+    instance_id: str | None  # None for launch
+    instance_type: str
+    region: str
+    reason: str
+
+
+def _spec_error(path: Path, reason: str) -> RuntimeError:
+    return spec_error(path, "fleet spec", reason)
+
+
+def _strings(path: Path, group: str, field: str, value: Any) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise _spec_error(path, f"{group}.{field} must be a list of strings.")
+    return tuple(value)
+
+
+def _string(path: Path, group: str, field: str, value: Any) -> str | None:
+    if value is not None and not isinstance(value, str):
+        raise _spec_error(path, f"{group}.{field} must be a string.")
+    return value
+
+
+def _group(path: Path, raw: Any) -> FleetGroup:
+    if not isinstance(raw, dict) or not isinstance(raw.get("name"), str) or not raw["name"]:
+        raise _spec_error(path, "every entry of instances needs a name.")
+    name = raw["name"]
+    if unknown := sorted(set(raw) - set(_GROUP_FIELDS)):
+        raise _spec_error(path, f"{name} has unknown fields {', '.join(unknown)}, use {', '.join(_GROUP_FIELDS)}.")
+    count = raw.get("count", 1)
+    if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+        raise _spec_error(path, f"{name}.count must be a number of instances.")
+    ssh_keys = _strings(path, name, "ssh_keys", raw.get("ssh_keys"))
+    if count and not ssh_keys:
+        raise _spec_error(path, f"{name} needs ssh_keys to launch instances.")
+    instance_type, where, rank, image_family, image_id = (
+        _string(path, name, field, raw.get(field))
+        for field in ("instance_type", "where", "rank", "image_family", "image_id")
+    )
+    if not instance_type and not where:
+        raise _spec_error(path, f"{name} needs an instance_type or a where query.")
+    if where:
+        try:
+            parse_type_query(where)
+        except RuntimeError as e:
+            raise _spec_error(path, f"{name}.where: {e}") from None
+    if rank is not None and rank not in RANK_METRICS:
+        raise _spec_error(path, f"{name}.rank must be one of {', '.join(RANK_METRICS)}.")
+    tags = raw.get("tags") or {}
+    if not isinstance(tags, dict) or {FLEET_TAG, GROUP_TAG} & set(tags):
+        raise _spec_error(path, f"{name}.tags must be a mapping without the {FLEET_TAG} and {GROUP_TAG} keys.")
+    if not all(isinstance(key, str) and isinstance(value, str) for key, value in tags.items()):
+        raise _spec_error(path, f"{name}.tags must map strings to strings, quote numbers and leave no value empty.")
+    return FleetGroup(
+        name=name,
+        count=count,
+        ssh_keys=ssh_keys,
+        instance_type=instance_type,
+        where=where,
+        rank=rank,
+        regions=_strings(path, name, "regions", raw.get("regions")),
+        filesystems=_strings(path, name, "filesystems", raw.get("filesystems")),
+        firewall_rulesets=_strings(path, name, "firewall_rulesets", raw.get("firewall_rulesets")),
+        tags=tuple(tags.items()),
+        image_family=image_family,
+        image_id=image_id,
+    )
+
+
+def load_fleet_spec(path: Path) -> FleetSpec:
+    """Read a fleet spec from YAML (needs the ``[yaml]`` extra) or, for ``.json`` files, JSON::
+
+    name: training
+    instances:
+      - name: trainer
+        count: 4
+        where: gpus >= 8 and gpu = H100
+        regions: [us-east-1, us-west-1]
+        ssh_keys: [laptop]
+        tags: {team: research}
+    """
+    document = load_spec_document(path, "fleet spec")
+    if not isinstance(document, dict) or not isinstance(document.get("name"), str) or not document["name"]:
+        raise _spec_error(path, "it needs a fleet name.")
+    if not isinstance(document.get("instances"), list):
+        raise _spec_error(path, "it needs a list of instances.")
+    groups = tuple(_group(path, raw) for raw in document["instances"])
+    names = [group.name for group in groups]
+    if len(set(names)) != len(names):
+        raise _spec_error(path, "instance group names must be unique.")
+    return FleetSpec(document["name"], groups)
+
+
+def _tags(instance: Instance) -> dict[str, str]:
+    return {} if isinstance(instance.tags, Unset) else {tag.key: tag.value for tag in instance.tags}
+
+
+def _conditions(group: FleetGroup) -> tuple:
+    return type_filter_conditions(instance_type=group.instance_type, region=group.regions, where=group.where)
+
+
+def _matches(instance: Instance, group: FleetGroup) -> bool:
+    # The instance's type and region as a one-type index, so that it is judged by exactly the launch conditions.
+    item = InstanceTypesItem(instance_type=instance.instance_type, regions_with_capacity_available=[instance.region])
+    return bool(InstanceTypeIndex([item]).select(_conditions(group)))
+
+
+def _launch_target(group: FleetGroup, index: InstanceTypeIndex) -> tuple[str, str] | None:
+    """The best type with capacity and its most preferred region, ``None`` without capacity."""
+    candidates = index.select((*_conditions(group), *type_filter_conditions(available=True)))
+    if group.rank:
+        candidates = [score.item for score in rank_instance_types(candidates, group.rank)]
+    else:
+        candidates = sorted(candidates, key=lambda item: item.instance_type.price_cents_per_hour)
+    for region in group.regions or (None,):
+        for item in candidates:
+            regions = [r.name.value for r in item.regions_with_capacity_available]
+            if region is None and regions:
+                return item.instance_type.name, regions[0]
+            if region in regions:
+                return item.instance_type.name, region
+    return None
+
+
+def _plan_group(group: FleetGroup, owned: list[Instance], index: InstanceTypeIndex | None) -> list[FleetChange]:
+    changes: list[FleetChange] = []
+    desired = group.instance_names()
+    slots = {name: position for position, name in enumerate(desired)}
+    matching = [i for i in owned if _matches(i, group)]
+    for instance in owned:
+        if instance not in matching:
+            changes.append(_change("terminate", group.name, instance, instance.name, "type/region no longer match"))
+
+    # Instances that already hold a name of the spec keep it, the rest are renamed into the free names.
+    matching.sort(key=lambda i: (i.name not in slots, slots.get(i.name, 0), str(i.name), i.id))
+    kept, extra = matching[: group.count], matching[group.count :]
+    for instance in extra:
+        changes.append(_change("terminate", group.name, instance, instance.name, f"more than {group.count}"))
+    claimed = {i.name for i in kept if i.name in slots}
+    free = [name for name in desired if name not in claimed]
+    seen: set[str] = set()
+    for instance in kept:
+        if instance.name in slots and instance.name not in seen:
+            seen.add(instance.name)
+            continue
+        new_name = free.pop(0)
+        changes.append(_change("rename", group.name, instance, new_name, f"was {instance.name}"))
+
+    if free:
+        instance_type, region = "", ""
+        if index is not None:
+            target = _launch_target(group, index)
+            if target is None:
+                raise RuntimeError(f"No instance type with capacity matches {group.name}.")
+            instance_type, region = target
+        for name in free:
+            changes.append(FleetChange("launch", group.name, name, None, instance_type, region, "missing"))
+    return changes
+
+
+def _change(action: str, group: str, instance: Instance, name: Any, reason: str) -> FleetChange:
+    return FleetChange(
+        action, group, str(name), instance.id, instance.instance_type.name, instance.region.name.value, reason
+    )
+
+
+def plan_fleet(
+    spec: FleetSpec, instances: Iterable[Instance], instance_types: Iterable[InstanceTypesItem] | None
+) -> list[FleetChange]:
+    """The launches, renames and terminations that turn ``instances`` into the fleet ``spec`` describes.
+
+    Only instances tagged with the fleet's name are considered. An instance is kept while its type and region still
+    satisfy its group, and running the plan again after applying it yields no changes. Without ``instance_types``
+    the launches have no type and region yet.
+    """
+    live = [i for i in instances if i.status not in _GONE_STATUSES and _tags(i).get(FLEET_TAG) == spec.name]
+    by_group: dict[str, list[Instance]] = {}
+    for instance in live:
+        by_group.setdefault(_tags(instance).get(GROUP_TAG, ""), []).append(instance)
+
+    index = InstanceTypeIndex(instance_types) if instance_types is not None else None
+    changes: list[FleetChange] = []
+    for group in spec.groups:
+        changes.extend(_plan_group(group, by_group.pop(group.name, []), index))
+    for group_name, orphans in sorted(by_group.items()):
+        for instance in orphans:
+            changes.append(_change("terminate", group_name, instance, instance.name, "group not in the spec"))
+    return changes
+
+
+def _launch_request(spec: FleetSpec, group: FleetGroup, change: FleetChange) -> InstanceLaunchRequest:
+    request: dict[str, Any] = {
+        "region_name": PublicRegionCode(change.region),
+        "instance_type_name": change.instance_type,
+        "ssh_key_names": list(group.ssh_keys),
+        "name": change.name,
+        "tags": [
+            RequestedTagEntry(key=key, value=value)
+            for key, value in (*group.tags, (FLEET_TAG, spec.name), (GROUP_TAG, group.name))
+        ],
+    }
+    if group.filesystems:
+        request["file_system_names"] = list(group.filesystems)
+    if group.firewall_rulesets:
+        request["firewall_rulesets"] = [FirewallRulesetEntry(id=rid) for rid in group.firewall_rulesets]
+    if group.image_id:
+        request["image"] = ImageSpecificationID(id=group.image_id)
+    elif group.image_family:
+        request["image"] = ImageSpecificationFamily(family=group.image_family)
+    return InstanceLaunchRequest(**request)
+
+
+def _launch(request: InstanceLaunchRequest) -> list[str]:
+    response = launch_instance(client=auth_client(), body=request)
+    response.raise_for_status()
+    return response.parsed.data.instance_ids
+
+
+def apply_fleet_plan(spec: FleetSpec, changes: list[FleetChange], concurrency: int) -> dict[str, int]:
+    """Terminate in one API call, then rename and launch concurrently. Returns the number of changes per action.
+
+    Every change is attempted, failures are reported together afterwards; applying the spec again retries them.
+    """
+    groups = {group.name: group for group in spec.groups}
+    done = {"launch": 0, "rename": 0, "terminate": 0}
+    terminate = [change.instance_id for change in changes if change.action == "terminate"]
+    if terminate:
+        done["terminate"] = len(terminate_instances(terminate))
+
+    def run(change: FleetChange) -> str | None:
+        try:
+            if change.action == "rename":
+                rename_instance(change.instance_id, change.name)
+            else:
+                _launch(_launch_request(spec, groups[change.group], change))
+        except Exception as e:
+            return f"{change.action} {change.name}: {e}"
+        return None
+
+    rest = [change for change in changes if change.action != "terminate"]
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="lai-apply") as executor:
+        results = list(executor.map(run, rest))
+    for change, error in zip(rest, results, strict=True):
+        if error is None:
+            done[change.action] += 1
+    if errors := [error for error in results if error]:
+        raise RuntimeError(f"{len(errors)} of {len(changes)} changes failed: {'; '.join(errors)}")
+    return done
+
+
+def apply_fleet(path: Path, dry_run: bool, concurrency: int) -> None:
+    spec = load_fleet_spec(path)
+    instances = list_instances()
+    changes = plan_fleet(spec, instances, None)
+    if any(change.action == "launch" for change in changes):
+        # The instance types are only listed when the fleet is short of instances.
+        changes = plan_fleet(spec, instances, list_instance_types())
+    render_fleet_plan(spec, changes)
+    if not changes:
+        return
+    if dry_run:
+        print("Dry-run, exiting without applying the plan...")
+        return
+    done = apply_fleet_plan(spec, changes, concurrency)
+    print(f"Launched {done['launch']}, renamed {done['rename']} and terminated {done['terminate']} instances.")
+
+
+@profiled("render")
+def render_fleet_plan(spec: FleetSpec, changes: list[FleetChange]) -> None:
+    if not changes:
+        print(f"No changes, fleet {spec.name} matches the spec.")
+        return
+
+    table = Table(title=f"Plan for fleet {spec.name}", show_lines=False)
+    for column in ("Action", "Group", "Name", "Type", "Region", "Instance", "Reason"):
+        table.add_column(column)
+    for change in changes:
+        table.add_row(
+            change.action,
+            change.group,
+            change.name,
+            change.instance_type,
+            change.region,
+            change.instance_id or "-",
+            change.reason,
+        )
+    counts = {action: sum(c.action == action for c in changes) for action in ("launch", "rename", "terminate")}
+    table.caption = ", ".join(f"{count} to {action}" for action, count in counts.items())
+    print(table)
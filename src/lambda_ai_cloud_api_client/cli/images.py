@@ -1,11 +1,29 @@
+from collections.abc import Iterator
+
 from rich import print
 from rich.table import Table
 
+from lambda_ai_cloud_api_client.api.images.list_images import _get_kwargs as _list_images_kwargs
 from lambda_ai_cloud_api_client.api.images.list_images import sync_detailed as _list_images
-from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.cli.client import auth_client, request_raw_data_json, request_raw_items
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.response import Columns
 from lambda_ai_cloud_api_client.models import Image
 
+IMAGE_COLUMNS: Columns = (
+    ("id", str),
+    ("name", str),
+    ("description", str),
+    ("family", str),
+    ("version", str),
+    ("architecture", str),
+    ("region.name", str),
+    ("created_time", str),
+    ("updated_time", str),
+)
+
 
+@profiled("parse")
 def list_images() -> list[Image]:
     client = auth_client()
     response = _list_images(client=client)
@@ -13,6 +31,17 @@ def list_images() -> list[Image]:
     return response.parsed.data
 
 
+@profiled("parse")
+def list_images_raw() -> Iterator[dict]:
+    return request_raw_items(_list_images_kwargs())
+
+
+@profiled("parse")
+def list_images_json() -> bytes:
+    return request_raw_data_json(_list_images_kwargs())
+
+
+@profiled("filter")
 def filter_images(
     images: list[Image],
     family: tuple[str, ...] | None = None,
@@ -34,6 +63,7 @@ def filter_images(
     return filtered_images
 
 
+@profiled("render")
 def render_images_table(images: list[Image]) -> None:
     if not images:
         print("No images found.")
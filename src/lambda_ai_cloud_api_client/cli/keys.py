@@ -1,11 +1,23 @@
+from collections.abc import Iterator
+
 from rich import print
 from rich.table import Table
 
+from lambda_ai_cloud_api_client.api.ssh_keys.list_ssh_keys import _get_kwargs as _list_keys_kwargs
 from lambda_ai_cloud_api_client.api.ssh_keys.list_ssh_keys import sync_detailed as _list_keys
-from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.cli.client import auth_client, request_raw_data_json, request_raw_items
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.response import Columns
 from lambda_ai_cloud_api_client.models import SSHKey
 
+KEY_COLUMNS: Columns = (
+    ("id", str),
+    ("name", str),
+    ("public_key", str),
+)
+
 
+@profiled("parse")
 def list_keys() -> list[SSHKey]:
     client = auth_client()
     response = _list_keys(client=client)
@@ -13,6 +25,17 @@ def list_keys() -> list[SSHKey]:
     return response.parsed.data
 
 
+@profiled("parse")
+def list_keys_raw() -> Iterator[dict]:
+    return request_raw_items(_list_keys_kwargs())
+
+
+@profiled("parse")
+def list_keys_json() -> bytes:
+    return request_raw_data_json(_list_keys_kwargs())
+
+
+@profiled("filter")
 def filter_keys(keys: list[SSHKey], id: str | None = None, name: str | None = None) -> list[SSHKey]:
     filtered_keys = []
     for key in keys:
@@ -24,6 +47,7 @@ def filter_keys(keys: list[SSHKey], id: str | None = None, name: str | None = No
     return filtered_keys
 
 
+@profiled("render")
 def render_keys_table(keys: list[SSHKey]) -> None:
     if not keys:
         print("No keys found.")
@@ -1,14 +1,43 @@
+from collections.abc import Iterable, Iterator, Sequence
+
 from rich import print
+from rich.console import RenderableType
 from rich.table import Table
 
+from lambda_ai_cloud_api_client.api.instances.list_instances import _get_kwargs as _list_instances_kwargs
+from lambda_ai_cloud_api_client.api.instances.list_instances import asyncio_detailed as _alist_instances
 from lambda_ai_cloud_api_client.api.instances.list_instances import sync_detailed as _list_instances
-from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.cli.client import auth_client, request_raw_data_json, request_raw_items
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.response import Columns
 from lambda_ai_cloud_api_client.models import (
     Instance,
 )
 from lambda_ai_cloud_api_client.types import Unset
 
+INSTANCE_COLUMNS: Columns = (
+    ("id", str),
+    ("name", str),
+    ("status", str),
+    ("ip", str),
+    ("private_ip", str),
+    ("hostname", str),
+    ("region.name", str),
+    ("instance_type.name", str),
+    ("instance_type.gpu_description", str),
+    ("instance_type.price_cents_per_hour", int),
+    ("instance_type.specs.vcpus", int),
+    ("instance_type.specs.memory_gib", int),
+    ("instance_type.specs.storage_gib", int),
+    ("instance_type.specs.gpus", int),
+    ("ssh_key_names", str),
+    ("file_system_names", str),
+    ("firewall_rulesets", str),
+    ("tags", str),
+)
+
 
+@profiled("parse")
 def list_instances() -> list[Instance]:
     client = auth_client()
     response = _list_instances(client=client)
@@ -16,6 +45,24 @@ def list_instances() -> list[Instance]:
     return response.parsed.data
 
 
+async def alist_instances() -> list[Instance]:
+    client = auth_client()
+    response = await _alist_instances(client=client)
+    response.raise_for_status()
+    return response.parsed.data
+
+
+@profiled("parse")
+def list_instances_raw() -> Iterator[dict]:
+    return request_raw_items(_list_instances_kwargs())
+
+
+@profiled("parse")
+def list_instances_json() -> bytes:
+    return request_raw_data_json(_list_instances_kwargs())
+
+
+@profiled("filter")
 def filter_instances(
     instances: list[Instance],
     region: tuple[str, ...] | None = None,
@@ -36,11 +83,25 @@ def filter_instances(
     return filtered_instances
 
 
-def render_instances_table(instances: list[Instance], title: str = "Instances") -> None:
-    if not instances:
-        print("No instances found.")
-        return
+def instance_row(instance: Instance) -> tuple[str, ...]:
+    inst_type = getattr(instance, "instance_type", None)
+    price = getattr(inst_type, "price_cents_per_hour", 0) / 100
+    ip = getattr(instance, "ip", "")
+    if isinstance(ip, Unset):
+        ip = ""
+
+    return (
+        getattr(instance, "id", ""),
+        getattr(instance, "name", ""),
+        ip,
+        getattr(instance, "status", ""),
+        getattr(getattr(instance, "region", None), "name", "") or "",
+        getattr(inst_type, "gpu_description", "") or "",
+        f"{price:.2f}",
+    )
+
 
+def build_instances_table(rows: Iterable[Sequence[RenderableType]], title: str = "Instances") -> Table:
     table = Table(title=title, show_lines=False)
     table.add_column("ID")
     table.add_column("Name")
@@ -50,21 +111,16 @@ def render_instances_table(instances: list[Instance], title: str = "Instances")
     table.add_column("GPU")
     table.add_column("Price ($/hr)")
 
-    for instance in instances:
-        inst_type = getattr(instance, "instance_type", None)
-        price = getattr(inst_type, "price_cents_per_hour", 0) / 100
-        ip = getattr(instance, "ip", "")
-        if isinstance(ip, Unset):
-            ip = ""
-
-        table.add_row(
-            getattr(instance, "id", ""),
-            getattr(instance, "name", ""),
-            ip,
-            getattr(instance, "status", ""),
-            getattr(getattr(instance, "region", None), "name", "") or "",
-            getattr(inst_type, "gpu_description", "") or "",
-            f"{price:.2f}",
-        )
-
-    print(table)
+    for row in rows:
+        table.add_row(*row)
+
+    return table
+
+
+@profiled("render")
+def render_instances_table(instances: list[Instance], title: str = "Instances") -> None:
+    if not instances:
+        print("No instances found.")
+        return
+
+    print(build_instances_table((instance_row(i) for i in instances), title=title))
@@ -0,0 +1,186 @@
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+from typing import TypeVar
+
+from rich.console import Console
+from rich.table import Table
+
+from lambda_ai_cloud_api_client.cli.daemon import STARTED_AT
+from lambda_ai_cloud_api_client.instrumentation import DECODE, REQUEST_END, REQUEST_START, Event
+
+T = TypeVar("T")
+
+PHASES = ("import", "auth", "network", "parse", "filter", "render")
+# Time not spent in any of PHASES: option parsing, command logic, waiting.
+OTHER_PHASE = "cli"
+
+
+class PhaseProfiler:
+    """Splits the wall time of one CLI invocation into exclusive phases, nested phases pause the enclosing one."""
+
+    def __init__(self, started_at: float, name: str = "lai") -> None:
+        self.started_at = started_at
+        self.name = name
+        self.totals: dict[str, float] = defaultdict(float)
+        # Open/close events for the speedscope trace: (type, phase, seconds since started_at).
+        self.events: list[tuple[str, str, float]] = []
+        self.finished_at: float | None = None
+        self._stack: list[list] = []
+        self._thread = threading.get_ident()
+
+    def push(self, phase: str, at: float | None = None) -> None:
+        if threading.get_ident() != self._thread:
+            return
+        at = time.perf_counter() if at is None else at
+        if self._stack:
+            self.totals[self._stack[-1][0]] += at - self._stack[-1][1]
+        self._stack.append([phase, at])
+        self.events.append(("O", phase, at - self.started_at))
+
+    def pop(self, at: float | None = None) -> None:
+        if threading.get_ident() != self._thread or not self._stack:
+            return
+        at = time.perf_counter() if at is None else at
+        phase, since = self._stack.pop()
+        self.totals[phase] += at - since
+        self.events.append(("C", phase, at - self.started_at))
+        if self._stack:
+            self._stack[-1][1] = at
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        self.push(phase)
+        try:
+            yield
+        finally:
+            self.pop()
+
+    def finish(self) -> None:
+        while self._stack:
+            self.pop()
+        self.finished_at = time.perf_counter()
+
+    @property
+    def total(self) -> float:
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def report(self) -> list[tuple[str, float]]:
+        rows = [(phase, self.totals.get(phase, 0.0)) for phase in PHASES]
+        rows.append((OTHER_PHASE, max(self.total - sum(seconds for _, seconds in rows), 0.0)))
+        return rows
+
+    def speedscope(self) -> dict:
+        # https://github.com/jlfwong/speedscope/wiki/Importing-from-custom-sources, an "evented" profile in ms.
+        frames = [self.name, *PHASES]
+        index = {name: i for i, name in enumerate(frames)}
+        events = [{"type": "O", "frame": 0, "at": 0.0}]
+        events += [{"type": type_, "frame": index[phase], "at": at * 1000} for type_, phase, at in self.events]
+        events.append({"type": "C", "frame": 0, "at": self.total * 1000})
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": [
+                {
+                    "type": "evented",
+                    "name": self.name,
+                    "unit": "milliseconds",
+                    "startValue": 0.0,
+                    "endValue": self.total * 1000,
+                    "events": events,
+                }
+            ],
+            "name": self.name,
+            "exporter": "lambda-ai-cloud-api-client",
+        }
+
+
+_active: PhaseProfiler | None = None
+
+
+def profiled(phase: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Count the time spent in the decorated function as ``phase`` while ``--profile`` is on."""
+
+    def decorate(f: Callable[..., T]) -> Callable[..., T]:
+        @wraps(f)
+        def wrapper(*args, **kwargs) -> T:
+            profiler = _active
+            if profiler is None:
+                return f(*args, **kwargs)
+            with profiler.phase(phase):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def _on_request_event(event: Event) -> None:
+    profiler = _active
+    if profiler is None:
+        return
+    if event.kind == REQUEST_START:
+        profiler.push("network")
+    elif event.kind == DECODE:
+        # The JSON body was decoded before the request ended, that part is parsing.
+        decode_started = time.perf_counter() - event.duration
+        profiler.pop(at=decode_started)
+        profiler.push("parse", at=decode_started)
+    elif event.kind == REQUEST_END:
+        profiler.pop()
+
+
+def start_profiling(output: Path | None = None) -> Callable[[], None]:
+    """Start profiling this invocation, returns the function that stops it and prints/writes the results."""
+    from lambda_ai_cloud_api_client.cli.client import instrumentation
+
+    global _active
+    now = time.perf_counter()
+    profiler = _active = PhaseProfiler(STARTED_AT, name=" ".join(["lai", *sys.argv[1:]]))
+    profiler.push("import", at=STARTED_AT)
+    profiler.pop(at=now)
+    for kind in (REQUEST_START, DECODE, REQUEST_END):
+        instrumentation().on(kind, _on_request_event)
+
+    cprofile = None
+    if output is not None and output.suffix != ".json":
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    def stop() -> None:
+        global _active
+        if cprofile is not None:
+            cprofile.disable()
+            cprofile.dump_stats(output)
+        profiler.finish()
+        _active = None
+        if output is not None and cprofile is None:
+            output.write_text(json.dumps(profiler.speedscope()))
+        print_profile(profiler)
+
+    return stop
+
+
+def build_profile_table(profiler: PhaseProfiler) -> Table:
+    table = Table(title="Profile", show_lines=False)
+    table.add_column("Phase")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Share", justify="right")
+    total = profiler.total
+    for phase, seconds in profiler.report():
+        table.add_row(phase, f"{seconds * 1000:.1f}", f"{seconds / total:.0%}" if total else "")
+    table.add_section()
+    table.add_row("total", f"{total * 1000:.1f}", "")
+    return table
+
+
+def print_profile(profiler: PhaseProfiler) -> None:
+    Console(stderr=True).print(build_profile_table(profiler))
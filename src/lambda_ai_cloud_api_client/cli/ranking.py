@@ -0,0 +1,281 @@
+import math
+import re
+from collections.abc import Iterable
+from functools import cache
+from typing import NamedTuple
+
+from rich import print
+from rich.table import Table
+
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.response import Columns
+from lambda_ai_cloud_api_client.models import InstanceTypesItem
+
+# Resources a requirement or ranking can refer to, and how to read them off an instance type.
+RESOURCES = ("gpus", "gpu-memory", "vcpus", "memory")
+RANK_METRICS = ("price", "gpu", "gpu-memory", "vcpu")
+
+_GPU_MEMORY = re.compile(r"\((\d+(?:\.\d+)?)\s*GB\b")
+# Combinations larger than this are not searched, see cheapest_combination.
+MAX_INSTANCES = 64
+
+
+@cache
+def gpu_memory_gib(gpu_description: str) -> float:
+    """Memory of one GPU, 80 for ``H100 (80 GB SXM5)``, 0 when the description doesn't say."""
+    match = _GPU_MEMORY.search(gpu_description)
+    return float(match.group(1)) if match else 0.0
+
+
+class TypeScore(NamedTuple):
+    item: InstanceTypesItem
+    price: float  # $/hr
+    resources: dict[str, float]  # per RESOURCES, gpu-memory summed over the GPUs
+
+    @property
+    def name(self) -> str:
+        return self.item.instance_type.name
+
+    def cost_per(self, resource: str) -> float:
+        """$/hr per unit of ``resource``, infinite for types without it."""
+        amount = self.resources[resource]
+        return self.price / amount if amount else math.inf
+
+    def metric(self, metric: str) -> float:
+        if metric == "price":
+            return self.price
+        return self.cost_per({"gpu": "gpus", "vcpu": "vcpus"}.get(metric, metric))
+
+    def to_dict(self) -> dict:
+        cost = {
+            "price_per_gpu": self.cost_per("gpus"),
+            "price_per_gpu_memory_gib": self.cost_per("gpu-memory"),
+            "price_per_vcpu": self.cost_per("vcpus"),
+        }
+        return {
+            **self.item.to_dict(),
+            "gpu_memory_gib": self.resources["gpu-memory"],
+            # Dollars per hour, rounded to a tenth of a cent; null for types without the resource.
+            **{key: None if math.isinf(value) else round(value, 4) for key, value in cost.items()},
+        }
+
+
+def score_instance_type(item: InstanceTypesItem) -> TypeScore:
+    specs = item.instance_type.specs
+    resources = {
+        "gpus": specs.gpus,
+        "gpu-memory": specs.gpus * gpu_memory_gib(item.instance_type.gpu_description),
+        "vcpus": specs.vcpus,
+        "memory": specs.memory_gib,
+    }
+    return TypeScore(item, item.instance_type.price_cents_per_hour / 100, resources)
+
+
+def rank_instance_types(items: Iterable[InstanceTypesItem], metric: str = "gpu") -> list[TypeScore]:
+    """``items`` from the best to the worst value for money by ``metric``, one of :data:`RANK_METRICS`.
+
+    ``gpu``, ``gpu-memory`` and ``vcpu`` rank by the price per GPU, per GiB of GPU memory and per vCPU, types without
+    that resource last. Ties go to the cheaper type.
+    """
+    scores = [score_instance_type(item) for item in items]
+    return sorted(scores, key=lambda s: (s.metric(metric), s.price, s.name))
+
+
+def _dominates(a: TypeScore, b: TypeScore) -> bool:
+    at_least = a.price <= b.price and all(a.resources[r] >= b.resources[r] for r in RESOURCES)
+    better = a.price < b.price or any(a.resources[r] > b.resources[r] for r in RESOURCES)
+    return at_least and better
+
+
+def pareto_front(items: Iterable[InstanceTypesItem]) -> list[TypeScore]:
+    """The types no other type beats on price and every resource at once, cheapest first.
+
+    Anything not on the front is overpaying: some type on it costs no more and has at least as many GPUs, GPU memory,
+    vCPUs and memory.
+    """
+    scores = sorted((score_instance_type(item) for item in items), key=lambda s: (s.price, s.name))
+    front: list[TypeScore] = []
+    for score in scores:
+        # Sorted by price, only an earlier (cheaper or equal) type can dominate this one.
+        if not any(_dominates(other, score) for other in front):
+            front.append(score)
+    return front
+
+
+class Combination(NamedTuple):
+    counts: tuple[tuple[TypeScore, int], ...]
+    price: float  # $/hr
+
+    @property
+    def instances(self) -> int:
+        return sum(count for _, count in self.counts)
+
+    def total(self, resource: str) -> float:
+        return sum(score.resources[resource] * count for score, count in self.counts)
+
+    def to_dict(self) -> dict:
+        return {
+            "instances": [
+                {
+                    "instance_type_name": score.name,
+                    "count": count,
+                    "price_cents_per_hour": score.item.instance_type.price_cents_per_hour,
+                    "regions_with_capacity_available": [
+                        region.name.value for region in score.item.regions_with_capacity_available
+                    ],
+                }
+                for score, count in self.counts
+            ],
+            "total_price_cents_per_hour": round(self.price * 100),
+            "totals": {resource: self.total(resource) for resource in RESOURCES},
+        }
+
+
+def parse_requirements(raw: Iterable[str]) -> dict[str, float]:
+    """``("gpus=8", "gpu-memory=640")`` as ``{"gpus": 8.0, "gpu-memory": 640.0}``."""
+    requirements: dict[str, float] = {}
+    for entry in raw:
+        resource, _, amount = entry.partition("=")
+        resource = resource.strip().lower().replace("_", "-")
+        if resource not in RESOURCES:
+            raise RuntimeError(
+                f"Invalid requirement '{entry}'. Use <resource>=<amount> with one of {', '.join(RESOURCES)}."
+            )
+        try:
+            requirements[resource] = float(amount)
+        except ValueError:
+            raise RuntimeError(f"Invalid requirement '{entry}'. {resource} needs a number.") from None
+        if requirements[resource] < 0:
+            raise RuntimeError(f"Invalid requirement '{entry}'. {resource} can't be negative.")
+    return requirements
+
+
+def cheapest_combination(
+    items: Iterable[InstanceTypesItem], requirements: dict[str, float], max_instances: int = MAX_INSTANCES
+) -> Combination | None:
+    """The cheapest multiset of at most ``max_instances`` instances whose resources add up to ``requirements``.
+
+    E.g. ``{"gpus": 8}`` finds whether one 8 GPU instance or several smaller ones are cheaper per hour. Ties go to
+    fewer instances. ``None`` when no combination meets the requirements.
+
+    An exact branch and bound search: types are tried best value first and a branch is cut as soon as its price plus
+    a lower bound for the remaining requirements (the remaining amount at the best price per unit of any type) can't
+    beat the best combination found so far.
+    """
+    wanted = {resource: amount for resource, amount in requirements.items() if amount > 0}
+    if not wanted:
+        return Combination((), 0.0)
+    # Only types that contribute to some requirement are worth buying, and of types with identical resources only
+    # the cheapest.
+    useful: dict[tuple, TypeScore] = {}
+    for item in items:
+        score = score_instance_type(item)
+        key = tuple(score.resources[r] for r in RESOURCES)
+        if any(score.resources[r] for r in wanted) and (key not in useful or score.price < useful[key].price):
+            useful[key] = score
+    # Types that cover the biggest requirement cheapest first, so that good combinations are found early.
+    scores = list(useful.values())
+    primary = max(wanted, key=lambda r: wanted[r] * min((s.cost_per(r) for s in scores), default=math.inf))
+    scores.sort(key=lambda s: (s.cost_per(primary), s.price))
+    # best_rates[i][r]: the lowest $/hr per unit of r among scores[i:], the types a branch at position i can still buy.
+    best_rates = [{r: math.inf for r in wanted}]
+    for score in reversed(scores):
+        best_rates.append({r: min(rate, score.cost_per(r)) for r, rate in best_rates[-1].items()})
+    best_rates.reverse()
+
+    # Prices in cents, so that equal totals compare equal.
+    best: list = [math.inf, math.inf, ()]  # cents, instances, counts
+
+    def search(position: int, remaining: dict[str, float], cents: int, instances: int, counts: tuple) -> None:
+        if all(amount <= 0 for amount in remaining.values()):
+            if (cents, instances) < (best[0], best[1]):
+                best[:] = [cents, instances, counts]
+            return
+        if position == len(scores) or instances >= max_instances:
+            return
+        rates = best_rates[position]
+        lower_bound = max(amount * rates[r] for r, amount in remaining.items() if amount > 0)
+        if cents + lower_bound * 100 > best[0] + 1e-6:
+            return
+
+        score = scores[position]
+        provides = [
+            (amount, score.resources[r]) for r, amount in remaining.items() if amount > 0 and score.resources[r]
+        ]
+        if provides:
+            # Most of this type first, then fewer, then none, leaving the rest to later types.
+            needed = max(math.ceil(amount / per_instance) for amount, per_instance in provides)
+            type_cents = score.item.instance_type.price_cents_per_hour
+            for count in range(min(needed, max_instances - instances), 0, -1):
+                left = {r: amount - score.resources[r] * count for r, amount in remaining.items()}
+                search(position + 1, left, cents + type_cents * count, instances + count, (*counts, (score, count)))
+        search(position + 1, remaining, cents, instances, counts)
+
+    search(0, dict(wanted), 0, 0, ())
+    if math.isinf(best[0]):
+        return None
+    return Combination(best[2], best[0] / 100)
+
+
+COMBINATION_COLUMNS: Columns = (
+    ("instance_type_name", str),
+    ("count", int),
+    ("price_cents_per_hour", int),
+    ("regions_with_capacity_available", str),
+)
+
+
+def _dollars(value: float) -> str:
+    return "-" if math.isinf(value) else f"{value:.3f}"
+
+
+@profiled("render")
+def render_ranked_types_table(scores: list[TypeScore], title: str) -> None:
+    if not scores:
+        print("No instance types found.")
+        return
+
+    table = Table(title=title, show_lines=False)
+    for column in ("Name", "GPU", "GPUs", "GPU mem (GiB)", "vCPUs", "Price ($/hr)", "$/GPU/hr", "$/GPU GiB/hr"):
+        table.add_column(column)
+    table.add_column("$/vCPU/hr")
+    table.add_column("Regions w/ Capacity")
+
+    for score in scores:
+        regions = ", ".join(r.name.value for r in score.item.regions_with_capacity_available) or "-"
+        table.add_row(
+            score.name,
+            score.item.instance_type.gpu_description,
+            str(score.item.instance_type.specs.gpus),
+            f"{score.resources['gpu-memory']:g}",
+            str(score.item.instance_type.specs.vcpus),
+            f"{score.price:.2f}",
+            _dollars(score.cost_per("gpus")),
+            _dollars(score.cost_per("gpu-memory")),
+            _dollars(score.cost_per("vcpus")),
+            regions,
+        )
+
+    print(table)
+
+
+@profiled("render")
+def render_combination_table(combination: Combination) -> None:
+    table = Table(title="Cheapest combination", show_lines=False)
+    for column in ("Name", "Count", "GPU", "Price ($/hr)", "Subtotal ($/hr)", "Regions w/ Capacity"):
+        table.add_column(column)
+
+    for score, count in combination.counts:
+        regions = ", ".join(r.name.value for r in score.item.regions_with_capacity_available) or "-"
+        table.add_row(
+            score.name,
+            str(count),
+            score.item.instance_type.gpu_description,
+            f"{score.price:.2f}",
+            f"{score.price * count:.2f}",
+            regions,
+        )
+
+    totals = ", ".join(f"{combination.total(resource):g} {resource}" for resource in RESOURCES)
+    table.caption = f"{combination.instances} instances, {totals}, ${combination.price:.2f}/hr"
+    print(table)
@@ -0,0 +1,247 @@
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from rich import print
+
+from lambda_ai_cloud_api_client.cli.ls import list_instances
+from lambda_ai_cloud_api_client.cli.ssh import ssh_command
+from lambda_ai_cloud_api_client.cli.stop import terminate_instances
+from lambda_ai_cloud_api_client.models import Instance, InstanceStatus
+from lambda_ai_cloud_api_client.types import Unset
+
+# The busiest GPU's utilisation in percent (empty without nvidia-smi) and the number of logged in sessions. The probe
+# itself runs without a terminal and doesn't count as a session.
+_PROBE = (
+    "echo gpu=$(nvidia-smi --query-gpu=utilization.gpu --format=csv,noheader,nounits 2>/dev/null | sort -n | tail -n 1)"
+    "; echo sessions=$(who | wc -l)"
+)
+_SSH_TIMEOUT_SECONDS = 30
+
+
+class IdleSample(NamedTuple):
+    gpu_utilization: float | None  # percent, None on instances without GPUs
+    sessions: int
+
+    def idle(self, threshold: float) -> bool:
+        return not self.sessions and (self.gpu_utilization is None or self.gpu_utilization <= threshold)
+
+
+class ReaperAction(NamedTuple):
+    instance: Instance
+    sample: IdleSample | None  # None when the instance couldn't be probed
+    idle_for: timedelta
+    action: str  # active | idle | warn | terminate | unreachable
+
+
+def parse_tag_filters(raw_tags: tuple[str, ...]) -> list[tuple[str, str]]:
+    tags = []
+    for raw in raw_tags:
+        key, sep, value = raw.partition("=")
+        if not sep or not key:
+            raise RuntimeError(f"Invalid tag '{raw}'. Use key=value format.")
+        tags.append((key, value))
+    return tags
+
+
+def parse_probe_output(output: str, gpus: int = 0) -> IdleSample:
+    values = dict(line.partition("=")[::2] for line in output.splitlines() if "=" in line)
+    gpu = values.get("gpu", "").strip()
+    if not gpu and gpus:
+        # nvidia-smi failed (driver hung, GPUs lost), that says nothing about whether the GPUs are busy.
+        raise ValueError(f"No GPU utilisation reading from an instance with {gpus} GPUs.")
+    return IdleSample(float(gpu) if gpu else None, int(values["sessions"]))
+
+
+def tagged_instances(instances: list[Instance], tags: list[tuple[str, str]]) -> list[Instance]:
+    """The active instances carrying every one of ``tags``."""
+    selected = []
+    for instance in instances:
+        if instance.status != InstanceStatus.ACTIVE or isinstance(instance.ip, Unset) or not instance.ip:
+            continue
+        instance_tags = set() if isinstance(instance.tags, Unset) else {(t.key, t.value) for t in instance.tags}
+        if all(tag in instance_tags for tag in tags):
+            selected.append(instance)
+    return selected
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _run_ssh(ip: str, command: tuple[str, ...], control_dir: str) -> str | None:
+    # One master connection per host (ControlMaster) that every later probe reuses, so a probe costs a round trip
+    # instead of a TCP and SSH handshake.
+    options = [
+        "BatchMode=yes",
+        "ConnectTimeout=10",
+        "ControlMaster=auto",
+        f"ControlPath={control_dir}/%C",
+        "ControlPersist=10m",
+    ]
+    try:
+        result = subprocess.run(
+            ssh_command(ip, command, options=options),
+            capture_output=True,
+            text=True,
+            timeout=_SSH_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _close_ssh_masters(ips: set[str], control_dir: str) -> None:
+    for ip in ips:
+        with suppress(OSError, subprocess.TimeoutExpired):
+            subprocess.run(
+                ["ssh", "-o", f"ControlPath={control_dir}/%C", "-O", "exit", f"ubuntu@{ip}"],
+                capture_output=True,
+                timeout=_SSH_TIMEOUT_SECONDS,
+            )
+
+
+def probe_instances(instances: list[Instance], control_dir: str, concurrency: int) -> dict[str, IdleSample | None]:
+    """Sample every instance over SSH in parallel, ``None`` for the ones that didn't answer."""
+
+    def probe(instance: Instance) -> IdleSample | None:
+        output = _run_ssh(instance.ip, ("sh", "-c", _PROBE), control_dir)
+        try:
+            return parse_probe_output(output, instance.instance_type.specs.gpus) if output is not None else None
+        except (KeyError, ValueError):
+            return None
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="lai-reaper") as executor:
+        return dict(zip((i.id for i in instances), executor.map(probe, instances), strict=True))
+
+
+def notify_instances(instances: list[Instance], message: str, control_dir: str, concurrency: int) -> None:
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="lai-reaper") as executor:
+        list(executor.map(lambda i: _run_ssh(i.ip, ("wall", message), control_dir), instances))
+
+
+class IdleTracker:
+    """How long every instance has been idle, over consecutive samples.
+
+    An instance is idle while no one is logged in and its busiest GPU is at or below ``threshold`` percent. It is
+    warned once when ``grace`` is left before ``idle_after`` and due for termination after ``idle_after``. Activity,
+    or a failed probe, starts the count over: an instance that can't be observed is never terminated.
+    """
+
+    def __init__(self, idle_after: timedelta, grace: timedelta, threshold: float) -> None:
+        self.idle_after = idle_after
+        self.grace = grace
+        self.threshold = threshold
+        self.idle_since: dict[str, datetime] = {}
+        self.warned: set[str] = set()
+
+    def update(self, instance: Instance, sample: IdleSample | None, now: datetime) -> ReaperAction:
+        if sample is None or not sample.idle(self.threshold):
+            self.idle_since.pop(instance.id, None)
+            self.warned.discard(instance.id)
+            return ReaperAction(instance, sample, timedelta(0), "unreachable" if sample is None else "active")
+
+        idle_for = now - self.idle_since.setdefault(instance.id, now)
+        if idle_for >= self.idle_after:
+            return ReaperAction(instance, sample, idle_for, "terminate")
+        if idle_for >= self.idle_after - self.grace and instance.id not in self.warned:
+            self.warned.add(instance.id)
+            return ReaperAction(instance, sample, idle_for, "warn")
+        return ReaperAction(instance, sample, idle_for, "idle")
+
+    def forget(self, instance_ids: list[str]) -> None:
+        for id in instance_ids:
+            self.idle_since.pop(id, None)
+            self.warned.discard(id)
+
+
+def _minutes(delta: timedelta) -> str:
+    return f"{delta.total_seconds() / 60:.0f}m"
+
+
+def print_reaper_action(action: ReaperAction) -> None:
+    if action.sample is None:
+        state = "unreachable"
+    else:
+        gpu = "-" if action.sample.gpu_utilization is None else f"{action.sample.gpu_utilization:g}%"
+        state = f"gpu {gpu}, {action.sample.sessions} sessions"
+        if action.action != "active":
+            state += f", idle {_minutes(action.idle_for)}"
+    print(f"{action.instance.name} ({action.instance.id}): {state} -> {action.action}")
+
+
+def reap_once(
+    tracker: IdleTracker,
+    tags: list[tuple[str, str]],
+    control_dir: str,
+    concurrency: int,
+    dry_run: bool,
+) -> list[ReaperAction]:
+    """List, probe and act on the tagged instances once. Every instance due is terminated in a single API call."""
+    instances = tagged_instances(list_instances(), tags)
+    if not instances:
+        print("No active instances with these tags.")
+        return []
+    samples = probe_instances(instances, control_dir, concurrency)
+    now = _now()
+    actions = [tracker.update(instance, samples[instance.id], now) for instance in instances]
+    for action in actions:
+        print_reaper_action(action)
+
+    warn = [a.instance for a in actions if a.action == "warn"]
+    if warn:
+        names = ", ".join(str(i.name) for i in warn)
+        if dry_run:
+            print(f"Would warn {len(warn)} idle instances: {names}.")
+        else:
+            left = _minutes(tracker.grace)
+            message = f"lai reaper: this instance is idle and will be terminated in {left} unless it is used."
+            notify_instances(warn, message, control_dir, concurrency)
+            print(f"Warned {len(warn)} idle instances: {names}.")
+
+    due = [a.instance.id for a in actions if a.action == "terminate"]
+    if due:
+        if dry_run:
+            print(f"Would terminate {len(due)} idle instances: {', '.join(due)}.")
+        else:
+            terminated = [i.id for i in terminate_instances(due)]
+            print(f"Terminated {len(terminated)} idle instances: {', '.join(terminated)}.")
+        tracker.forget(due)
+    return actions
+
+
+def reap_idle_instances(
+    tags: tuple[str, ...],
+    idle_minutes: float,
+    grace_minutes: float,
+    threshold: float,
+    interval_seconds: float,
+    samples: int | None,
+    concurrency: int,
+    dry_run: bool,
+) -> None:
+    tag_filters = parse_tag_filters(tags)
+    # A grace period longer than the idle time warns on the first idle sample.
+    tracker = IdleTracker(
+        timedelta(minutes=idle_minutes), timedelta(minutes=min(grace_minutes, idle_minutes)), threshold
+    )
+    taken = 0
+    ips: set[str] = set()
+    with tempfile.TemporaryDirectory(prefix="lai-reaper-") as control_dir:
+        try:
+            while True:
+                ips.update(
+                    action.instance.ip for action in reap_once(tracker, tag_filters, control_dir, concurrency, dry_run)
+                )
+                taken += 1
+                if samples is not None and taken >= samples:
+                    return
+                time.sleep(interval_seconds)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            _close_ssh_masters(ips, control_dir)
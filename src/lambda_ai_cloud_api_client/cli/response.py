@@ -1,7 +1,157 @@
+import csv
 import json
+import sys
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import Any
 
-from rich import print
+from rich.console import Console
 
+from lambda_ai_cloud_api_client.cli.profiling import profiled
 
+OUTPUT_FORMATS = ("table", "json", "ndjson", "csv", "tsv", "parquet", "arrow")
+
+# Flush to stdout in chunks of this size instead of once per encoder token.
+_WRITE_CHUNK_SIZE = 64 * 1024
+# Rows per record batch for parquet/arrow output.
+_BATCH_SIZE = 4096
+
+# Flat column layout of a command's rows: (dotted path into the JSON object, python type of the cell).
+Columns = tuple[tuple[str, type], ...]
+
+
+@profiled("render")
 def print_json(d: dict | list) -> None:
-    print(json.dumps(d, indent=2))
+    if sys.stdout.isatty():
+        # Interactive use, highlight it. JSON renderables are not scanned for console markup.
+        Console().print_json(data=d, indent=2)
+        return
+
+    sys.stdout.flush()
+    stream = sys.stdout.buffer
+    chunk: list[str] = []
+    size = 0
+    for part in json.JSONEncoder(indent=2).iterencode(d):
+        chunk.append(part)
+        size += len(part)
+        if size >= _WRITE_CHUNK_SIZE:
+            stream.write("".join(chunk).encode())
+            chunk, size = [], 0
+    chunk.append("\n")
+    stream.write("".join(chunk).encode())
+    stream.flush()
+
+
+@profiled("render")
+def print_raw_json(data: bytes) -> None:
+    # Already encoded JSON, e.g. an API response's data, written as it is unless it's for a terminal.
+    if sys.stdout.isatty():
+        print_json(json.loads(data))
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data)
+    sys.stdout.buffer.write(b"\n")
+    sys.stdout.buffer.flush()
+
+
+def print_ndjson(items: Iterable[dict]) -> None:
+    # One compact object per line, written straight to the binary stdout buffer so rich never sees it.
+    sys.stdout.flush()
+    stream = sys.stdout.buffer
+    encoder = json.JSONEncoder(separators=(",", ":"))
+    for item in items:
+        stream.write(encoder.encode(item).encode())
+        stream.write(b"\n")
+    stream.flush()
+
+
+def resolve_output_format(json_flag: bool, output: str | None) -> str:
+    if json_flag and output not in (None, "json"):
+        raise RuntimeError(f"--json conflicts with --output {output}.")
+    if json_flag:
+        return "json"
+    return output or "table"
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, list):
+        parts = []
+        for v in value:
+            if isinstance(v, dict) and "key" in v:
+                parts.append(f"{v['key']}={v.get('value', '')}")
+            elif isinstance(v, dict) and "name" in v:
+                parts.append(str(v["name"]))
+            elif isinstance(v, dict) and "id" in v:
+                parts.append(str(v["id"]))
+            else:
+                parts.append(str(v))
+        return ";".join(parts)
+    if isinstance(value, dict):
+        return json.dumps(value, separators=(",", ":"))
+    return value
+
+
+def flatten_rows(items: Iterable[dict], columns: Columns) -> Iterator[tuple]:
+    paths = [path.split(".") for path, _ in columns]
+    for item in items:
+        row = []
+        for keys in paths:
+            value: Any = item
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            row.append(_cell(value))
+        yield tuple(row)
+
+
+def print_delimited(items: Iterable[dict], columns: Columns, delimiter: str = ",") -> None:
+    writer = csv.writer(sys.stdout, delimiter=delimiter, lineterminator="\n")
+    writer.writerow([path for path, _ in columns])
+    writer.writerows(flatten_rows(items, columns))
+    sys.stdout.flush()
+
+
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError(
+            "pyarrow is required for parquet/arrow output, install lambda-ai-cloud-api-client[arrow]."
+        ) from e
+    return pyarrow
+
+
+def print_arrow(items: Iterable[dict], columns: Columns, file_format: str = "arrow") -> None:
+    if sys.stdout.isatty():
+        raise RuntimeError(f"Refusing to write binary {file_format} output to a terminal, redirect stdout to a file.")
+    pa = _import_pyarrow()
+
+    arrow_types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_(), str: pa.string()}
+    schema = pa.schema([(path, arrow_types[type_]) for path, type_ in columns])
+
+    sys.stdout.flush()
+    sink = pa.PythonFile(sys.stdout.buffer, mode="w")
+    parquet = file_format == "parquet"
+    writer = pa.parquet.ParquetWriter(sink, schema) if parquet else pa.ipc.new_stream(sink, schema)
+
+    rows = flatten_rows(items, columns)
+    with writer:
+        while batch := list(islice(rows, _BATCH_SIZE)):
+            cells = zip(*batch, strict=True)
+            arrays = [pa.array(column, type=type_) for column, type_ in zip(cells, schema.types, strict=True)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+    sys.stdout.buffer.flush()
+
+
+@profiled("render")
+def print_output(items: Iterable[dict], output: str, columns: Columns | None = None) -> None:
+    if output == "ndjson":
+        print_ndjson(items)
+        return
+    if output in ("csv", "tsv"):
+        print_delimited(items, columns, delimiter="," if output == "csv" else "\t")
+        return
+    if output in ("parquet", "arrow"):
+        print_arrow(items, columns, file_format=output)
+        return
+    print_json(list(items))
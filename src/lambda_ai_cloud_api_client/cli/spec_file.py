@@ -0,0 +1,30 @@
+import json
+from pathlib import Path
+from typing import Any
+
+
+def spec_error(path: Path, kind: str, reason: str) -> RuntimeError:
+    return RuntimeError(f"Invalid {kind} {path}: {reason}")
+
+
+def load_spec_document(path: Path, kind: str) -> Any:
+    """The YAML (needs the ``[yaml]`` extra) or, for ``.json`` files, JSON document at ``path``, a ``kind`` such as
+    ``fleet spec`` for the error messages."""
+    if not path.exists():
+        raise RuntimeError(f"{kind.capitalize()} not found: {path}")
+    text = path.read_text()
+    if path.suffix == ".json":
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise spec_error(path, kind, str(e)) from None
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError(
+            f"pyyaml is required for YAML {kind}s, install lambda-ai-cloud-api-client[yaml] or write it as JSON."
+        ) from None
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise spec_error(path, kind, str(e)) from None
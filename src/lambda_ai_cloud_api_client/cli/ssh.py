@@ -84,7 +84,12 @@ def wait_for_instance(
     return instance
 
 
-def ssh_command(ip: str, command: tuple[str, ...], env_assignments: list[str] | None = None) -> list[str]:
+def ssh_command(
+    ip: str,
+    command: tuple[str, ...],
+    env_assignments: list[str] | None = None,
+    options: list[str] | None = None,
+) -> list[str]:
     target = f"ubuntu@{ip}"
     ssh_args = [
         "ssh",
@@ -92,8 +97,10 @@ def ssh_command(ip: str, command: tuple[str, ...], env_assignments: list[str] |
         "StrictHostKeyChecking=accept-new",
         "-o",
         "UserKnownHostsFile=/dev/null",
-        target,
     ]
+    for option in options or ():
+        ssh_args.extend(("-o", option))
+    ssh_args.append(target)
     if command:
         parts: list[str] = []
         if env_assignments:
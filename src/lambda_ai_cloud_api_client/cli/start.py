@@ -6,7 +6,13 @@ from rich import print
 from lambda_ai_cloud_api_client.api.instances.launch_instance import sync_detailed as launch_instance
 from lambda_ai_cloud_api_client.cli.client import auth_client
 from lambda_ai_cloud_api_client.cli.response import print_json
-from lambda_ai_cloud_api_client.cli.types import filter_instance_types, list_instance_types, render_types_table
+from lambda_ai_cloud_api_client.cli.type_index import matching_regions
+from lambda_ai_cloud_api_client.cli.types import (
+    filter_instance_types,
+    list_instance_types,
+    render_types_table,
+    type_filter_conditions,
+)
 from lambda_ai_cloud_api_client.models import (
     FirewallRulesetEntry,
     ImageSpecificationFamily,
@@ -64,6 +70,8 @@ def _resolve_type_and_region(
     min_memory: int | None = None,
     min_storage: int | None = None,
     max_price: int | None = None,
+    where: str | None = None,
+    rank: str | None = None,
 ) -> tuple[InstanceType, Region]:
     instance_types = list_instance_types()
     items = filter_instance_types(
@@ -78,6 +86,8 @@ def _resolve_type_and_region(
         min_memory=min_memory,
         min_storage=min_storage,
         max_price=max_price,
+        where=where,
+        rank=rank,
     )
 
     if not items:
@@ -87,9 +97,10 @@ def _resolve_type_and_region(
         names = ", ".join([i.instance_type.name for i in items])
         raise RuntimeError(f"Multiple instance types match ({names}). Provide --instance-type or narrow filters.")
 
-    available_regions = items[0].regions_with_capacity_available
-    if region:
-        available_regions = [r for r in available_regions if r.name.value in region]
+    conditions = type_filter_conditions(region=region, where=where)
+    available_regions = matching_regions(items[0], conditions)
+    if not available_regions:
+        raise RuntimeError(f"{items[0].instance_type.name} has no capacity in a matching region.")
     return items[0].instance_type, available_regions[0]
 
 
@@ -121,6 +132,8 @@ def start_instance(
     min_memory: int | None,
     min_storage: int | None,
     max_price: float | None,
+    where: str | None,
+    rank: str | None,
     ssh_key: tuple[str, ...],
     dry_run: bool,
     name: str | None,
@@ -146,6 +159,8 @@ def start_instance(
         min_memory=min_memory,
         min_storage=min_storage,
         max_price=max_price,
+        where=where,
+        rank=rank,
     )
 
     image = _parse_image(image_id, image_family)
@@ -8,6 +8,14 @@ from lambda_ai_cloud_api_client.models import (
 )
 
 
+def terminate_instances(instance_ids: list[str]) -> list[Instance]:
+    """Terminate all of ``instance_ids`` in one API call."""
+    client = auth_client()
+    response = terminate_instance(client=client, body=InstanceTerminateRequest(instance_ids=instance_ids))
+    response.raise_for_status()
+    return response.parsed.data.terminated_instances
+
+
 def stop_instances(ids_or_name: tuple[str, ...]) -> list[Instance]:
     instance_ids = []
     for id_or_name in ids_or_name:
@@ -15,7 +23,4 @@ def stop_instances(ids_or_name: tuple[str, ...]) -> list[Instance]:
         instance = get_instance_by_name_or_id(instances, id_or_name)
         instance_ids.append(instance.id)
 
-    client = auth_client()
-    response = terminate_instance(client=client, body=InstanceTerminateRequest(instance_ids=instance_ids))
-    response.raise_for_status()
-    return response.parsed.data.terminated_instances
+    return terminate_instances(instance_ids)
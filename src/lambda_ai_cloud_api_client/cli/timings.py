@@ -0,0 +1,54 @@
+from collections.abc import Iterable
+from functools import cache
+
+from rich.console import Console
+from rich.table import Table
+
+from lambda_ai_cloud_api_client.cli.client import instrumentation
+from lambda_ai_cloud_api_client.instrumentation import Event, MetricsCollector
+
+
+@cache
+def timings_collector() -> MetricsCollector:
+    return MetricsCollector().attach(instrumentation())
+
+
+def _ms(seconds: float | None) -> str:
+    return "" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+def build_timings_table(calls: Iterable[Event]) -> Table:
+    table = Table(title="Timings", show_lines=False)
+    table.add_column("#", justify="right")
+    table.add_column("Operation")
+    table.add_column("Status")
+    table.add_column("Time (ms)", justify="right")
+    table.add_column("Decode (ms)", justify="right")
+    table.add_column("Bytes", justify="right")
+    table.add_column("Cache")
+
+    total = decode = 0.0
+    size = 0
+    for i, call in enumerate(calls, start=1):
+        status = type(call.error).__name__ if call.error is not None else str(call.status_code)
+        table.add_row(
+            str(i),
+            call.operation,
+            status,
+            _ms(call.duration),
+            _ms(call.decode_duration),
+            str(call.size or ""),
+            call.cache or "",
+        )
+        total += call.duration or 0
+        decode += call.decode_duration or 0
+        size += call.size or 0
+
+    table.add_section()
+    table.add_row("", "total", "", _ms(total), _ms(decode), str(size), "")
+    return table
+
+
+def print_timings(calls: Iterable[Event]) -> None:
+    # stderr, so --timings can be combined with --json/--output and pipes.
+    Console(stderr=True).print(build_timings_table(calls))
@@ -0,0 +1,234 @@
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from functools import cache
+from typing import NamedTuple
+
+from lambda_ai_cloud_api_client.models import InstanceTypesItem, Region
+
+NUMERIC_FIELDS: dict[str, Callable[[InstanceTypesItem], float]] = {
+    "gpus": lambda item: item.instance_type.specs.gpus,
+    "vcpus": lambda item: item.instance_type.specs.vcpus,
+    "memory": lambda item: item.instance_type.specs.memory_gib,
+    "storage": lambda item: item.instance_type.specs.storage_gib,
+    # Queried in $/hr, like --max-price.
+    "price": lambda item: item.instance_type.price_cents_per_hour / 100,
+}
+TEXT_FIELDS = ("name", "gpu", "region")
+FLAG_FIELDS = ("available",)
+
+_TOKEN = re.compile(r"\s*(?:(<=|>=|!=|==|=|<|>|~)|(\()|(\))|(,)|([^\s()<>=!~,]+))")
+_NUMERIC_OPS = ("=", "!=", "<", "<=", ">", ">=")
+_TEXT_OPS = ("=", "!=", "~")
+
+
+class Condition(NamedTuple):
+    field: str
+    op: str  # = | != | < | <= | > | >= | ~ (case-insensitive substring)
+    values: tuple  # the condition holds when it holds for any of them, `field in (a, b)` is `field = a or field = b`
+
+
+def _query_error(query: str, reason: str) -> RuntimeError:
+    return RuntimeError(f"Invalid instance type query {query!r}: {reason}")
+
+
+def _tokens(query: str) -> list[str]:
+    tokens, position = [], 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN.match(query, position)
+        if match is None or not match.group().strip():
+            raise _query_error(query, f"unexpected {query[position:].strip()!r}")
+        tokens.append(match.group().strip())
+        position = match.end()
+    return tokens
+
+
+def _value(query: str, field: str, raw: str) -> float | str:
+    if field not in NUMERIC_FIELDS:
+        return raw
+    try:
+        return float(raw.lstrip("$"))
+    except ValueError:
+        raise _query_error(query, f"{field} needs a number, got {raw!r}") from None
+
+
+def _clause(query: str, tokens: list[str]) -> Condition:
+    field = tokens[0].lower()
+    if field in FLAG_FIELDS:
+        if len(tokens) != 1:
+            raise _query_error(query, f"{field} takes no value")
+        return Condition(field, "=", (True,))
+    if field not in NUMERIC_FIELDS and field not in TEXT_FIELDS:
+        known = ", ".join((*TEXT_FIELDS, *NUMERIC_FIELDS, *FLAG_FIELDS))
+        raise _query_error(query, f"unknown field {tokens[0]!r}, use one of {known}")
+    if len(tokens) < 3:
+        raise _query_error(query, f"{field} needs an operator and a value")
+
+    op, rest = tokens[1].lower(), tokens[2:]
+    if op == "in":
+        if rest[0] != "(" or rest[-1] != ")" or len(rest) < 3:
+            raise _query_error(query, f"use {field} in (a, b, ...)")
+        raw_values = rest[1:-1][::2]
+        if any(separator != "," for separator in rest[2:-1:2]) or "," in raw_values:
+            raise _query_error(query, f"use {field} in (a, b, ...)")
+        op = "="
+    else:
+        if len(rest) != 1:
+            raise _query_error(query, f"expected a single value after {field} {op}")
+        raw_values = rest
+    op = "=" if op == "==" else op
+    if op not in (_NUMERIC_OPS if field in NUMERIC_FIELDS else _TEXT_OPS):
+        raise _query_error(query, f"{op} is not supported for {field}")
+    return Condition(field, op, tuple(_value(query, field, raw) for raw in raw_values))
+
+
+@cache
+def parse_type_query(query: str) -> tuple[Condition, ...]:
+    """Parse ``gpus>=8 and gpu~H100 and region in (us-east-1, us-west-1)`` into conditions that must all hold.
+
+    Numeric fields (gpus, vcpus, memory, storage, price in $/hr) take ``= != < <= > >=``, text fields (name, gpu,
+    region) take ``= != ~`` with ``~`` a case-insensitive substring match, both take ``in (a, b)``. ``gpu = H100``
+    matches the GPU model, ``region`` the regions with capacity and the bare ``available`` types with any capacity.
+    """
+    tokens = _tokens(query)
+    clauses: list[list[str]] = [[]]
+    for token in tokens:
+        if token.lower() == "and":
+            clauses.append([])
+        else:
+            clauses[-1].append(token)
+    if any(not clause for clause in clauses):
+        raise _query_error(query, "empty condition")
+    return tuple(_clause(query, clause) for clause in clauses)
+
+
+@cache
+def gpu_model(gpu_description: str) -> str:
+    """``H100`` for ``H100 (80 GB SXM5)``."""
+    return gpu_description.split(" ", 1)[0].lower()
+
+
+class InstanceTypeIndex:
+    """Lookup tables over a list of instance types, so that a query costs about its number of matches.
+
+    Every field gets a table the first time a query uses it: text fields map each distinct value to the types that
+    have it, numeric fields are sorted for binary search. ``~`` and ``!=`` only look at the distinct values (a few
+    dozen GPU models or regions), never at every type.
+    """
+
+    def __init__(self, items: Iterable[InstanceTypesItem]) -> None:
+        self.items = list(items)
+        self._text_tables: dict[str, dict[str, list[int]]] = {}
+        self._numeric_tables: dict[str, tuple[list[float], list[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _text_table(self, field: str) -> dict[str, list[int]]:
+        table = self._text_tables.get(field)
+        if table is None:
+            table = self._text_tables[field] = defaultdict(list)
+            if field == "region":
+                for position, item in enumerate(self.items):
+                    for region in item.regions_with_capacity_available:
+                        table[region.name.value].append(position)
+            else:
+                attribute = "name" if field == "name" else "gpu_description"
+                for position, item in enumerate(self.items):
+                    table[getattr(item.instance_type, attribute).lower()].append(position)
+        return table
+
+    def _numeric_table(self, field: str) -> tuple[list[float], list[int]]:
+        table = self._numeric_tables.get(field)
+        if table is None:
+            values = list(map(NUMERIC_FIELDS[field], self.items))
+            positions = sorted(range(len(values)), key=values.__getitem__)
+            table = self._numeric_tables[field] = ([values[position] for position in positions], positions)
+        return table
+
+    def _range(self, field: str, op: str, value: float) -> set[int]:
+        values, positions = self._numeric_table(field)
+        if op == "=":
+            return set(positions[bisect_left(values, value) : bisect_right(values, value)])
+        if op == "<":
+            return set(positions[: bisect_left(values, value)])
+        if op == "<=":
+            return set(positions[: bisect_right(values, value)])
+        if op == ">":
+            return set(positions[bisect_right(values, value) :])
+        return set(positions[bisect_left(values, value) :])
+
+    def _text(self, field: str, op: str, values: tuple) -> set[int]:
+        wanted = {value.lower() for value in values}
+        table = self._text_table(field)
+        if op == "~":
+            keys = [key for key in table if any(value in key for value in wanted)]
+        elif field == "gpu":
+            # = and != compare the GPU model, H100 for "H100 (80 GB SXM5)".
+            keys = [key for key in table if (gpu_model(key) in wanted) == (op == "=")]
+        elif op == "=":
+            keys = [key for key in wanted if key in table]
+        else:
+            # Types with capacity in some other region, named something else.
+            keys = [key for key in table if key not in wanted]
+        return set().union(*(table[key] for key in keys))
+
+    def _lookup(self, condition: Condition) -> set[int]:
+        field, op, values = condition
+        if field == "available":
+            return set().union(*self._text_table("region").values())
+        if field in NUMERIC_FIELDS:
+            if op == "!=":
+                matches = set(range(len(self.items)))
+                for value in values:
+                    matches -= self._range(field, "=", value)
+                return matches
+            return set().union(*(self._range(field, op, value) for value in values))
+        return self._text(field, op, values)
+
+    def select(self, conditions: Iterable[Condition]) -> list[InstanceTypesItem]:
+        """The types matching every condition, in their original order."""
+        positions: set[int] | None = None
+        for condition in conditions:
+            matches = self._lookup(condition)
+            positions = matches if positions is None else positions & matches
+            if not positions:
+                return []
+        if positions is None:
+            return list(self.items)
+        return [self.items[position] for position in sorted(positions)]
+
+
+def matching_regions(item: InstanceTypesItem, conditions: Iterable[Condition]) -> list[Region]:
+    """The regions with capacity of ``item`` that satisfy the region conditions."""
+    regions = item.regions_with_capacity_available
+    for field, op, values in conditions:
+        if field != "region":
+            continue
+        wanted = [value.lower() for value in values]
+        if op == "=":
+            regions = [r for r in regions if r.name.value in wanted]
+        elif op == "!=":
+            regions = [r for r in regions if r.name.value not in wanted]
+        else:
+            regions = [r for r in regions if any(value in r.name.value for value in wanted)]
+    return regions
+
+
+_last_index: tuple[object, InstanceTypeIndex] | None = None
+
+
+def index_instance_types(instance_types: list[InstanceTypesItem]) -> InstanceTypeIndex:
+    """The index of ``instance_types``, reused while the same list object is queried again.
+
+    :func:`~lambda_ai_cloud_api_client.cli.types.list_instance_types` returns the same list for an unchanged response.
+    """
+    global _last_index
+    if _last_index is not None and _last_index[0] is instance_types:
+        return _last_index[1]
+    index = InstanceTypeIndex(instance_types)
+    # Holding on to the list keeps its id from being reused by another one.
+    _last_index = (instance_types, index)
+    return index
@@ -1,22 +1,93 @@
 import logging
+from collections.abc import Iterator
 
 from rich import print
 from rich.table import Table
 
+from lambda_ai_cloud_api_client.api.instances.list_instance_types import _get_kwargs as _list_instance_types_kwargs
 from lambda_ai_cloud_api_client.api.instances.list_instance_types import sync_detailed as _list_instance_types
-from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.cli.client import auth_client, request_raw_items
+from lambda_ai_cloud_api_client.cli.profiling import profiled
+from lambda_ai_cloud_api_client.cli.ranking import rank_instance_types
+from lambda_ai_cloud_api_client.cli.response import Columns
+from lambda_ai_cloud_api_client.cli.type_index import Condition, index_instance_types, parse_type_query
 from lambda_ai_cloud_api_client.models import InstanceTypesItem
 
 logger = logging.getLogger(__name__)
 
-
+INSTANCE_TYPE_COLUMNS: Columns = (
+    ("instance_type.name", str),
+    ("instance_type.description", str),
+    ("instance_type.gpu_description", str),
+    ("instance_type.price_cents_per_hour", int),
+    ("instance_type.specs.vcpus", int),
+    ("instance_type.specs.memory_gib", int),
+    ("instance_type.specs.storage_gib", int),
+    ("instance_type.specs.gpus", int),
+    ("regions_with_capacity_available", str),
+)
+# --rank/--pareto rows, TypeScore.to_dict.
+RANKED_INSTANCE_TYPE_COLUMNS: Columns = (
+    *INSTANCE_TYPE_COLUMNS,
+    ("gpu_memory_gib", float),
+    ("price_per_gpu", float),
+    ("price_per_gpu_memory_gib", float),
+    ("price_per_vcpu", float),
+)
+
+
+# The last response body and the instance types parsed from it. Handing out the same list while the body doesn't change
+# (e.g. a daemon answering `lai types --where ...` over and over) lets index_instance_types reuse its index.
+_last_instance_types: tuple[bytes, list[InstanceTypesItem]] | None = None
+
+
+@profiled("parse")
 def list_instance_types() -> list[InstanceTypesItem]:
+    global _last_instance_types
     client = auth_client()
     response = _list_instance_types(client=client)
     response.raise_for_status()
-    return response.parsed.data.additional_properties.values()
-
-
+    if _last_instance_types is None or _last_instance_types[0] != response.content:
+        _last_instance_types = (response.content, list(response.parsed.data.additional_properties.values()))
+    return _last_instance_types[1]
+
+
+@profiled("parse")
+def list_instance_types_raw() -> Iterator[dict]:
+    return request_raw_items(_list_instance_types_kwargs())
+
+
+def type_filter_conditions(
+    instance_type: str | None = None,
+    available: bool = False,
+    region: tuple[str, ...] = (),
+    gpu: tuple[str, ...] = (),
+    min_gpus: int | None = None,
+    min_vcpus: int | None = None,
+    min_memory: int | None = None,
+    min_storage: int | None = None,
+    max_price: float | None = None,
+    where: str | None = None,
+) -> tuple[Condition, ...]:
+    """The filter options and the ``--where`` query as one list of conditions, see :func:`parse_type_query`."""
+    conditions = list(parse_type_query(where)) if where else []
+    if instance_type:
+        conditions.append(Condition("name", "=", (instance_type,)))
+    if available:
+        conditions.append(Condition("available", "=", (True,)))
+    if region:
+        conditions.append(Condition("region", "=", region))
+    if gpu:
+        conditions.append(Condition("gpu", "~", gpu))
+    for field, minimum in (("gpus", min_gpus), ("vcpus", min_vcpus), ("memory", min_memory), ("storage", min_storage)):
+        if minimum is not None:
+            conditions.append(Condition(field, ">=", (minimum,)))
+    if max_price is not None:
+        conditions.append(Condition("price", "<=", (max_price,)))
+    return tuple(conditions)
+
+
+@profiled("filter")
 def filter_instance_types(
     instance_types: list[InstanceTypesItem],
     instance_type: str | None,
@@ -29,65 +100,30 @@ def filter_instance_types(
     min_memory: int | None,
     min_storage: int | None,
     max_price: int | None,
+    where: str | None = None,
+    rank: str | None = None,
 ) -> list[InstanceTypesItem]:
-    filtered_instance_type_items: list[InstanceTypesItem] = []
-
-    for item in instance_types:
-        name = item.instance_type.name
-        price_dollars_per_hour = item.instance_type.price_cents_per_hour / 100
-
-        if instance_type and item.instance_type.name != instance_type:
-            logger.debug(f"[filter] {name} skipped: wanted instance_type '{instance_type}'.")
-            continue
-
-        if available and not item.regions_with_capacity_available:
-            # No regions with capacity = not available
-            logger.debug(f"[filter] {name} skipped: no regions with capacity and --available requested.")
-            continue
-
-        if region and not any(r in item.regions_with_capacity_available for r in region):
-            regions = ", ".join([r.name for r in item.regions_with_capacity_available]) or "none"
-            wanted = ", ".join(region)
-            logger.debug(f"[filter] {name} skipped: regions with capacity [{regions}] do not include [{wanted}].")
-            continue
-
-        if gpu and not any(g in item.instance_type.gpu_description for g in gpu):
-            continue
-
-        if min_gpus is not None and item.instance_type.specs.gpus < min_gpus:
-            logger.debug(f"[filter] {name} skipped: gpus {item.instance_type.specs.gpus} < min_gpus {min_gpus}.")
-            continue
-
-        if min_vcpus is not None and item.instance_type.specs.vcpus < min_vcpus:
-            logger.debug(f"[filter] {name} skipped: vcpus {item.instance_type.specs.vcpus} < min_vcpus {min_vcpus}.")
-            continue
-
-        if min_memory is not None and item.instance_type.specs.memory_gib < min_memory:
-            logger.debug(
-                f"[filter] {name} skipped: memory {item.instance_type.specs.memory_gib} < min_memory {min_memory}."
-            )
-            continue
-
-        if min_storage is not None and item.instance_type.specs.storage_gib < min_storage:
-            logger.debug(
-                f"[filter] {name} skipped: storage {item.instance_type.specs.storage_gib} < min_storage {min_storage}."
-            )
-            continue
-
-        if max_price is not None and item.instance_type.price_cents_per_hour > max_price * 100:
-            logger.debug(f"[filter] {name} skipped: price ${price_dollars_per_hour}/hr > max_price ${max_price}/hr.")
-            continue
-
-        logger.debug(f"[filter] {name} kept (price ${price_dollars_per_hour}/hr).")
-        filtered_instance_type_items.append(item)
+    conditions = type_filter_conditions(
+        instance_type, available, region, gpu, min_gpus, min_vcpus, min_memory, min_storage, max_price, where
+    )
+    index = index_instance_types(instance_types)
+    filtered_instance_type_items = index.select(conditions)
+    logger.debug(
+        "[filter] %d of %d instance types match %s.", len(filtered_instance_type_items), len(index), conditions
+    )
+
+    if rank:
+        filtered_instance_type_items = [score.item for score in rank_instance_types(filtered_instance_type_items, rank)]
+        if cheapest and filtered_instance_type_items:
+            return filtered_instance_type_items[:1]
 
     if cheapest and filtered_instance_type_items:
-        sorted_items = sorted(filtered_instance_type_items, key=lambda x: x.instance_type.price_cents_per_hour)
-        return [sorted_items[0]]
+        return [min(filtered_instance_type_items, key=lambda x: x.instance_type.price_cents_per_hour)]
 
     return filtered_instance_type_items
 
 
+@profiled("render")
 def render_types_table(instance_types: list[InstanceTypesItem], title: str = "Instance Types") -> None:
     if not instance_types:
         print("No instance types found.")
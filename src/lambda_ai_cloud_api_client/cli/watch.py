@@ -0,0 +1,141 @@
+import asyncio
+import json
+from contextlib import suppress
+from datetime import datetime, timezone
+from typing import NamedTuple, TextIO
+
+import httpx
+from rich.console import Console
+from rich.live import Live
+from rich.text import Text
+
+from lambda_ai_cloud_api_client.cli.ls import alist_instances, build_instances_table, filter_instances, instance_row
+from lambda_ai_cloud_api_client.errors import HttpError
+from lambda_ai_cloud_api_client.models import Instance
+from lambda_ai_cloud_api_client.types import Unset
+
+
+class InstanceEvent(NamedTuple):
+    kind: str  # launched | status | ip | terminated
+    instance_id: str
+    name: str
+    detail: str
+
+
+def _ip(instance: Instance) -> str:
+    return "" if isinstance(instance.ip, Unset) else instance.ip
+
+
+def _signature(instance: Instance) -> tuple:
+    # The parts of an instance that can change while it lives, everything else in its row is fixed at launch.
+    return instance.status, _ip(instance), instance.name
+
+
+def diff_instances(previous: dict[str, Instance], current: dict[str, Instance]) -> list[InstanceEvent]:
+    events: list[InstanceEvent] = []
+    for id, instance in current.items():
+        before = previous.get(id)
+        if before is None:
+            events.append(InstanceEvent("launched", id, str(instance.name), str(instance.status)))
+            continue
+        if before.status != instance.status:
+            events.append(InstanceEvent("status", id, str(instance.name), f"{before.status} -> {instance.status}"))
+        if _ip(instance) and not _ip(before):
+            events.append(InstanceEvent("ip", id, str(instance.name), _ip(instance)))
+
+    for id, instance in previous.items():
+        if id not in current:
+            events.append(InstanceEvent("terminated", id, str(instance.name), str(instance.status)))
+
+    return events
+
+
+def _log_events(events: list[InstanceEvent], events_log: TextIO) -> None:
+    now = datetime.now(timezone.utc).isoformat()
+    for event in events:
+        events_log.write(json.dumps({"time": now, **event._asdict()}) + "\n")
+    events_log.flush()
+
+
+def _poll_error(error: Exception, interval_seconds: float) -> str:
+    reason = f"HTTP {error.status_code}" if isinstance(error, HttpError) else str(error) or type(error).__name__
+    return (
+        f"{datetime.now().strftime('%H:%M:%S')} listing instances failed ({reason}), retrying in {interval_seconds:g}s"
+    )
+
+
+async def _watch(
+    region: tuple[str, ...],
+    status: tuple[str, ...],
+    interval_seconds: float,
+    events_log: TextIO | None,
+    ticks: int | None,
+) -> None:
+    previous: dict[str, Instance] | None = None
+    signatures: dict[str, tuple] = {}
+    # The table's cells per instance, updated in place so that a change only touches its own row.
+    cells: dict[str, list[Text]] = {}
+    table = build_instances_table([])
+    # Events logged to stdout would interleave with the table, draw it on stderr then.
+    console = Console(stderr=True) if getattr(events_log, "name", None) == "<stdout>" else None
+
+    with Live(table, console=console, auto_refresh=False) as live:
+        tick = 0
+        while True:
+            try:
+                instances = filter_instances(await alist_instances(), region, status)
+            except (httpx.HTTPError, HttpError) as e:
+                # Keep the last snapshot on screen and poll again on the next tick.
+                table.caption = Text(_poll_error(e, interval_seconds), style="red")
+                live.refresh()
+            else:
+                current = {i.id: i for i in instances}
+
+                if previous is not None and events_log is not None:
+                    _log_events(diff_instances(previous, current), events_log)
+
+                changed = previous is None or table.caption is not None
+                table.caption = None
+                if removed := cells.keys() - current.keys():
+                    for id in removed:
+                        del cells[id]
+                        del signatures[id]
+                    # Rich tables can't drop a row, build a new one from the remaining cells.
+                    table = build_instances_table(cells.values())
+                    live.update(table)
+                    changed = True
+                for id, instance in current.items():
+                    signature = _signature(instance)
+                    if signatures.get(id) == signature:
+                        continue
+                    signatures[id] = signature
+                    row = [str(cell) for cell in instance_row(instance)]
+                    if id in cells:
+                        for text, cell in zip(cells[id], row, strict=True):
+                            if text.plain != cell:
+                                text.plain = cell
+                    else:
+                        cells[id] = [Text(cell) for cell in row]
+                        table.add_row(*cells[id])
+                    changed = True
+
+                if changed:
+                    live.refresh()
+
+                previous = current
+
+            tick += 1
+            if ticks is not None and tick >= ticks:
+                return
+            await asyncio.sleep(interval_seconds)
+
+
+def watch_instances(
+    region: tuple[str, ...],
+    status: tuple[str, ...],
+    interval_seconds: float,
+    events_log: TextIO | None = None,
+    ticks: int | None = None,
+) -> None:
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_watch(region, status, interval_seconds, events_log, ticks))
@@ -1,9 +1,45 @@
 import ssl
-from typing import Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 import httpx
 from attrs import define, evolve, field
 
+if TYPE_CHECKING:
+    from .instrumentation import Instrumentation
+
+# Same values httpx uses when no limits are given.
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0)
+
+
+# httpx.Client/AsyncClient arguments that also configure the transport they build by default, plus the
+# transport-only "retries".
+_TRANSPORT_ARGS = ("verify", "cert", "trust_env", "http1", "http2", "limits", "retries")
+
+
+def _httpx_client_args(
+    args: dict[str, Any],
+    httpx_args: dict[str, Any],
+    wrappers: tuple[Callable[[Any], Any], ...],
+    default_transport: Callable[..., Any],
+) -> dict[str, Any]:
+    """The client's ``args`` updated with ``httpx_args``, with the transport wrapped by each of ``wrappers``.
+
+    Without a ``transport`` in ``httpx_args`` the default one is built from the same merged arguments, the way httpx
+    would have built it.
+    """
+    args = {**args, **httpx_args}
+    if not wrappers and "retries" not in args:
+        return args
+    transport = args.pop("transport", None)
+    transport_args = {key: args[key] for key in _TRANSPORT_ARGS if key in args}
+    args.pop("retries", None)
+    if transport is None:
+        transport = default_transport(**transport_args)
+    for wrap in wrappers:
+        transport = wrap(transport)
+    return {**args, "transport": transport}
+
 
 @define
 class Client:
@@ -25,6 +61,19 @@ class Client:
 
         ``follow_redirects``: Whether or not to follow redirects. Default value is False.
 
+        ``http2``: Whether or not to negotiate HTTP/2, requires the ``h2`` package. Concurrent requests are then
+        multiplexed over a single connection. Default value is False.
+
+        ``limits``: The ``httpx.Limits`` for the connection pool (max connections, max keep-alive connections and
+        keep-alive expiry). Defaults to the httpx defaults.
+
+        ``transport_wrappers``: Callables that take an httpx transport and return a transport wrapping it, see
+        ``lambda_ai_cloud_api_client.transport``. They are applied in order, the first one wraps the network transport.
+        The same callables build the sync and the async stack.
+
+        ``instrumentation``: A ``lambda_ai_cloud_api_client.instrumentation.Instrumentation`` that receives an event for
+        every request (start/end, cache hit/miss, hedged retry, JSON decode time). It wraps all ``transport_wrappers``.
+
         ``httpx_args``: A dictionary of additional arguments to be passed to the ``httpx.Client`` and ``httpx.AsyncClient`` constructor.
 
 
@@ -41,10 +90,19 @@ class Client:
     _timeout: httpx.Timeout | None = field(default=None, kw_only=True, alias="timeout")
     _verify_ssl: str | bool | ssl.SSLContext = field(default=True, kw_only=True, alias="verify_ssl")
     _follow_redirects: bool = field(default=False, kw_only=True, alias="follow_redirects")
+    _http2: bool = field(default=False, kw_only=True, alias="http2")
+    _limits: httpx.Limits = field(default=DEFAULT_LIMITS, kw_only=True, alias="limits")
+    _transport_wrappers: tuple[Callable[[Any], Any], ...] = field(default=(), kw_only=True, alias="transport_wrappers")
+    _instrumentation: "Instrumentation | None" = field(default=None, kw_only=True, alias="instrumentation")
     _httpx_args: dict[str, Any] = field(factory=dict, kw_only=True, alias="httpx_args")
     _client: httpx.Client | None = field(default=None, init=False)
     _async_client: httpx.AsyncClient | None = field(default=None, init=False)
 
+    def _all_transport_wrappers(self) -> tuple[Callable[[Any], Any], ...]:
+        if self._instrumentation is None:
+            return self._transport_wrappers
+        return (*self._transport_wrappers, self._instrumentation.wrap)
+
     def with_headers(self, headers: dict[str, str]) -> "Client":
         """Get a new client matching this one with additional headers"""
         if self._client is not None:
@@ -81,13 +139,21 @@ class Client:
         """Get the underlying httpx.Client, constructing a new one if not previously set"""
         if self._client is None:
             self._client = httpx.Client(
-                base_url=self._base_url,
-                cookies=self._cookies,
-                headers=self._headers,
-                timeout=self._timeout,
-                verify=self._verify_ssl,
-                follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_client_args(
+                    {
+                        "base_url": self._base_url,
+                        "cookies": self._cookies,
+                        "headers": self._headers,
+                        "timeout": self._timeout,
+                        "verify": self._verify_ssl,
+                        "follow_redirects": self._follow_redirects,
+                        "http2": self._http2,
+                        "limits": self._limits,
+                    },
+                    self._httpx_args,
+                    self._all_transport_wrappers(),
+                    httpx.HTTPTransport,
+                )
             )
         return self._client
 
@@ -112,13 +178,21 @@ class Client:
         """Get the underlying httpx.AsyncClient, constructing a new one if not previously set"""
         if self._async_client is None:
             self._async_client = httpx.AsyncClient(
-                base_url=self._base_url,
-                cookies=self._cookies,
-                headers=self._headers,
-                timeout=self._timeout,
-                verify=self._verify_ssl,
-                follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_client_args(
+                    {
+                        "base_url": self._base_url,
+                        "cookies": self._cookies,
+                        "headers": self._headers,
+                        "timeout": self._timeout,
+                        "verify": self._verify_ssl,
+                        "follow_redirects": self._follow_redirects,
+                        "http2": self._http2,
+                        "limits": self._limits,
+                    },
+                    self._httpx_args,
+                    self._all_transport_wrappers(),
+                    httpx.AsyncHTTPTransport,
+                )
             )
         return self._async_client
 
@@ -152,6 +226,19 @@ class AuthenticatedClient:
 
         ``follow_redirects``: Whether or not to follow redirects. Default value is False.
 
+        ``http2``: Whether or not to negotiate HTTP/2, requires the ``h2`` package. Concurrent requests are then
+        multiplexed over a single connection. Default value is False.
+
+        ``limits``: The ``httpx.Limits`` for the connection pool (max connections, max keep-alive connections and
+        keep-alive expiry). Defaults to the httpx defaults.
+
+        ``transport_wrappers``: Callables that take an httpx transport and return a transport wrapping it, see
+        ``lambda_ai_cloud_api_client.transport``. They are applied in order, the first one wraps the network transport.
+        The same callables build the sync and the async stack.
+
+        ``instrumentation``: A ``lambda_ai_cloud_api_client.instrumentation.Instrumentation`` that receives an event for
+        every request (start/end, cache hit/miss, hedged retry, JSON decode time). It wraps all ``transport_wrappers``.
+
         ``httpx_args``: A dictionary of additional arguments to be passed to the ``httpx.Client`` and ``httpx.AsyncClient`` constructor.
 
 
@@ -171,6 +258,10 @@ class AuthenticatedClient:
     _timeout: httpx.Timeout | None = field(default=None, kw_only=True, alias="timeout")
     _verify_ssl: str | bool | ssl.SSLContext = field(default=True, kw_only=True, alias="verify_ssl")
     _follow_redirects: bool = field(default=False, kw_only=True, alias="follow_redirects")
+    _http2: bool = field(default=False, kw_only=True, alias="http2")
+    _limits: httpx.Limits = field(default=DEFAULT_LIMITS, kw_only=True, alias="limits")
+    _transport_wrappers: tuple[Callable[[Any], Any], ...] = field(default=(), kw_only=True, alias="transport_wrappers")
+    _instrumentation: "Instrumentation | None" = field(default=None, kw_only=True, alias="instrumentation")
     _httpx_args: dict[str, Any] = field(factory=dict, kw_only=True, alias="httpx_args")
     _client: httpx.Client | None = field(default=None, init=False)
     _async_client: httpx.AsyncClient | None = field(default=None, init=False)
@@ -179,6 +270,11 @@ class AuthenticatedClient:
     prefix: str = "Bearer"
     auth_header_name: str = "Authorization"
 
+    def _all_transport_wrappers(self) -> tuple[Callable[[Any], Any], ...]:
+        if self._instrumentation is None:
+            return self._transport_wrappers
+        return (*self._transport_wrappers, self._instrumentation.wrap)
+
     def with_headers(self, headers: dict[str, str]) -> "AuthenticatedClient":
         """Get a new client matching this one with additional headers"""
         if self._client is not None:
@@ -216,13 +312,21 @@ class AuthenticatedClient:
         if self._client is None:
             self._headers[self.auth_header_name] = f"{self.prefix} {self.token}" if self.prefix else self.token
             self._client = httpx.Client(
-                base_url=self._base_url,
-                cookies=self._cookies,
-                headers=self._headers,
-                timeout=self._timeout,
-                verify=self._verify_ssl,
-                follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_client_args(
+                    {
+                        "base_url": self._base_url,
+                        "cookies": self._cookies,
+                        "headers": self._headers,
+                        "timeout": self._timeout,
+                        "verify": self._verify_ssl,
+                        "follow_redirects": self._follow_redirects,
+                        "http2": self._http2,
+                        "limits": self._limits,
+                    },
+                    self._httpx_args,
+                    self._all_transport_wrappers(),
+                    httpx.HTTPTransport,
+                )
             )
         return self._client
 
@@ -248,13 +352,21 @@ class AuthenticatedClient:
         if self._async_client is None:
             self._headers[self.auth_header_name] = f"{self.prefix} {self.token}" if self.prefix else self.token
             self._async_client = httpx.AsyncClient(
-                base_url=self._base_url,
-                cookies=self._cookies,
-                headers=self._headers,
-                timeout=self._timeout,
-                verify=self._verify_ssl,
-                follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **_httpx_client_args(
+                    {
+                        "base_url": self._base_url,
+                        "cookies": self._cookies,
+                        "headers": self._headers,
+                        "timeout": self._timeout,
+                        "verify": self._verify_ssl,
+                        "follow_redirects": self._follow_redirects,
+                        "http2": self._http2,
+                        "limits": self._limits,
+                    },
+                    self._httpx_args,
+                    self._all_transport_wrappers(),
+                    httpx.AsyncHTTPTransport,
+                )
             )
         return self._async_client
 
@@ -0,0 +1,280 @@
+"""Running cost of the fleet, accumulated from periodic snapshots of the instance list.
+
+Every :meth:`CostStore.sample` charges each listed instance for the time since the previous sample at its type's
+hourly price, so the totals are as close to the bill as the sampling interval is short. Launch and termination times
+from the audit log, when given, fill in the part of an instance's life before its first and after its last sample::
+
+    with CostStore(default_cost_db_path()) as store:
+        store.sample(instances)
+        for row in store.report(by="tag:team"):
+            print(row.key, row.cost_cents / 100)
+        for breach in store.check_budgets([Budget("team", "research", 50_000)]):
+            ...
+
+An instance tagged ``budget=<dollars>`` is capped at that lifetime cost on its own.
+"""
+
+import datetime
+import json
+import os
+import sqlite3
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from .models import Instance, InstanceStatus
+from .types import Unset
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instance_costs (
+    instance_id TEXT PRIMARY KEY,
+    name TEXT,
+    instance_type TEXT NOT NULL,
+    region TEXT NOT NULL,
+    price_cents_per_hour INTEGER NOT NULL,
+    tags TEXT NOT NULL,
+    launched_by TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    running INTEGER NOT NULL,
+    cost_cents REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS instance_costs_running ON instance_costs (running);
+CREATE TABLE IF NOT EXISTS cost_samples (
+    sampled_at TEXT PRIMARY KEY,
+    instances INTEGER NOT NULL,
+    cents_per_hour INTEGER NOT NULL
+);
+"""
+
+# Instances in these states are no longer billed.
+_UNBILLED_STATUSES = (InstanceStatus.TERMINATED, InstanceStatus.PREEMPTED)
+# The tag an instance carries its own cap in, in dollars.
+BUDGET_TAG = "budget"
+REPORT_GROUPS = ("instance", "type", "region", "user")
+
+
+def default_cost_db_path() -> Path:
+    path = os.getenv("LAMBDA_CLOUD_COST_DB")
+    if path:
+        return Path(path)
+    data_home = os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share"
+    return Path(data_home) / "lai" / "cost.sqlite"
+
+
+def _parse_time(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _time(value: datetime.datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _hours(start: str, end: datetime.datetime) -> float:
+    return max((end - _parse_time(start)).total_seconds(), 0.0) / 3600
+
+
+def _tags(instance: Instance) -> str:
+    tags = {} if isinstance(instance.tags, Unset) else {tag.key: tag.value for tag in instance.tags}
+    return json.dumps(tags, sort_keys=True, separators=(",", ":"))
+
+
+class Launch(NamedTuple):
+    time: datetime.datetime
+    actor_lrn: str | None
+
+
+class Sample(NamedTuple):
+    sampled_at: datetime.datetime
+    instances: int  # billed instances in the snapshot
+    cents_per_hour: int  # what they cost together
+    cost_cents: float  # everything accumulated so far
+
+
+class CostRow(NamedTuple):
+    key: str
+    instances: int
+    running: int
+    cents_per_hour: int  # of the running instances
+    cost_cents: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**self._asdict(), "cost_cents": round(self.cost_cents, 2)}
+
+
+class Budget(NamedTuple):
+    """A cap on the lifetime cost of all instances tagged ``key=value``."""
+
+    key: str
+    value: str
+    cap_cents: float
+
+
+class BudgetBreach(NamedTuple):
+    budget: str  # team=research, or budget=25 on <instance>
+    spent_cents: float
+    cap_cents: float
+    instance_ids: tuple[str, ...]  # the running instances that count against it
+
+
+class CostStore:
+    """A local SQLite record of what every instance has cost so far, see the module docstring.
+
+    Keep one database per account and sample it from one place at a time.
+    """
+
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "CostStore":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM instance_costs").fetchone()[0]
+
+    def last_sample(self) -> datetime.datetime | None:
+        row = self._db.execute("SELECT max(sampled_at) FROM cost_samples").fetchone()
+        return _parse_time(row[0]) if row[0] else None
+
+    def sample(
+        self,
+        instances: Iterable[Instance],
+        now: datetime.datetime | None = None,
+        launches: Mapping[str, Launch] | None = None,
+        terminations: Mapping[str, datetime.datetime] | None = None,
+    ) -> Sample:
+        """Charge the billed ``instances`` for the time since they were last seen and close the ones that are gone.
+
+        An instance seen for the first time is charged from its ``launches`` time, or from now without one. A running
+        instance missing from the snapshot is charged up to its ``terminations`` time, or not at all without one.
+        """
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        launches = launches or {}
+        terminations = terminations or {}
+        billed = [i for i in instances if i.status not in _UNBILLED_STATUSES]
+
+        with self._db:
+            known = {
+                id: (last_seen, running)
+                for id, last_seen, running in self._db.execute(
+                    "SELECT instance_id, last_seen, running FROM instance_costs"
+                )
+            }
+            for instance in billed:
+                price = instance.instance_type.price_cents_per_hour
+                name = None if isinstance(instance.name, Unset) else instance.name
+                last_seen, running = known.get(instance.id, (None, False))
+                if running:
+                    charge = price * _hours(last_seen, now)
+                else:
+                    # New, or listed again after it was closed: only the time before its first sample is unknown.
+                    launch = launches.get(instance.id)
+                    charge = price * _hours(_time(launch.time), now) if launch and last_seen is None else 0.0
+                    self._db.execute(
+                        "INSERT INTO instance_costs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1, 0) "
+                        "ON CONFLICT (instance_id) DO UPDATE SET running = 1",
+                        (
+                            instance.id,
+                            name,
+                            instance.instance_type.name,
+                            instance.region.name.value,
+                            price,
+                            _tags(instance),
+                            launch.actor_lrn if launch else None,
+                            _time(min(launch.time, now) if launch else now),
+                            _time(now),
+                        ),
+                    )
+                self._db.execute(
+                    "UPDATE instance_costs SET name = ?, tags = ?, price_cents_per_hour = ?, last_seen = ?, "
+                    "cost_cents = cost_cents + ? WHERE instance_id = ?",
+                    (name, _tags(instance), price, _time(now), charge, instance.id),
+                )
+
+            current = {instance.id for instance in billed}
+            for id, (last_seen, running) in known.items():
+                if not running or id in current:
+                    continue
+                terminated = terminations.get(id)
+                if terminated is not None and terminated > _parse_time(last_seen):
+                    self._db.execute(
+                        "UPDATE instance_costs SET running = 0, last_seen = ?, "
+                        "cost_cents = cost_cents + price_cents_per_hour * ? WHERE instance_id = ?",
+                        (_time(terminated), _hours(last_seen, terminated), id),
+                    )
+                else:
+                    self._db.execute("UPDATE instance_costs SET running = 0 WHERE instance_id = ?", (id,))
+
+            cents_per_hour = sum(instance.instance_type.price_cents_per_hour for instance in billed)
+            self._db.execute(
+                "INSERT OR REPLACE INTO cost_samples VALUES (?, ?, ?)", (_time(now), len(billed), cents_per_hour)
+            )
+        total = self._db.execute("SELECT coalesce(sum(cost_cents), 0) FROM instance_costs").fetchone()[0]
+        return Sample(now, len(billed), cents_per_hour, total)
+
+    def report(self, by: str = "instance") -> list[CostRow]:
+        """The accumulated cost per instance, ``type``, ``region``, ``user`` (who launched it, from the audit log) or
+        ``tag:<key>``, most expensive first."""
+        params: list[Any] = []
+        if by == "instance":
+            key, group = "coalesce(max(name), instance_id)", "instance_id"
+        elif by == "type":
+            key = group = "instance_type"
+        elif by == "region":
+            key = group = "region"
+        elif by == "user":
+            key = group = "coalesce(launched_by, '-')"
+        elif by.startswith("tag:") and by[4:]:
+            key = group = "coalesce(json_extract(tags, ?), '-')"
+            params = [f'$."{by[4:]}"', f'$."{by[4:]}"']
+        else:
+            raise ValueError(f"Can't group costs by {by!r}, use one of {', '.join(REPORT_GROUPS)} or tag:<key>.")
+
+        rows = self._db.execute(
+            f"SELECT {key}, count(*), sum(running), sum(CASE WHEN running THEN price_cents_per_hour ELSE 0 END), "
+            f"sum(cost_cents) FROM instance_costs GROUP BY {group} ORDER BY 5 DESC, 1",
+            params,
+        )
+        return [CostRow(*row) for row in rows]
+
+    def check_budgets(self, budgets: Iterable[Budget] = ()) -> list[BudgetBreach]:
+        """The budgets whose instances have cost at least their cap: every ``budgets`` entry and the ``budget`` tag of
+        every running instance."""
+        breaches = []
+        rows = self._db.execute(
+            "SELECT instance_id, coalesce(name, instance_id), cost_cents, json_extract(tags, ?) FROM instance_costs "
+            "WHERE running AND json_extract(tags, ?) IS NOT NULL ORDER BY instance_id",
+            (f'$."{BUDGET_TAG}"', f'$."{BUDGET_TAG}"'),
+        )
+        for id, name, cost_cents, dollars in rows:
+            try:
+                cap_cents = float(dollars) * 100
+            except ValueError:
+                continue
+            if cost_cents >= cap_cents:
+                breaches.append(BudgetBreach(f"{BUDGET_TAG}={dollars} on {name}", cost_cents, cap_cents, (id,)))
+
+        for budget in budgets:
+            path = f'$."{budget.key}"'
+            spent, ids = self._db.execute(
+                "SELECT coalesce(sum(cost_cents), 0), group_concat(CASE WHEN running THEN instance_id END) "
+                "FROM instance_costs WHERE json_extract(tags, ?) = ?",
+                (path, budget.value),
+            ).fetchone()
+            if spent >= budget.cap_cents:
+                instance_ids = tuple(sorted(ids.split(","))) if ids else ()
+                breaches.append(BudgetBreach(f"{budget.key}={budget.value}", spent, budget.cap_cents, instance_ids))
+        return breaches
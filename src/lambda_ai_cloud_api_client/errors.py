@@ -1,5 +1,7 @@
 """Contains shared errors types that can be raised from API functions"""
 
+import httpx
+
 
 class UnexpectedStatus(Exception):
     """Raised by api functions when the response status an undocumented status and Client.raise_on_unexpected_status is True"""
@@ -22,4 +24,17 @@ class HttpError(Exception):
         super().__init__(self.message)
 
 
-__all__ = ["HttpError", "UnexpectedStatus"]
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request while the circuit breaker for its endpoint group is open"""
+
+    def __init__(self, group: str, retry_after: float, request: httpx.Request) -> None:
+        self.group = group
+        self.retry_after = retry_after
+
+        super().__init__(
+            f"The Lambda API is failing for /{group}, not sending requests for another {retry_after:.0f}s.",
+            request=request,
+        )
+
+
+__all__ = ["CircuitOpenError", "HttpError", "UnexpectedStatus"]
@@ -0,0 +1,340 @@
+"""Event hooks and metrics for the requests made by ``Client``/``AuthenticatedClient``.
+
+Pass an :class:`Instrumentation` to the client and subscribe to its events, or attach a :class:`MetricsCollector`::
+
+    instrumentation = Instrumentation()
+    collector = MetricsCollector().attach(instrumentation)
+    client = AuthenticatedClient(base_url=..., token=..., instrumentation=instrumentation)
+    ...
+    print(collector.to_prometheus())
+"""
+
+import json
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Callable, Iterable
+from typing import Any
+
+import httpx
+from attrs import define, field
+
+from lambda_ai_cloud_api_client.transport.cache import (
+    CACHE_STATUS_HEADER,
+    CachedResponse,
+    CacheEntry,
+    response_from_entry,
+)
+from lambda_ai_cloud_api_client.transport.hedging import HEDGED_HEADER
+from lambda_ai_cloud_api_client.transport.singleflight import COALESCED_HEADER
+
+REQUEST_START = "request_start"
+REQUEST_END = "request_end"
+RETRY = "retry"
+CACHE_HIT = "cache_hit"
+CACHE_MISS = "cache_miss"
+DECODE = "decode"
+EVENT_KINDS = (REQUEST_START, REQUEST_END, RETRY, CACHE_HIT, CACHE_MISS, DECODE)
+
+# Prometheus' default histogram buckets, in seconds.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+_LITERAL_SEGMENT = re.compile(r"^[a-z][a-z-]*$")
+
+
+def operation_name(request: httpx.Request) -> str:
+    """``GET /instances/{id}`` for ``GET /api/v1/instances/0920582c...``, path segments that are not plain words are ids."""
+    parts = [p for p in request.url.path.split("/") if p]
+    if parts[:2] == ["api", "v1"]:
+        parts = parts[2:]
+    template = "/".join(p if _LITERAL_SEGMENT.match(p) else "{id}" for p in parts)
+    return f"{request.method} /{template}"
+
+
+@define(frozen=True)
+class Event:
+    """A single instrumentation event, fields that do not apply to ``kind`` are None."""
+
+    kind: str
+    operation: str
+    method: str
+    url: str
+    status_code: int | None = None
+    duration: float | None = None
+    size: int | None = None
+    cache: str | None = None
+    decode_duration: float | None = None
+    error: Exception | None = None
+
+
+Hook = Callable[[Event], None]
+
+
+class Instrumentation:
+    """Dispatches request events to the hooks registered with :meth:`on`."""
+
+    def __init__(self) -> None:
+        self._hooks: dict[str, list[Hook]] = defaultdict(list)
+
+    def on(self, kind: str, hook: Hook | None = None) -> Any:
+        """Call ``hook`` for every event of ``kind`` (one of ``EVENT_KINDS`` or ``*``), usable as a decorator."""
+        if kind != "*" and kind not in EVENT_KINDS:
+            raise ValueError(f"Unknown event kind '{kind}', expected one of: *, {', '.join(EVENT_KINDS)}")
+        if hook is None:
+            return lambda h: self.on(kind, h)
+        self._hooks[kind].append(hook)
+        return hook
+
+    def listens(self, kind: str | None = None) -> bool:
+        """Whether a hook gets events of ``kind``, or any events at all without ``kind``."""
+        if kind is None:
+            return any(self._hooks.values())
+        return bool(self._hooks.get(kind) or self._hooks.get("*"))
+
+    def emit(self, event: Event) -> None:
+        for hook in (*self._hooks.get(event.kind, ()), *self._hooks.get("*", ())):
+            hook(event)
+
+    def wrap(self, transport: Any) -> "InstrumentedTransport":
+        return InstrumentedTransport(transport, self)
+
+
+class InstrumentedTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Emits the events of every request sent through ``transport``.
+
+    While a hook listens to ``DECODE`` events, JSON bodies are decoded here, once, so the decode time can be reported;
+    the response's ``json()`` returns that decoded body. Otherwise bodies are left alone.
+    """
+
+    def __init__(self, transport: Any, instrumentation: Instrumentation) -> None:
+        self._transport = transport
+        self.instrumentation = instrumentation
+
+    def _event(self, kind: str, request: httpx.Request, **fields: Any) -> None:
+        self.instrumentation.emit(
+            Event(kind=kind, operation=operation_name(request), method=request.method, url=str(request.url), **fields)
+        )
+
+    def _finish(self, request: httpx.Request, response: httpx.Response, start: float) -> httpx.Response:
+        duration = time.perf_counter() - start
+        cache = response.headers.get(CACHE_STATUS_HEADER)
+        if response.headers.get(COALESCED_HEADER):
+            cache = "coalesced"
+        if cache is not None:
+            self._event(CACHE_MISS if cache == "miss" else CACHE_HIT, request, cache=cache)
+        if response.headers.get(HEDGED_HEADER):
+            self._event(RETRY, request, status_code=response.status_code)
+
+        decode_duration = None
+        if self.instrumentation.listens(DECODE) and "json" in response.headers.get("content-type", ""):
+            if not isinstance(response, CachedResponse):
+                entry = CacheEntry(content=response.content, headers=list(response.headers.multi_items()), digest="")
+                response = response_from_entry(entry, response.status_code, response.extensions)
+            decode_start = time.perf_counter()
+            try:
+                response.json()
+            except ValueError:
+                pass
+            else:
+                decode_duration = time.perf_counter() - decode_start
+                self._event(DECODE, request, duration=decode_duration)
+
+        self._event(
+            REQUEST_END,
+            request,
+            status_code=response.status_code,
+            duration=duration,
+            size=len(response.content),
+            cache=cache,
+            decode_duration=decode_duration,
+        )
+        return response
+
+    def _failed(self, request: httpx.Request, error: Exception, start: float) -> None:
+        self._event(REQUEST_END, request, duration=time.perf_counter() - start, error=error)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._event(REQUEST_START, request)
+        start = time.perf_counter()
+        try:
+            response = self._transport.handle_request(request)
+            response.read()
+            response.close()
+        except Exception as e:
+            self._failed(request, e, start)
+            raise
+        return self._finish(request, response, start)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._event(REQUEST_START, request)
+        start = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+            await response.aread()
+            await response.aclose()
+        except Exception as e:
+            self._failed(request, e, start)
+            raise
+        return self._finish(request, response, start)
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+@define
+class Histogram:
+    buckets: tuple[float, ...]
+    counts: list[int] = field(init=False)
+    sum: float = 0.0
+    count: int = 0
+
+    def __attrs_post_init__(self) -> None:
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the ``q`` quantile, None without observations or past the last bucket."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, cumulative in zip(self.buckets, self.counts, strict=True):
+            if cumulative >= rank:
+                return bound
+        return None
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{k}="{json.dumps(str(v))[1:-1]}"' for k, v in labels.items()) + "}"
+
+
+class MetricsCollector:
+    """Aggregates request events into per-operation histograms and counters, and keeps the most recent calls."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS, max_calls: int = 1000) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.durations: dict[str, Histogram] = {}
+        self.decode_durations: dict[str, Histogram] = {}
+        self.requests: dict[tuple[str, str], int] = defaultdict(int)
+        self.response_bytes: dict[str, int] = defaultdict(int)
+        self.cache: dict[tuple[str, str], int] = defaultdict(int)
+        self.retries: dict[str, int] = defaultdict(int)
+        self.calls: deque[Event] = deque(maxlen=max_calls)
+        self._lock = threading.Lock()
+
+    def attach(self, instrumentation: Instrumentation) -> "MetricsCollector":
+        instrumentation.on("*", self.record)
+        return self
+
+    def _histogram(self, histograms: dict[str, Histogram], operation: str) -> Histogram:
+        if operation not in histograms:
+            histograms[operation] = Histogram(self.buckets)
+        return histograms[operation]
+
+    def record(self, event: Event) -> None:
+        with self._lock:
+            if event.kind == REQUEST_END:
+                status = "error" if event.error is not None else str(event.status_code)
+                self.requests[(event.operation, status)] += 1
+                self._histogram(self.durations, event.operation).observe(event.duration)
+                self.response_bytes[event.operation] += event.size or 0
+                self.calls.append(event)
+            elif event.kind == DECODE:
+                self._histogram(self.decode_durations, event.operation).observe(event.duration)
+            elif event.kind in (CACHE_HIT, CACHE_MISS):
+                self.cache[(event.operation, event.cache)] += 1
+            elif event.kind == RETRY:
+                self.retries[event.operation] += 1
+
+    def to_prometheus(self, prefix: str = "lai_client") -> str:
+        """The collected metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for name, histograms, help in (
+                ("request_duration_seconds", self.durations, "Time from sending a request to its decoded response."),
+                ("decode_duration_seconds", self.decode_durations, "Time spent decoding JSON response bodies."),
+            ):
+                lines += [f"# HELP {prefix}_{name} {help}", f"# TYPE {prefix}_{name} histogram"]
+                for operation, h in sorted(histograms.items()):
+                    for bound, count in zip(h.buckets, h.counts, strict=True):
+                        lines.append(f"{prefix}_{name}_bucket{_labels(operation=operation, le=bound)} {count}")
+                    lines.append(f"{prefix}_{name}_bucket{_labels(operation=operation, le='+Inf')} {h.count}")
+                    lines.append(f"{prefix}_{name}_sum{_labels(operation=operation)} {h.sum}")
+                    lines.append(f"{prefix}_{name}_count{_labels(operation=operation)} {h.count}")
+
+            for name, counter, help, label in (
+                ("requests_total", self.requests, "Requests by operation and status code.", "status"),
+                ("cache_total", self.cache, "Cache and coalescing results by operation.", "result"),
+            ):
+                lines += [f"# HELP {prefix}_{name} {help}", f"# TYPE {prefix}_{name} counter"]
+                for (operation, value), count in sorted(counter.items()):
+                    lines.append(f"{prefix}_{name}{_labels(operation=operation, **{label: value})} {count}")
+
+            for name, counter, help in (
+                ("response_bytes_total", self.response_bytes, "Response body bytes by operation."),
+                ("retries_total", self.retries, "Hedged requests that answered first, by operation."),
+            ):
+                lines += [f"# HELP {prefix}_{name} {help}", f"# TYPE {prefix}_{name} counter"]
+                for operation, count in sorted(counter.items()):
+                    lines.append(f"{prefix}_{name}{_labels(operation=operation)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def opentelemetry_hook(meter: Any = None) -> Hook:
+    """A hook recording request durations and sizes with OpenTelemetry, register it with ``instrumentation.on("*", ...)``.
+
+    Uses the global meter provider unless ``meter`` is given, requires the ``opentelemetry-api`` package.
+    """
+    try:
+        from opentelemetry import metrics
+    except ImportError as e:
+        raise RuntimeError(
+            "opentelemetry-api is required for OpenTelemetry metrics, install lambda-ai-cloud-api-client[otel]."
+        ) from e
+
+    meter = meter if meter is not None else metrics.get_meter("lambda_ai_cloud_api_client")
+    duration = meter.create_histogram("lai.client.request.duration", unit="s")
+    decode = meter.create_histogram("lai.client.decode.duration", unit="s")
+    size = meter.create_counter("lai.client.response.size", unit="By")
+    cache = meter.create_counter("lai.client.cache")
+
+    def hook(event: Event) -> None:
+        attributes = {"operation": event.operation}
+        if event.kind == REQUEST_END:
+            status = "error" if event.error is not None else str(event.status_code)
+            duration.record(event.duration, {**attributes, "status": status})
+            size.add(event.size or 0, attributes)
+        elif event.kind == DECODE:
+            decode.record(event.duration, attributes)
+        elif event.kind in (CACHE_HIT, CACHE_MISS):
+            cache.add(1, {**attributes, "result": event.cache})
+
+    return hook
+
+
+__all__ = (
+    "CACHE_HIT",
+    "CACHE_MISS",
+    "DECODE",
+    "DEFAULT_BUCKETS",
+    "EVENT_KINDS",
+    "REQUEST_END",
+    "REQUEST_START",
+    "RETRY",
+    "Event",
+    "Histogram",
+    "Instrumentation",
+    "InstrumentedTransport",
+    "MetricsCollector",
+    "operation_name",
+    "opentelemetry_hook",
+)
@@ -0,0 +1,30 @@
+"""An offline stand-in for the Lambda Cloud API, for load, latency and regression testing without network access.
+
+``MockApiTransport`` answers every endpoint of the API from an in-memory ``MockCloud`` (with a synthetic fleet of any
+size) and can add latency, jitter, 500s and 429 rate limiting. ``RecordingTransport``/``ReplayTransport`` record real
+sessions to a JSON lines file and play them back. Use the transports directly::
+
+    client = AuthenticatedClient(
+        base_url="https://cloud.lambdalabs.com",
+        token="mock",
+        httpx_args={"transport": MockApiTransport(MockCloud(instances=10_000), latency=0.05)},
+    )
+
+or serve them over HTTP with ``MockServer`` / ``python -m lambda_ai_cloud_api_client.mock serve``.
+"""
+
+from .cloud import ApiError, MockCloud
+from .record import RecordingTransport, ReplayMiss, ReplayTransport, load_recording
+from .server import MockServer
+from .transport import MockApiTransport
+
+__all__ = (
+    "ApiError",
+    "MockApiTransport",
+    "MockCloud",
+    "MockServer",
+    "RecordingTransport",
+    "ReplayMiss",
+    "ReplayTransport",
+    "load_recording",
+)
@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import click
+
+from lambda_ai_cloud_api_client.mock import MockApiTransport, MockCloud, MockServer, RecordingTransport, ReplayTransport
+
+
+@click.group()
+def main() -> None:
+    """Offline stand-in for the Lambda Cloud API."""
+
+
+@main.command("serve", help="Serve a mock Lambda Cloud API, point lai at it with LAMBDA_CLOUD_BASE_URL.")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8765, show_default=True)
+@click.option("--instances", type=int, default=10, show_default=True, help="Size of the synthetic fleet.")
+@click.option("--audit-events", type=int, default=1000, show_default=True, help="Number of synthetic audit events.")
+@click.option("--seed", type=int, default=0, show_default=True, help="Seed for the synthetic data and randomness.")
+@click.option("--latency-ms", type=float, default=0, show_default=True, help="Latency added to every request.")
+@click.option("--jitter-ms", type=float, default=0, show_default=True, help="Random extra latency, up to this much.")
+@click.option("--error-rate", type=float, default=0, show_default=True, help="Fraction of requests answered with 500.")
+@click.option("--rate-limit", type=float, default=None, help="Requests per second before answering 429.")
+@click.option("--boot-seconds", type=float, default=0, show_default=True, help="Time launched instances boot for.")
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Serve this recording instead of the synthetic cloud.",
+)
+@click.option("--realtime", is_flag=True, help="With --replay, replay the recorded latency.")
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Append every request/response pair to this file.",
+)
+@click.option("--verbose", is_flag=True, help="Log every request.")
+def serve_cmd(
+    host: str,
+    port: int,
+    instances: int,
+    audit_events: int,
+    seed: int,
+    latency_ms: float,
+    jitter_ms: float,
+    error_rate: float,
+    rate_limit: float | None,
+    boot_seconds: float,
+    replay: Path | None,
+    realtime: bool,
+    record: Path | None,
+    verbose: bool,
+) -> None:
+    if replay is not None:
+        transport = ReplayTransport(replay, realtime=realtime, strict=False)
+    else:
+        cloud = MockCloud(instances=instances, audit_events=audit_events, seed=seed, boot_seconds=boot_seconds)
+        transport = MockApiTransport(
+            cloud,
+            latency=latency_ms / 1000,
+            jitter=jitter_ms / 1000,
+            error_rate=error_rate,
+            rate_limit=rate_limit,
+            seed=seed,
+        )
+    if record is not None:
+        transport = RecordingTransport(transport, record)
+
+    server = MockServer(transport, host=host, port=port, verbose=verbose)
+    click.echo(f"Serving the mock Lambda Cloud API on {server.base_url}", err=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
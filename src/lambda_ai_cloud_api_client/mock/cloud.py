@@ -0,0 +1,302 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+REGIONS = {
+    "us-west-1": "California, USA",
+    "us-west-2": "Arizona, USA",
+    "us-west-3": "Utah, USA",
+    "us-south-1": "Texas, USA",
+    "us-south-2": "North Texas, USA",
+    "us-east-1": "Virginia, USA",
+    "us-east-3": "Washington DC, USA",
+    "us-midwest-1": "Illinois, USA",
+    "europe-central-1": "Germany",
+    "asia-northeast-1": "Tokyo, Japan",
+    "asia-south-1": "India",
+    "me-west-1": "Israel",
+}
+
+# name: (description, gpu description, price in cents per hour, vcpus, memory GiB, storage GiB, gpus)
+INSTANCE_TYPES = {
+    "gpu_1x_a10": ("1x A10 (24 GB PCIe)", "A10 (24 GB PCIe)", 75, 30, 200, 1400, 1),
+    "gpu_1x_a100_sxm4": ("1x A100 (40 GB SXM4)", "A100 (40 GB SXM4)", 129, 30, 200, 512, 1),
+    "gpu_8x_a100_80gb_sxm4": ("8x A100 (80 GB SXM4)", "A100 (80 GB SXM4)", 1432, 240, 1800, 19500, 8),
+    "gpu_1x_gh200": ("1x GH200 (96 GB)", "GH200 (96 GB)", 149, 64, 432, 4096, 1),
+    "gpu_1x_h100_pcie": ("1x H100 (80 GB PCIe)", "H100 (80 GB PCIe)", 249, 26, 200, 1000, 1),
+    "gpu_2x_h100_sxm5": ("2x H100 (80 GB SXM5)", "H100 (80 GB SXM5)", 598, 52, 450, 5500, 2),
+    "gpu_8x_h100_sxm5": ("8x H100 (80 GB SXM5)", "H100 (80 GB SXM5)", 2392, 208, 1800, 22000, 8),
+    "gpu_8x_b200_sxm6": ("8x B200 (180 GB SXM6)", "B200 (180 GB SXM6)", 3992, 208, 2900, 22000, 8),
+}
+
+IMAGE_FAMILIES = {
+    "lambda-stack-24-04": ("Lambda Stack 24.04", "Ubuntu 24.04 with CUDA, Docker and ML frameworks", "x86_64"),
+    "lambda-stack-22-04": ("Lambda Stack 22.04", "Ubuntu 22.04 with CUDA, Docker and ML frameworks", "x86_64"),
+    "lambda-stack-24-04-arm64": ("Lambda Stack 24.04 (ARM)", "Lambda Stack for GH200", "arm64"),
+    "ubuntu-24-04": ("Ubuntu 24.04", "Plain Ubuntu 24.04 LTS", "x86_64"),
+}
+
+_ACTIONS = ("migrate", "rebuild", "restart", "cold_reboot", "terminate")
+_AUDIT_RESOURCES = (
+    ("instance", ("launched", "terminated", "restarted", "renamed")),
+    ("ssh_key", ("created", "deleted")),
+    ("api_key", ("created", "deleted")),
+    ("filesystem", ("created", "deleted")),
+    ("firewall_ruleset", ("created", "updated", "deleted")),
+)
+
+
+# Suggestions for the error codes whose schema requires one, the generated error models fail to parse them without.
+_SUGGESTIONS = {
+    "global/object-does-not-exist": "Check the names and IDs in your request and try again.",
+    "global/invalid-api-key": "Check your API key or create a new one, then try again.",
+    "global/internal-error": "Try again later. Contact Support if the problem persists.",
+    "firewall-rulesets/firewall-ruleset-in-use": "Terminate all instances that are using the ruleset before deleting it.",
+}
+
+
+class ApiError(Exception):
+    """An error response of the API, rendered as ``{"error": {"code": ..., "message": ..., "suggestion": ...}}``.
+
+    Without a ``suggestion`` the API's default one for ``code`` is used, if it has one.
+    """
+
+    def __init__(self, status_code: int, code: str, message: str, suggestion: str | None = None) -> None:
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+        self.suggestion = suggestion or _SUGGESTIONS.get(code)
+        super().__init__(message)
+
+    def payload(self) -> dict[str, Any]:
+        error = {"code": self.code, "message": self.message}
+        if self.suggestion:
+            error["suggestion"] = self.suggestion
+        return {"error": error}
+
+
+def not_found(message: str, suggestion: str | None = None) -> ApiError:
+    return ApiError(404, "global/object-does-not-exist", message, suggestion)
+
+
+def invalid(message: str) -> ApiError:
+    return ApiError(400, "global/invalid-parameters", message)
+
+
+def _isoformat(dt: datetime) -> str:
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+class MockCloud:
+    """In-memory state of one Lambda Cloud account, as served by :class:`MockApiTransport`.
+
+    Everything is generated from ``seed``, so two clouds with the same arguments serve identical payloads. Launched
+    instances boot for ``boot_seconds`` (no ip, status ``booting``) before they become ``active``.
+    """
+
+    def __init__(
+        self,
+        instances: int = 0,
+        audit_events: int = 0,
+        seed: int = 0,
+        boot_seconds: float = 0.0,
+        capacity: float = 0.5,
+        audit_page_size: int = 100,
+    ) -> None:
+        self.random = random.Random(seed)
+        self.boot_seconds = boot_seconds
+        self.audit_page_size = audit_page_size
+        self.now = datetime(2025, 11, 1, tzinfo=timezone.utc)
+        self.lock = threading.RLock()
+        self._counter = 0
+
+        self.instance_types = {
+            name: {
+                "instance_type": self._instance_type(name),
+                "regions_with_capacity_available": [self.region(r) for r in REGIONS if self.random.random() < capacity],
+            }
+            for name in INSTANCE_TYPES
+        }
+        self.images = [
+            {
+                "id": self._uuid(),
+                "created_time": _isoformat(self.now - timedelta(days=90)),
+                "updated_time": _isoformat(self.now - timedelta(days=30)),
+                "name": name,
+                "description": description,
+                "family": family,
+                "version": "1.0.0",
+                "architecture": architecture,
+                "region": self.region(region),
+            }
+            for family, (name, description, architecture) in IMAGE_FAMILIES.items()
+            for region in REGIONS
+        ]
+        self.ssh_keys = {
+            key["id"]: key
+            for key in (
+                {"id": self.new_id(), "name": name, "public_key": f"ssh-ed25519 AAAAC3NzaC1lZDI1NTE5AAAAI{name} {name}"}
+                for name in ("laptop", "ci")
+            )
+        }
+        self.filesystems: dict[str, dict] = {}
+        self.firewall_rulesets: dict[str, dict] = {}
+        self.global_firewall_ruleset = {"id": "global", "name": "Global Firewall Rules", "rules": []}
+        self.firewall_rules = [
+            {"protocol": "tcp", "port_range": [22, 22], "source_network": "0.0.0.0/0", "description": "SSH"}
+        ]
+        # id -> instance, with private "_launched_at"/"_ip" keys that are not served.
+        self.instances: dict[str, dict] = {}
+        self.audit_events: list[dict] = []
+
+        self.add_instances(instances)
+        self.add_audit_events(audit_events)
+
+    def new_id(self) -> str:
+        return f"{self.random.getrandbits(128):032x}"
+
+    def _uuid(self) -> str:
+        h = self.new_id()
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+    @staticmethod
+    def region(name: str) -> dict:
+        return {"name": name, "description": REGIONS[name]}
+
+    @staticmethod
+    def _instance_type(name: str) -> dict:
+        description, gpu_description, price, vcpus, memory, storage, gpus = INSTANCE_TYPES[name]
+        return {
+            "name": name,
+            "description": description,
+            "gpu_description": gpu_description,
+            "price_cents_per_hour": price,
+            "specs": {"vcpus": vcpus, "memory_gib": memory, "storage_gib": storage, "gpus": gpus},
+        }
+
+    def _ip(self) -> str:
+        return f"198.51.{self.random.randrange(256)}.{self.random.randrange(1, 255)}"
+
+    def add_instances(
+        self,
+        count: int,
+        instance_type: str | None = None,
+        region: str | None = None,
+        name: str | None = None,
+        booted: bool = True,
+        **fields: Any,
+    ) -> list[str]:
+        """Add ``count`` instances (a synthetic fleet when type/region are not given), returns their ids."""
+        ids = []
+        with self.lock:
+            for _ in range(count):
+                self._counter += 1
+                id = self.new_id()
+                instance = {
+                    "id": id,
+                    "name": name or f"node-{self._counter:05d}",
+                    "status": "booting",
+                    "ssh_key_names": [next(iter(self.ssh_keys.values()))["name"]] if self.ssh_keys else [],
+                    "file_system_names": [],
+                    "file_system_mounts": [],
+                    "region": self.region(region or self.random.choice(list(REGIONS))),
+                    "instance_type": self._instance_type(instance_type or self.random.choice(list(INSTANCE_TYPES))),
+                    "hostname": f"node-{self._counter:05d}",
+                    "tags": [{"key": "team", "value": self.random.choice(("research", "infra", "serving"))}],
+                    "firewall_rulesets": [],
+                    **fields,
+                    "_launched_at": float("-inf") if booted else time.monotonic(),
+                    "_ip": self._ip(),
+                    "_private_ip": f"10.0.{self.random.randrange(256)}.{self.random.randrange(1, 255)}",
+                }
+                self.instances[id] = instance
+                ids.append(id)
+        return ids
+
+    def add_audit_events(self, count: int) -> None:
+        with self.lock:
+            start = self.now - timedelta(days=30)
+            step = timedelta(days=30) / max(count, 1)
+            for i in range(count):
+                resource, actions = self.random.choice(_AUDIT_RESOURCES)
+                resource_id = self.new_id()
+                self.audit_events.append(
+                    {
+                        "service_name": "cloud",
+                        "resource_name": resource,
+                        "action": self.random.choice(actions),
+                        "catalog_version": "2025-09-06",
+                        "event_id": self.new_id(),
+                        "event_time": _isoformat(start + step * i),
+                        "actor_lrn": f"lrn:cloud:identity:{self.new_id()}",
+                        "resource_lrns": [f"lrn:cloud:{resource}:{resource_id}"],
+                        "resource_owner_lrn": "lrn:cloud:account:fedcba9876543210fedcba9876543210",
+                        "request_api_key_lrn": f"lrn:cloud:api_key:{self.new_id()}",
+                        "additional_details": {f"{resource}_lrn": f"lrn:cloud:{resource}:{resource_id}"},
+                    }
+                )
+
+    def instance_payload(self, instance: dict) -> dict:
+        booted = time.monotonic() - instance["_launched_at"] >= self.boot_seconds
+        payload = {k: v for k, v in instance.items() if not k.startswith("_")}
+        status = payload["status"]
+        if status == "booting" and booted:
+            status = payload["status"] = "active"
+        if status == "active":
+            payload["ip"] = instance["_ip"]
+            payload["private_ip"] = instance["_private_ip"]
+        available = status == "active"
+        blocked = {"available": False, "reason_code": "vm-has-not-launched", "reason_description": "Not launched yet."}
+        payload["actions"] = {action: {"available": True} if available else dict(blocked) for action in _ACTIONS}
+        payload["actions"]["terminate"] = {"available": status in ("booting", "active", "unhealthy")}
+        return payload
+
+    def get_instance(self, id: str) -> dict:
+        instance = self.instances.get(id)
+        if instance is None:
+            raise not_found("Specified instance does not exist.")
+        return instance
+
+    def launch(self, body: dict) -> list[str]:
+        type_name = body.get("instance_type_name")
+        region = body.get("region_name")
+        if not type_name or not region or "ssh_key_names" not in body:
+            raise invalid("region_name, instance_type_name and ssh_key_names are required.")
+        if type_name not in self.instance_types:
+            raise not_found(f"Instance type {type_name} does not exist.", "Check the instance type name and try again.")
+        if region not in {r["name"] for r in self.instance_types[type_name]["regions_with_capacity_available"]}:
+            raise ApiError(
+                400,
+                "instance-operations/launch/insufficient-capacity",
+                "Not enough capacity to fulfill launch request.",
+                "Choose another region or instance type.",
+            )
+        known_keys = {k["name"] for k in self.ssh_keys.values()}
+        if missing := [k for k in body["ssh_key_names"] if k not in known_keys]:
+            raise not_found(f"SSH key(s) {', '.join(missing)} do not exist.", "Check your SSH key names and try again.")
+        fields = {
+            "ssh_key_names": body["ssh_key_names"],
+            "file_system_names": body.get("file_system_names", []),
+            "tags": body.get("tags", []),
+            "firewall_rulesets": body.get("firewall_rulesets", []),
+        }
+        if body.get("hostname"):
+            fields["hostname"] = body["hostname"]
+        return self.add_instances(1, type_name, region, body.get("name"), booted=False, **fields)
+
+    def terminate(self, ids: list[str]) -> list[dict]:
+        with self.lock:
+            instances = [self.get_instance(id) for id in ids]
+            terminated = []
+            for instance in instances:
+                payload = self.instance_payload(instance)
+                payload["status"] = "terminating"
+                terminated.append(payload)
+                del self.instances[instance["id"]]
+            return terminated
+
+    def restart(self, ids: list[str]) -> list[dict]:
+        with self.lock:
+            return [self.instance_payload(self.get_instance(id)) for id in ids]
@@ -0,0 +1,139 @@
+import asyncio
+import base64
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+# Response headers that describe the network body rather than the recorded (decoded) one.
+_FRAMING_HEADERS = ("content-encoding", "transfer-encoding", "content-length", "connection")
+
+
+class ReplayMiss(httpx.TransportError):
+    """Raised by a strict :class:`ReplayTransport` for a request that is not in the recording."""
+
+
+def _target(url: httpx.URL) -> str:
+    # Recordings are independent of the host they were made against.
+    return url.raw_path.decode()
+
+
+def _encode(content: bytes) -> dict[str, str]:
+    try:
+        return {"text": content.decode()}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode()}
+
+
+def _decode(body: dict[str, str] | None) -> bytes:
+    if not body:
+        return b""
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body["text"].encode()
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Appends every request/response pair sent through ``transport`` to a JSON lines file.
+
+    Only the method, path, query, request body, status, response headers, response body and elapsed time are written,
+    request headers (and so the API token) never are. Replay the file with :class:`ReplayTransport`.
+    """
+
+    def __init__(self, transport: Any, path: Path | str) -> None:
+        self._transport = transport
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _record(self, request: httpx.Request, response: httpx.Response, elapsed: float) -> None:
+        record = {
+            "method": request.method,
+            "target": _target(request.url),
+            "request_body": _encode(request.content) if request.content else None,
+            "status_code": response.status_code,
+            "headers": [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _FRAMING_HEADERS],
+            "body": _encode(response.content),
+            "elapsed": round(elapsed, 6),
+        }
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock, self.path.open("a") as f:
+            f.write(line)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = self._transport.handle_request(request)
+        response.read()
+        response.close()
+        self._record(request, response, time.perf_counter() - start)
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        await response.aread()
+        await response.aclose()
+        self._record(request, response, time.perf_counter() - start)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def load_recording(path: Path | str) -> list[dict]:
+    with Path(path).open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Answers requests from a recording made by :class:`RecordingTransport`, without any network.
+
+    Requests are matched on method, path, query and body. Identical requests get the recorded responses in order and
+    the last one again once those run out. With ``realtime`` the recorded latency is replayed too. A request that was
+    never recorded raises :class:`ReplayMiss`, or gets a ``404`` when ``strict`` is off.
+    """
+
+    def __init__(self, recording: Path | str | Iterable[dict], realtime: bool = False, strict: bool = True) -> None:
+        records = load_recording(recording) if isinstance(recording, (str, Path)) else list(recording)
+        self.realtime = realtime
+        self.strict = strict
+        self._responses: dict[tuple[str, str, bytes], deque[dict]] = defaultdict(deque)
+        for record in records:
+            key = (record["method"], record["target"], _decode(record["request_body"]))
+            self._responses[key].append(record)
+        self._lock = threading.Lock()
+
+    def _next(self, request: httpx.Request) -> dict | None:
+        with self._lock:
+            responses = self._responses.get((request.method, _target(request.url), request.content))
+            if not responses:
+                return None
+            return responses.popleft() if len(responses) > 1 else responses[0]
+
+    def _response(self, request: httpx.Request, record: dict | None) -> httpx.Response:
+        if record is None:
+            if self.strict:
+                raise ReplayMiss(f"{request.method} {_target(request.url)} is not in the recording.", request=request)
+            return httpx.Response(404, json={"error": {"code": "global/not-found", "message": "Not recorded."}})
+        return httpx.Response(record["status_code"], headers=record["headers"], content=_decode(record["body"]))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        record = self._next(request)
+        if record is not None and self.realtime:
+            time.sleep(record["elapsed"])
+        return self._response(request, record)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        record = self._next(request)
+        if record is not None and self.realtime:
+            await asyncio.sleep(record["elapsed"])
+        return self._response(request, record)
@@ -0,0 +1,80 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import httpx
+
+from .record import _FRAMING_HEADERS
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def _handle(self) -> None:
+        content = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        host = self.headers.get("Host") or "{}:{}".format(*self.server.server_address[:2])
+        request = httpx.Request(
+            self.command,
+            f"http://{host}{self.path}",
+            headers=[(k, v) for k, v in self.headers.items() if k.lower() != "host"],
+            content=content,
+        )
+        try:
+            response = self.server.transport.handle_request(request)
+            response.read()
+        except httpx.TransportError as e:
+            response = httpx.Response(502, json={"error": {"code": "mock/transport-error", "message": str(e)}})
+
+        self.send_response(response.status_code)
+        for name, value in response.headers.multi_items():
+            if name.lower() not in _FRAMING_HEADERS:
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class MockServer(ThreadingHTTPServer):
+    """Serves any httpx transport, e.g. a ``MockApiTransport`` or ``ReplayTransport``, over HTTP on localhost.
+
+    Use it to point the ``lai`` CLI or other processes at the mock with ``LAMBDA_CLOUD_BASE_URL``. ``port=0`` picks a
+    free port, see :attr:`base_url`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, transport: Any, host: str = "127.0.0.1", port: int = 0, verbose: bool = False) -> None:
+        super().__init__((host, port), _Handler)
+        self.transport = transport
+        self.verbose = verbose
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="lai-mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
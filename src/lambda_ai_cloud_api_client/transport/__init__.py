@@ -0,0 +1,40 @@
+"""httpx transports that add caching and resilience to the API clients.
+
+Pass them to ``AuthenticatedClient(transport_wrappers=...)``, each wrapper is called with the transport it wraps::
+
+    cache = ValidatorCache()
+    client = AuthenticatedClient(
+        base_url=...,
+        token=...,
+        transport_wrappers=(
+            HedgingTransport,
+            partial(CircuitBreakerTransport, breaker=CircuitBreaker(failure_threshold=5)),
+            partial(ConditionalGetTransport, cache=cache),
+            partial(SingleFlightTransport, reuse_seconds=0.5),
+        ),
+    )
+
+The first wrapper sits closest to the network: hedging is fired per network request, the breaker counts a hedged
+request once and a coalesced or revalidated GET is only sent (and counted) once.
+"""
+
+from .breaker import CircuitBreaker, CircuitBreakerTransport, endpoint_group
+from .cache import CACHE_STATUS_HEADER, CachedResponse, CacheEntry, ConditionalGetTransport, ValidatorCache
+from .hedging import HEDGED_HEADER, HedgingTransport, LatencyTracker
+from .singleflight import COALESCED_HEADER, SingleFlightTransport
+
+__all__ = (
+    "CACHE_STATUS_HEADER",
+    "COALESCED_HEADER",
+    "CacheEntry",
+    "CachedResponse",
+    "CircuitBreaker",
+    "CircuitBreakerTransport",
+    "ConditionalGetTransport",
+    "HEDGED_HEADER",
+    "HedgingTransport",
+    "LatencyTracker",
+    "SingleFlightTransport",
+    "ValidatorCache",
+    "endpoint_group",
+)
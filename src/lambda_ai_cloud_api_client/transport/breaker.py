@@ -0,0 +1,129 @@
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from lambda_ai_cloud_api_client.errors import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+def endpoint_group(request: httpx.Request) -> str:
+    # /api/v1/instances/{id} -> instances, /api/v1/instance-operations/launch -> instance-operations
+    parts = [p for p in request.url.path.split("/") if p]
+    if parts[:2] == ["api", "v1"]:
+        parts = parts[2:]
+    return parts[0] if parts else ""
+
+
+class _Circuit:
+    def __init__(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures per endpoint group and stops sending requests to a group that keeps failing.
+
+    A group opens after ``failure_threshold`` consecutive failures (network errors or 5xx responses). While open every
+    request fails fast with :class:`~lambda_ai_cloud_api_client.errors.CircuitOpenError`. After ``recovery_seconds``
+    the group is half-open: a single probe request is let through, its success closes the group, a failure opens it
+    again. Can be shared by several transports and is thread-safe.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self._circuits: dict[str, _Circuit] = {}
+        self._lock = threading.Lock()
+
+    def state(self, group: str) -> str:
+        with self._lock:
+            circuit = self._circuits.get(group)
+            return circuit.state if circuit is not None else CLOSED
+
+    def acquire(self, group: str) -> float | None:
+        """Returns None when a request to ``group`` may be sent, otherwise the seconds until the next probe."""
+        with self._lock:
+            circuit = self._circuits.setdefault(group, _Circuit())
+            if circuit.state == CLOSED:
+                return None
+            remaining = circuit.opened_at + self.recovery_seconds - time.monotonic()
+            if circuit.state == OPEN and remaining <= 0:
+                circuit.state = HALF_OPEN
+            if circuit.state == HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return None
+            return max(remaining, 0.0)
+
+    def record(self, group: str, success: bool | None) -> None:
+        """Record the outcome of a request, None when it ended without one (cancelled)."""
+        with self._lock:
+            circuit = self._circuits.setdefault(group, _Circuit())
+            probe = circuit.state == HALF_OPEN and circuit.probing
+            if probe:
+                circuit.probing = False
+            if success is None:
+                return
+            if success:
+                circuit.state, circuit.failures = CLOSED, 0
+                return
+            circuit.failures += 1
+            if probe or circuit.failures >= self.failure_threshold:
+                circuit.state, circuit.opened_at = OPEN, time.monotonic()
+
+
+def _succeeded(response: httpx.Response) -> bool:
+    return response.status_code < 500
+
+
+class CircuitBreakerTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Fails fast with ``CircuitOpenError`` while the :class:`CircuitBreaker` for a request's endpoint group is open."""
+
+    def __init__(self, transport: Any, breaker: CircuitBreaker | None = None) -> None:
+        self._transport = transport
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+
+    def _acquire(self, request: httpx.Request) -> str:
+        group = endpoint_group(request)
+        retry_after = self.breaker.acquire(group)
+        if retry_after is not None:
+            raise CircuitOpenError(group, retry_after, request=request)
+        return group
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        group = self._acquire(request)
+        success = None
+        try:
+            response = self._transport.handle_request(request)
+            success = _succeeded(response)
+            return response
+        except httpx.TransportError:
+            success = False
+            raise
+        finally:
+            self.breaker.record(group, success)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        group = self._acquire(request)
+        success = None
+        try:
+            response = await self._transport.handle_async_request(request)
+            success = _succeeded(response)
+            return response
+        except httpx.TransportError:
+            success = False
+            raise
+        finally:
+            self.breaker.record(group, success)
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
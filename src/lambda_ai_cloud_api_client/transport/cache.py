@@ -0,0 +1,215 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import httpx
+from attrs import define, field
+
+CACHE_STATUS_HEADER = "x-lai-cache"
+
+_NOT_DECODED = object()
+
+
+@define
+class CacheEntry:
+    """A stored GET response together with the validators needed to revalidate it."""
+
+    content: bytes
+    headers: list[tuple[str, str]]
+    digest: str
+    etag: str | None = None
+    last_modified: str | None = None
+    _decoded: Any = field(default=_NOT_DECODED, init=False)
+
+    def json(self) -> Any:
+        """The decoded body, decoded once per entry."""
+        if self._decoded is _NOT_DECODED:
+            self._decoded = json.loads(self.content)
+        return self._decoded
+
+
+class CachedResponse(httpx.Response):
+    """A response whose body is known to equal a cached entry, ``json()`` reuses the entry's decoded body."""
+
+    def __init__(self, *args: Any, entry: CacheEntry, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._entry = entry
+
+    def json(self, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().json(**kwargs)
+        return self._entry.json()
+
+
+def response_from_entry(
+    entry: CacheEntry,
+    status_code: int,
+    extensions: dict[str, Any] | None = None,
+    extra_headers: dict[str, str] | None = None,
+) -> CachedResponse:
+    headers = httpx.Headers(entry.headers)
+    # The body is rebuilt from the already decompressed content, drop framing headers that described the network body.
+    for name in ("content-encoding", "transfer-encoding", "content-length"):
+        headers.pop(name, None)
+    headers.update(extra_headers or {})
+    return CachedResponse(status_code, headers=headers, content=entry.content, extensions=extensions or {}, entry=entry)
+
+
+class ValidatorCache:
+    """A thread-safe LRU of GET responses keyed by url and credentials, shared by every transport it is given to.
+
+    With ``directory`` set, entries are also written to disk so that separate processes (CLI invocations) can
+    revalidate against each other's responses. Files are created readable by the current user only.
+    """
+
+    def __init__(self, max_entries: int = 256, directory: Path | str | None = None) -> None:
+        self.max_entries = max_entries
+        self.directory = Path(directory) if directory else None
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._load(key)
+        if entry is not None:
+            self._store(key, entry)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._store(key, entry)
+        self._dump(key, entry)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> CacheEntry | None:
+        if self.directory is None:
+            return None
+        try:
+            meta = json.loads((self.directory / f"{key}.json").read_text())
+            content = (self.directory / f"{key}.body").read_bytes()
+        except (OSError, ValueError):
+            return None
+        if hashlib.sha256(content).hexdigest() != meta.get("digest"):
+            return None
+        return CacheEntry(
+            content=content,
+            headers=[tuple(h) for h in meta["headers"]],
+            digest=meta["digest"],
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+        )
+
+    def _dump(self, key: str, entry: CacheEntry) -> None:
+        if self.directory is None:
+            return
+        meta = {
+            "headers": entry.headers,
+            "digest": entry.digest,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+        }
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            for suffix, data in ((".body", entry.content), (".json", json.dumps(meta).encode())):
+                tmp = self.directory / f"{key}{suffix}.tmp"
+                tmp.touch(mode=0o600)
+                tmp.write_bytes(data)
+                tmp.replace(self.directory / f"{key}{suffix}")
+        except OSError:
+            # The disk cache is an optimisation, never fail a request because of it.
+            pass
+
+
+def cache_key(request: httpx.Request) -> str:
+    # Different tokens see different resources, never share entries between them.
+    authorization = request.headers.get("authorization", "")
+    return hashlib.sha256(f"{request.method} {request.url}\0{authorization}".encode()).hexdigest()
+
+
+class ConditionalGetTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Revalidates GET requests with ``If-None-Match``/``If-Modified-Since`` against a :class:`ValidatorCache`.
+
+    A ``304 Not Modified`` is answered from the cache as a ``200``. When the server sends no validators the body is
+    still downloaded, but if its hash matches the cached one the previously decoded JSON is reused. Every response
+    carries an ``x-lai-cache`` header: ``revalidated`` (304), ``unchanged`` (same hash) or ``miss``.
+    """
+
+    def __init__(self, transport: Any, cache: ValidatorCache | None = None) -> None:
+        self._transport = transport
+        self.cache = cache if cache is not None else ValidatorCache()
+
+    def _prepare(self, request: httpx.Request) -> tuple[str, CacheEntry | None]:
+        key = cache_key(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+        return key, entry
+
+    def _finish(self, key: str, entry: CacheEntry | None, response: httpx.Response) -> httpx.Response:
+        if response.status_code == 304 and entry is not None:
+            return self._from_entry(entry, response, "revalidated")
+        if response.status_code != 200:
+            return response
+
+        content = response.content
+        digest = hashlib.sha256(content).hexdigest()
+        if entry is not None and entry.digest == digest:
+            return self._from_entry(entry, response, "unchanged")
+
+        entry = CacheEntry(
+            content=content,
+            headers=list(response.headers.multi_items()),
+            digest=digest,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        self.cache.set(key, entry)
+        response.headers[CACHE_STATUS_HEADER] = "miss"
+        return response
+
+    @staticmethod
+    def _from_entry(entry: CacheEntry, response: httpx.Response, status: str) -> httpx.Response:
+        return response_from_entry(entry, 200, response.extensions, {CACHE_STATUS_HEADER: status})
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self._transport.handle_request(request)
+        key, entry = self._prepare(request)
+        response = self._transport.handle_request(request)
+        response.read()
+        response.close()
+        return self._finish(key, entry, response)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+        key, entry = self._prepare(request)
+        response = await self._transport.handle_async_request(request)
+        await response.aread()
+        await response.aclose()
+        return self._finish(key, entry, response)
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+import httpx
+
+from .breaker import endpoint_group
+
+HEDGED_HEADER = "x-lai-hedged"
+
+
+class LatencyTracker:
+    """Keeps the most recent request durations per endpoint group."""
+
+    def __init__(self, history: int = 200) -> None:
+        self.history = history
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, group: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(group, deque(maxlen=self.history)).append(seconds)
+
+    def quantile(self, group: str, q: float, min_samples: int = 1) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(group, ()))
+        if len(samples) < max(min_samples, 1):
+            return None
+        return samples[min(int(q * len(samples)), len(samples) - 1)]
+
+
+class HedgingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Sends a second, identical GET when the first one is slower than usual and returns whichever answers first.
+
+    The hedge is fired after the ``quantile`` (p95 by default) of the recent latencies of the request's endpoint
+    group, clamped to ``min_delay``/``max_delay``. Until ``min_samples`` latencies are known for a group, or for any
+    other method than GET, requests are sent once. The losing request is cancelled where possible and its response
+    discarded. A response won by the hedge carries an ``x-lai-hedged: true`` header.
+    """
+
+    def __init__(
+        self,
+        transport: Any,
+        quantile: float = 0.95,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        max_delay: float = 5.0,
+        tracker: LatencyTracker | None = None,
+    ) -> None:
+        self._transport = transport
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.tracker = tracker if tracker is not None else LatencyTracker()
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def hedge_delay(self, request: httpx.Request) -> float | None:
+        if request.method != "GET":
+            return None
+        delay = self.tracker.quantile(endpoint_group(request), self.quantile, self.min_samples)
+        if delay is None:
+            return None
+        return min(max(delay, self.min_delay), self.max_delay)
+
+    def _send(self, request: httpx.Request, hedged: bool = False) -> httpx.Response:
+        start = time.monotonic()
+        response = self._transport.handle_request(request)
+        response.read()
+        response.close()
+        self.tracker.record(endpoint_group(request), time.monotonic() - start)
+        if hedged:
+            response.headers[HEDGED_HEADER] = "true"
+        return response
+
+    async def _asend(self, request: httpx.Request, hedged: bool = False) -> httpx.Response:
+        start = time.monotonic()
+        response = await self._transport.handle_async_request(request)
+        await response.aread()
+        await response.aclose()
+        self.tracker.record(endpoint_group(request), time.monotonic() - start)
+        if hedged:
+            response.headers[HEDGED_HEADER] = "true"
+        return response
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="lai-hedge")
+            return self._executor
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.hedge_delay(request)
+        if delay is None:
+            return self._send(request)
+
+        pool = self._pool()
+        pending: set[Future] = {pool.submit(self._send, request)}
+        done, pending = wait(pending, timeout=delay)
+        if not done:
+            pending.add(pool.submit(self._send, request, True))
+        error: BaseException | None = None
+        while True:
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        loser.cancel()
+                    return future.result()
+                error = future.exception()
+            if not pending:
+                raise error
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.hedge_delay(request)
+        if delay is None:
+            return await self._asend(request)
+
+        pending: set[asyncio.Task] = {asyncio.ensure_future(self._asend(request))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                pending.add(asyncio.ensure_future(self._asend(request, True)))
+            error: BaseException | None = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for loser in pending:
+                loser.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
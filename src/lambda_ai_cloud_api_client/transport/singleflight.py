@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+import httpx
+
+from .cache import CacheEntry, cache_key, response_from_entry
+
+COALESCED_HEADER = "x-lai-coalesced"
+
+
+class _Flight:
+    """One GET in progress (or recently finished) that identical requests wait for instead of sending their own."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.waiter: asyncio.Future | None = None
+        self.status_code = 0
+        self.entry: CacheEntry | None = None
+        self.extensions: dict[str, Any] = {}
+        self.error: Exception | None = None
+        self.finished_at: float | None = None
+
+    def finish(self, response: httpx.Response | None, error: Exception | None) -> None:
+        if response is not None:
+            self.status_code = response.status_code
+            self.entry = CacheEntry(content=response.content, headers=list(response.headers.multi_items()), digest="")
+            self.extensions = response.extensions
+        self.error = error
+        self.finished_at = time.monotonic()
+        self.done.set()
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    def fresh(self, reuse_seconds: float) -> bool:
+        return self.finished_at is None or time.monotonic() - self.finished_at < reuse_seconds
+
+    def response(self, coalesced: bool) -> httpx.Response | None:
+        # None when the leading request was cancelled, the caller then sends its own.
+        if self.error is not None:
+            raise self.error
+        if self.entry is None:
+            return None
+        return response_from_entry(
+            self.entry, self.status_code, self.extensions, {COALESCED_HEADER: "true"} if coalesced else None
+        )
+
+
+class SingleFlightTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Lets concurrent identical GET requests share one request to the API.
+
+    The first GET for a url (and credentials) is sent, every identical GET that arrives while it is in flight waits
+    for it and receives a copy of its response; all copies share one decoded JSON body. With ``reuse_seconds`` the
+    finished response is also handed to identical GETs for that long afterwards. Errors are shared the same way.
+    Coalesced responses carry an ``x-lai-coalesced: true`` header.
+    """
+
+    def __init__(self, transport: Any, reuse_seconds: float = 0.0) -> None:
+        self._transport = transport
+        self.reuse_seconds = reuse_seconds
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: str) -> tuple[_Flight, bool]:
+        # Returns the flight for ``key`` and whether the caller leads it, i.e. has to send the request.
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.fresh(self.reuse_seconds):
+                return flight, False
+            # Drop finished flights whose reuse window is over so the table does not grow with every url seen.
+            for stale in [k for k, f in self._flights.items() if not f.fresh(self.reuse_seconds)]:
+                del self._flights[stale]
+            flight = self._flights[key] = _Flight()
+            return flight, True
+
+    def _land(self, key: str, flight: _Flight) -> None:
+        if self.reuse_seconds > 0 and flight.error is None and flight.entry is not None:
+            return
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self._transport.handle_request(request)
+        key = cache_key(request)
+        flight, leader = self._join(key)
+        if not leader:
+            flight.done.wait()
+            response = flight.response(coalesced=True)
+            return response if response is not None else self.handle_request(request)
+
+        response = error = None
+        try:
+            response = self._transport.handle_request(request)
+            response.read()
+            response.close()
+        except Exception as e:
+            error = e
+        finally:
+            flight.finish(response, error)
+            self._land(key, flight)
+        return flight.response(coalesced=False)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._transport.handle_async_request(request)
+        key = cache_key(request)
+        flight, leader = self._join(key)
+        if not leader:
+            if not flight.done.is_set():
+                if flight.waiter is None:
+                    flight.waiter = asyncio.get_running_loop().create_future()
+                await asyncio.shield(flight.waiter)
+            response = flight.response(coalesced=True)
+            return response if response is not None else await self.handle_async_request(request)
+
+        response = error = None
+        try:
+            response = await self._transport.handle_async_request(request)
+            await response.aread()
+            await response.aclose()
+        except Exception as e:
+            error = e
+        finally:
+            flight.finish(response, error)
+            self._land(key, flight)
+        return flight.response(coalesced=False)
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
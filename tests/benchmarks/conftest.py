@@ -0,0 +1,68 @@
+import copy
+import json
+import os
+import sys
+from collections.abc import Callable
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+
+# Payload sizes to benchmark, e.g. LAI_BENCHMARK_SIZES=1000,10000 for a quicker run.
+SIZES = tuple(int(n) for n in os.getenv("LAI_BENCHMARK_SIZES", "1000,10000,100000").split(","))
+STATUSES = ("active", "booting", "unhealthy", "terminating")
+REGIONS = ("us-west-1", "us-east-1", "europe-central-1", "asia-northeast-1")
+
+
+def scale_instances(size: int) -> list[dict]:
+    """``size`` instances made from m_instances_response.json, with unique ids/names and a mix of statuses/regions."""
+    (template,) = json.loads((DATA_FOLDER / "m_instances_response.json").read_text())["data"]
+    instances = []
+    for i, status, region in zip(range(size), cycle(STATUSES), cycle(REGIONS), strict=False):
+        instance = copy.deepcopy(template)
+        instance.update(id=f"{i:032x}", name=f"node-{i:06d}", hostname=f"node-{i:06d}", status=status)
+        instance["ip"] = f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"
+        instance["region"] = {"name": region, "description": region}
+        instances.append(instance)
+    return instances
+
+
+def scale_instance_types(size: int) -> dict[str, dict]:
+    """``size`` instance types made from m_instance_types_response.json, keyed by name like the API does."""
+    templates = list(json.loads((DATA_FOLDER / "m_instance_types_response.json").read_text())["data"].values())
+    instance_types = {}
+    for i, template in enumerate(islice(cycle(templates), size)):
+        item = copy.deepcopy(template)
+        name = item["instance_type"]["name"] = f"{item['instance_type']['name']}_{i}"
+        item["instance_type"]["price_cents_per_hour"] += i % 100
+        instance_types[name] = item
+    return instance_types
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size // 1000}k")
+def size(request: pytest.FixtureRequest) -> int:
+    return request.param
+
+
+@pytest.fixture
+def run(benchmark: Any, size: int) -> Callable[..., Any]:
+    """Benchmark ``fn(*args)``, with fewer rounds for the larger payloads so the suite stays in minutes."""
+
+    def _(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        rounds = max(1, min(20, 20_000 // size))
+        warmup_rounds = 1 if size <= 10_000 else 0
+        return benchmark.pedantic(fn, args=args, kwargs=kwargs, rounds=rounds, warmup_rounds=warmup_rounds)
+
+    return _
+
+
+@pytest.fixture
+def f_devnull_stdout(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Render into /dev/null like `lai ... > file` would, instead of into pytest's capture buffer.
+    with open(os.devnull, "w") as devnull:
+        monkeypatch.setattr(sys, "stdout", devnull)
+        monkeypatch.setenv("COLUMNS", "170")
+        yield
@@ -0,0 +1,119 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lambda_ai_cloud_api_client.mock import MockApiTransport, MockCloud, MockServer
+
+# Wall-clock of whole `lai` processes, from interpreter start to exit, against the mock API. Tune with
+# LAI_BENCHMARK_CLI_ROUNDS (runs per command), LAI_BENCHMARK_CLI_LATENCY_MS (added to every API request) and
+# LAI_BENCHMARK_CLI_INSTANCES (size of the mock fleet).
+ROUNDS = int(os.getenv("LAI_BENCHMARK_CLI_ROUNDS", "20"))
+LATENCY_MS = float(os.getenv("LAI_BENCHMARK_CLI_LATENCY_MS", "20"))
+INSTANCES = int(os.getenv("LAI_BENCHMARK_CLI_INSTANCES", "1000"))
+
+# Runs the console script entry point exactly like the installed `lai` does.
+LAI = (sys.executable, "-c", "from lambda_ai_cloud_api_client.cli.daemon import entrypoint; entrypoint()")
+COMMANDS = {
+    "ls": ("ls",),
+    "types-cheapest-available": ("types", "--cheapest", "--available"),
+    "start-dry-run": ("start", "--dry-run", "--cheapest", "--available", "--ssh-key", "laptop"),
+}
+# Modules that only some commands need, they must not be imported when the CLI starts.
+LAZY_MODULES = ("pyarrow", "opentelemetry", "cProfile", "lambda_ai_cloud_api_client.mock")
+
+_IMPORTTIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(module: str, env: dict[str, str] | None = None) -> dict[str, tuple[int, int]]:
+    """``{module: (self µs, cumulative µs)}`` for every module imported by ``import module``, from ``-X importtime``."""
+    result = subprocess.run(
+        (sys.executable, "-X", "importtime", "-c", f"import {module}"),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if match := _IMPORTTIME.match(line):
+            times[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return times
+
+
+def record_percentiles(benchmark: Any) -> None:
+    data = benchmark.stats.stats.data
+    benchmark.extra_info["p50"] = statistics.median(data)
+    benchmark.extra_info["p95"] = statistics.quantiles(data, n=20)[-1] if len(data) > 1 else data[0]
+
+
+@pytest.fixture(scope="module")
+def mock_api() -> Iterator[str]:
+    transport = MockApiTransport(MockCloud(instances=INSTANCES, capacity=1.0), latency=LATENCY_MS / 1000)
+    with MockServer(transport) as server:
+        yield server.base_url
+
+
+@pytest.fixture
+def lai_env(mock_api: str, tmp_path: Path) -> dict[str, str]:
+    return {
+        **os.environ,
+        "LAMBDA_CLOUD_TOKEN": "mock",
+        "LAMBDA_CLOUD_BASE_URL": mock_api,
+        "LAMBDA_CLOUD_NO_DAEMON": "1",
+        "COLUMNS": "170",
+        # Keep the bytecode of this run apart from the checkout's __pycache__ directories.
+        "PYTHONPYCACHEPREFIX": str(tmp_path / "pycache"),
+    }
+
+
+def _run(args: tuple[str, ...], env: dict[str, str]) -> None:
+    subprocess.run((*LAI, *args), env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+
+
+@pytest.mark.parametrize("command", COMMANDS, ids=str)
+def test_cli_command(benchmark, lai_env, command):
+    args = COMMANDS[command]
+    benchmark.pedantic(_run, args=(args, lai_env), rounds=ROUNDS, warmup_rounds=1)
+    record_percentiles(benchmark)
+
+
+def test_cli_startup_warm(benchmark, lai_env):
+    benchmark.pedantic(_run, args=(("--help",), lai_env), rounds=ROUNDS, warmup_rounds=1)
+    record_percentiles(benchmark)
+
+
+def test_cli_startup_cold(benchmark, lai_env, tmp_path):
+    # Every round starts with an empty bytecode cache, like the first run after installing or upgrading.
+    rounds = iter(range(ROUNDS))
+
+    def setup() -> tuple[tuple, dict]:
+        return (("--help",), {**lai_env, "PYTHONPYCACHEPREFIX": str(tmp_path / f"cold-{next(rounds)}")}), {}
+
+    benchmark.pedantic(_run, setup=setup, rounds=ROUNDS)
+    record_percentiles(benchmark)
+
+
+def test_cli_import_time(benchmark, lai_env):
+    import_times("lambda_ai_cloud_api_client.__main__", env=lai_env)  # warm the bytecode cache
+
+    def measure() -> dict[str, tuple[int, int]]:
+        return import_times("lambda_ai_cloud_api_client.__main__", env=lai_env)
+
+    times = benchmark.pedantic(measure, rounds=min(ROUNDS, 5))
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:15]
+    benchmark.extra_info["import_seconds"] = times["lambda_ai_cloud_api_client.__main__"][1] / 1e6
+    benchmark.extra_info["slowest_modules_self_seconds"] = {name: t[0] / 1e6 for name, t in slowest}
+
+
+def test_cli_startup_does_not_import_optional_modules():
+    times = import_times("lambda_ai_cloud_api_client.__main__")
+
+    assert "lambda_ai_cloud_api_client.__main__" in times
+    assert [m for m in times if m.startswith(LAZY_MODULES)] == []
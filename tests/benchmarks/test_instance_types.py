@@ -0,0 +1,75 @@
+import pytest
+
+from lambda_ai_cloud_api_client.cli.type_index import InstanceTypeIndex, parse_type_query
+from lambda_ai_cloud_api_client.cli.types import filter_instance_types, render_types_table
+from lambda_ai_cloud_api_client.models import InstanceTypes, InstanceTypesItem
+
+from .conftest import scale_instance_types
+
+NO_FILTERS = dict(
+    instance_type=None,
+    available=False,
+    cheapest=False,
+    region=(),
+    gpu=(),
+    min_gpus=None,
+    min_vcpus=None,
+    min_memory=None,
+    min_storage=None,
+    max_price=None,
+)
+
+
+@pytest.fixture
+def payload(size: int) -> dict[str, dict]:
+    return scale_instance_types(size)
+
+
+@pytest.fixture
+def instance_types(payload: dict[str, dict]) -> list[InstanceTypesItem]:
+    return list(InstanceTypes.from_dict(payload).additional_properties.values())
+
+
+def test_instance_types_from_dict(run, payload):
+    parsed = run(InstanceTypes.from_dict, payload)
+    assert len(parsed.additional_properties) == len(payload)
+
+
+def test_instance_types_to_dict(run, payload):
+    parsed = InstanceTypes.from_dict(payload)
+    assert len(run(parsed.to_dict)) == len(payload)
+
+
+def test_filter_instance_types(run, instance_types):
+    filters = {**NO_FILTERS, "available": True, "gpu": ("H100", "A100"), "min_gpus": 2, "max_price": 30}
+    filtered = run(filter_instance_types, instance_types, **filters)
+    assert filtered
+
+
+def test_filter_instance_types_cheapest(run, instance_types):
+    (cheapest,) = run(filter_instance_types, instance_types, **{**NO_FILTERS, "cheapest": True})
+    assert cheapest.instance_type.price_cents_per_hour == min(
+        i.instance_type.price_cents_per_hour for i in instance_types
+    )
+
+
+@pytest.mark.usefixtures("f_devnull_stdout")
+def test_render_types_table(run, instance_types):
+    run(render_types_table, instance_types)
+
+
+SELECT_QUERY = "gpus >= 8 and gpu = H100 and region in (us-east-1, us-west-1) and price <= 30"
+
+
+def test_select_instance_types_cold(run, instance_types):
+    # The first query also builds the tables of the fields it uses.
+    conditions = parse_type_query(SELECT_QUERY)
+    run(lambda: InstanceTypeIndex(instance_types).select(conditions))
+
+
+def test_select_instance_types(run, instance_types):
+    # A capacity-hunting loop: the same list is queried repeatedly.
+    index = InstanceTypeIndex(instance_types)
+    conditions = parse_type_query(SELECT_QUERY)
+    index.select(conditions)
+    run(index.select, conditions)
@@ -0,0 +1,78 @@
+import json
+import time
+
+import pytest
+
+from lambda_ai_cloud_api_client.cli.client import raw_data_json
+from lambda_ai_cloud_api_client.cli.ls import filter_instances, render_instances_table
+from lambda_ai_cloud_api_client.cli.response import print_json
+from lambda_ai_cloud_api_client.models import Instance
+
+from .conftest import scale_instances
+
+
+@pytest.fixture
+def payload(size: int) -> list[dict]:
+    return scale_instances(size)
+
+
+@pytest.fixture
+def instances(payload: list[dict]) -> list[Instance]:
+    return [Instance.from_dict(d) for d in payload]
+
+
+def test_instances_from_dict(run, payload):
+    parsed = run(lambda: [Instance.from_dict(d) for d in payload])
+    assert len(parsed) == len(payload)
+
+
+def test_instances_to_dict(run, instances):
+    dicts = run(lambda: [i.to_dict() for i in instances])
+    assert len(dicts) == len(instances)
+
+
+def test_filter_instances(run, instances):
+    filtered = run(filter_instances, instances, region=("us-west-1", "us-east-1"), status=("active",))
+    assert filtered
+    assert all(i.status == "active" for i in filtered)
+
+
+@pytest.mark.usefixtures("f_devnull_stdout")
+def test_render_instances_table(run, instances):
+    run(render_instances_table, instances)
+
+
+@pytest.mark.usefixtures("f_devnull_stdout")
+def test_print_json(run, payload):
+    run(print_json, payload)
+
+
+@pytest.fixture
+def body(payload: list[dict]) -> bytes:
+    return json.dumps({"data": payload}).encode()
+
+
+def test_raw_data_json(run, body):
+    assert json.loads(run(raw_data_json, body))
+
+
+def test_models_data_json(run, body):
+    # What unfiltered --json did before it skipped the models, for comparison with test_raw_data_json.
+    run(lambda: json.dumps([Instance.from_dict(d).to_dict() for d in json.loads(body)["data"]]).encode())
+
+
+def test_raw_data_json_beats_models():
+    # Guards the point of the --json passthrough without the benchmark plugin: it must stay well ahead of the models.
+    body = json.dumps({"data": scale_instances(2000)}).encode()
+
+    def best_of(fn) -> float:
+        timings = []
+        for _ in range(3):
+            started = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    raw = best_of(lambda: raw_data_json(body))
+    models = best_of(lambda: [Instance.from_dict(d).to_dict() for d in json.loads(body)["data"]])
+    assert raw * 2 < models
@@ -9,12 +9,21 @@ import pytest
 from click.testing import CliRunner, Result
 
 from lambda_ai_cloud_api_client import __main__ as cli
-from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL, auth_client, instrumentation, validator_cache
+from lambda_ai_cloud_api_client.cli.timings import timings_collector
 
 DATA_FOLDER = Path(__file__).parent.parent / "data"
 UPDATE_EXPECTED_DATA = os.environ.get("UPDATE_EXPECTED_DATA", "false").lower() == "true"
 
 
+@pytest.fixture(autouse=True)
+def f_fresh_client():
+    # The client, its caches, circuit breakers and instrumentation hooks live for the whole process, start every test
+    # with new ones.
+    for cached in (auth_client, validator_cache, instrumentation, timings_collector):
+        cached.cache_clear()
+
+
 @pytest.fixture
 def f_cli_runner() -> CliRunner:
     return CliRunner()
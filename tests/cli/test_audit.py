@@ -0,0 +1,199 @@
+import io
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from click.testing import Result
+from rich.console import Console
+
+from lambda_ai_cloud_api_client import __main__ as cli
+from lambda_ai_cloud_api_client.cli.audit import build_audit_events_table
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+AUDIT_EVENTS_URL = f"{DEFAULT_BASE_URL}/api/v1/audit-events"
+
+
+@pytest.fixture
+def m_pages() -> list[dict]:
+    return [json.loads((DATA_FOLDER / f"m_audit_events_page_{i}.json").read_text()) for i in (1, 2)]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    (
+        {},
+        {"output": "ndjson"},
+        {"output": "csv"},
+    ),
+    ids=(
+        "",
+        "ndjson",
+        "csv",
+    ),
+)
+def test_audit(
+    request,
+    httpx_mock,
+    m_pages: list[dict],
+    kwargs: dict[str, str],
+    c_assert_cmd_kwargs_result_equals: Callable[[list[str], dict[str, str], Path], Result],
+) -> None:
+    # Arrange
+    param_id = request.node.callspec.id
+    first, second = m_pages
+    httpx_mock.add_response(method="GET", url=AUDIT_EVENTS_URL, json=first)
+    httpx_mock.add_response(
+        method="GET", url=f"{AUDIT_EVENTS_URL}?page_token={first['data']['page_token']}", json=second
+    )
+    # Act & Assert
+    suffix = f"_{param_id}" if param_id else ""
+    c_assert_cmd_kwargs_result_equals(["audit"], kwargs, DATA_FOLDER / f"expected_audit_output{suffix}.txt")
+
+
+def test_audit_filtered_empty(
+    httpx_mock, c_assert_cmd_results_equals: Callable[[list[str], Path, int], Result]
+) -> None:
+    # Arrange
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{AUDIT_EVENTS_URL}?start=2025-10-01T00%3A00%3A00%2B00%3A00&resource_type=cloud.instance",
+        json={"data": {"events": [], "page_token": None}},
+    )
+    # Act & Assert
+    c_assert_cmd_results_equals(
+        ["audit", "--start", "2025-10-01", "--resource-type", "cloud.instance"],
+        DATA_FOLDER / "expected_audit_output_empty.txt",
+    )
+
+
+def test_audit_error(httpx_mock, c_assert_cmd_results_equals: Callable[[list[str], Path, int], Result]) -> None:
+    # Arrange
+    httpx_mock.add_response(method="GET", url=AUDIT_EVENTS_URL, status_code=500, json={})
+    # Act & Assert
+    c_assert_cmd_results_equals(["audit"], DATA_FOLDER / "expected_audit_output_error.txt", 2)
+
+
+def test_audit_workers(httpx_mock, m_pages: list[dict], c_assert_cmd_results_equals) -> None:
+    # Arrange
+    first, second = m_pages
+    for shard_start, shard_end, page in (("2025-10-01", "2025-10-15", first), ("2025-10-15", "2025-10-29", second)):
+        page = {"data": {**page["data"], "page_token": None}}
+        httpx_mock.add_response(
+            method="GET",
+            url=f"{AUDIT_EVENTS_URL}?start={shard_start}T00%3A00%3A00%2B00%3A00&end={shard_end}T00%3A00%3A00%2B00%3A00",
+            json=page,
+        )
+    # Act & Assert
+    c_assert_cmd_results_equals(
+        ["audit", "--start", "2025-10-01", "--end", "2025-10-29", "--workers", "2", "--shard-hours", "336"],
+        DATA_FOLDER / "expected_audit_output.txt",
+    )
+
+
+def test_audit_workers_without_start(c_assert_cmd_results_equals) -> None:
+    c_assert_cmd_results_equals(["audit", "--workers", "4"], DATA_FOLDER / "expected_audit_output_workers-error.txt", 2)
+
+
+@pytest.fixture
+def f_audit_db(httpx_mock, m_pages: list[dict], monkeypatch, tmp_path, f_cli_runner) -> None:
+    monkeypatch.chdir(tmp_path)
+    first, second = m_pages
+    httpx_mock.add_response(method="GET", url=AUDIT_EVENTS_URL, json=first)
+    httpx_mock.add_response(
+        method="GET", url=f"{AUDIT_EVENTS_URL}?page_token={first['data']['page_token']}", json=second
+    )
+    result = f_cli_runner.invoke(cli.main, ["audit", "sync", "--db", "audit.sqlite"])
+    assert result.output == "Synced 3 new audit events (3 stored).\n"
+
+
+def test_audit_sync_resumes_from_checkpoint(
+    httpx_mock, m_pages: list[dict], f_audit_db, c_assert_cmd_results_equals
+) -> None:
+    # Arrange
+    last = {"data": {**m_pages[1]["data"], "page_token": None}}
+    httpx_mock.add_response(method="GET", url=f"{AUDIT_EVENTS_URL}?start=2025-10-22T00%3A00%3A00%2B00%3A00", json=last)
+    # Act & Assert
+    c_assert_cmd_results_equals(
+        ["audit", "sync", "--db", "audit.sqlite"], DATA_FOLDER / "expected_audit_sync_output.txt"
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    (
+        {},
+        {"action": "launched"},
+        {"since": "2025-10-10", "output": "ndjson"},
+    ),
+    ids=(
+        "",
+        "action",
+        "since-ndjson",
+    ),
+)
+def test_audit_query(
+    request,
+    f_audit_db,
+    kwargs: dict[str, str],
+    c_assert_cmd_kwargs_result_equals: Callable[[list[str], dict[str, str], Path], Result],
+) -> None:
+    # Act & Assert, without any API call
+    param_id = request.node.callspec.id
+    suffix = f"_{param_id}" if param_id else ""
+    c_assert_cmd_kwargs_result_equals(
+        ["audit", "query", "--db", "audit.sqlite"], kwargs, DATA_FOLDER / f"expected_audit_query_output{suffix}.txt"
+    )
+
+
+def test_audit_query_without_store(monkeypatch, tmp_path, c_assert_cmd_results_equals) -> None:
+    monkeypatch.chdir(tmp_path)
+    c_assert_cmd_results_equals(
+        ["audit", "query", "--db", "audit.sqlite"], DATA_FOLDER / "expected_audit_query_output_no-store.txt", 2
+    )
+
+
+def test_audit_archive_and_scan(
+    httpx_mock, m_pages: list[dict], monkeypatch, tmp_path, c_assert_cmd_results_equals
+) -> None:
+    # Arrange
+    pytest.importorskip("pyarrow")
+    monkeypatch.chdir(tmp_path)
+    first, second = m_pages
+    httpx_mock.add_response(method="GET", url=AUDIT_EVENTS_URL, json=first)
+    httpx_mock.add_response(
+        method="GET", url=f"{AUDIT_EVENTS_URL}?page_token={first['data']['page_token']}", json=second
+    )
+    # Act & Assert
+    c_assert_cmd_results_equals(["audit", "archive", "archive"], DATA_FOLDER / "expected_audit_archive_output.txt")
+    c_assert_cmd_results_equals(
+        ["audit", "scan", "archive", "--since", "2025-10-10"], DATA_FOLDER / "expected_audit_scan_output.txt"
+    )
+
+
+def test_audit_scan_without_archive(monkeypatch, tmp_path, c_assert_cmd_results_equals) -> None:
+    monkeypatch.chdir(tmp_path)
+    c_assert_cmd_results_equals(
+        ["audit", "scan", "archive"], DATA_FOLDER / "expected_audit_scan_output_no-archive.txt", 2
+    )
+
+
+@pytest.mark.parametrize("width", (80, 120))
+def test_audit_table_truncates_only_lrns(width: int) -> None:
+    row = (
+        "2025-10-22T00:00:00Z",
+        "cloud",
+        "firewall_ruleset",
+        "created",
+        "lrn:cloud:identity:59b44e92effddeeaa842bc19796f74ad",
+        "lrn:cloud:firewall_ruleset:5810d2a4a3e44d4d9ad6b0dc4d8d8d8b",
+    )
+    console = Console(width=width, file=io.StringIO())
+    console.print(build_audit_events_table([row]))
+
+    header, line = console.file.getvalue().splitlines()
+    assert header.split() == ["Time", "Service", "Resource", "Action", "Actor", "Resources"]
+    assert line.split()[:4] == list(row[:4])
+    assert line.rstrip().endswith("…")
+    assert len(line) <= width
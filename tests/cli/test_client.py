@@ -0,0 +1,76 @@
+import httpx
+import pytest
+
+from lambda_ai_cloud_api_client.cli.client import (
+    _http2_enabled,
+    _limits,
+    _resilience_wrappers,
+    _timeout,
+    auth_client,
+    instrumentation,
+    raw_data_json,
+)
+from lambda_ai_cloud_api_client.instrumentation import REQUEST_END
+from lambda_ai_cloud_api_client.transport import CircuitBreakerTransport, HedgingTransport
+
+
+def test_pool_and_timeouts_from_env(monkeypatch) -> None:
+    monkeypatch.setenv("LAMBDA_CLOUD_MAX_CONNECTIONS", "8")
+    monkeypatch.setenv("LAMBDA_CLOUD_KEEPALIVE_EXPIRY", "60")
+    monkeypatch.setenv("LAMBDA_CLOUD_CONNECT_TIMEOUT", "2.5")
+    monkeypatch.setenv("LAMBDA_CLOUD_POOL_TIMEOUT", "1")
+
+    assert _limits() == httpx.Limits(max_connections=8, max_keepalive_connections=20, keepalive_expiry=60.0)
+    assert _timeout() == httpx.Timeout(None, connect=2.5, pool=1.0)
+
+
+def test_defaults_without_env() -> None:
+    assert _limits() == httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0)
+    assert _timeout() is None
+
+
+def test_invalid_env_number(monkeypatch) -> None:
+    monkeypatch.setenv("LAMBDA_CLOUD_READ_TIMEOUT", "soon")
+    with pytest.raises(RuntimeError, match="LAMBDA_CLOUD_READ_TIMEOUT"):
+        _timeout()
+
+
+@pytest.mark.parametrize(("value", "expected"), (("0", False), ("false", False), ("1", True), ("true", True)))
+def test_http2_env(monkeypatch, value: str, expected: bool) -> None:
+    monkeypatch.setenv("LAMBDA_CLOUD_HTTP2", value)
+    assert _http2_enabled() is expected
+
+
+def test_resilience_wrappers_env(monkeypatch) -> None:
+    network = httpx.MockTransport(lambda request: httpx.Response(200))
+    (breaker,) = _resilience_wrappers()
+    assert breaker(network).breaker.failure_threshold == 5
+
+    monkeypatch.setenv("LAMBDA_CLOUD_HEDGE_GETS", "1")
+    monkeypatch.setenv("LAMBDA_CLOUD_BREAKER_THRESHOLD", "0")
+    assert [type(w(network)) for w in _resilience_wrappers()] == [HedgingTransport]
+
+    monkeypatch.setenv("LAMBDA_CLOUD_BREAKER_THRESHOLD", "2")
+    assert [type(w(network)) for w in _resilience_wrappers()] == [HedgingTransport, CircuitBreakerTransport]
+
+
+@pytest.mark.parametrize(
+    ("content", "expected"),
+    (
+        (b'{"data": [{"name": "a]}\\"b"}, [1]]}\n', b'[{"name": "a]}\\"b"}, [1]]'),
+        (b' { "data" : [ ] } ', b"[ ]"),
+        (b'{"data": [1], "next": [2]}', b"[1]"),
+        (b'{"data": {"gpu_1x_a10": {}}}', b'{"gpu_1x_a10": {}}'),
+    ),
+)
+def test_raw_data_json(content: bytes, expected: bytes) -> None:
+    assert raw_data_json(content) == expected
+
+
+def test_auth_client_wraps_transport_only_with_hooks() -> None:
+    assert auth_client()._instrumentation is None
+    auth_client.cache_clear()
+
+    instrumentation().on(REQUEST_END, lambda event: None)
+
+    assert auth_client()._instrumentation is instrumentation()
@@ -0,0 +1,117 @@
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from click.testing import Result
+
+from lambda_ai_cloud_api_client import __main__ as cli
+from lambda_ai_cloud_api_client.cli import cost
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+INSTANCES_URL = f"{DEFAULT_BASE_URL}/api/v1/instances"
+T0 = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def m_instances() -> dict:
+    return json.loads((DATA_FOLDER / "m_instances_response.json").read_text())
+
+
+@pytest.fixture
+def f_cost_db(httpx_mock, m_instances: dict, monkeypatch, tmp_path, f_cli_runner) -> None:
+    # Two samples of the $35.92/hr instance, two hours apart.
+    monkeypatch.chdir(tmp_path)
+    httpx_mock.add_response(method="GET", url=INSTANCES_URL, json=m_instances)
+    httpx_mock.add_response(method="GET", url=INSTANCES_URL, json=m_instances)
+    for hours in (0, 2):
+        monkeypatch.setattr(cost, "_now", lambda hours=hours: T0 + timedelta(hours=hours))
+        result = f_cli_runner.invoke(cli.main, ["cost", "sample", "--db", "cost.sqlite"])
+        assert result.exit_code == 0, result.output
+    assert result.output == "2025-11-01 02:00:00 1 billed instances, $35.92/hr, $71.84 so far.\n"
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    (
+        {},
+        {"by": "tag:key1"},
+        {"by": "type", "output": "csv"},
+    ),
+    ids=(
+        "",
+        "tag",
+        "type-csv",
+    ),
+)
+def test_cost(
+    request,
+    f_cost_db,
+    kwargs: dict[str, str],
+    c_assert_cmd_kwargs_result_equals: Callable[[list[str], dict[str, str], Path], Result],
+) -> None:
+    # Act & Assert, without any API call
+    param_id = request.node.callspec.id
+    suffix = f"_{param_id}" if param_id else ""
+    c_assert_cmd_kwargs_result_equals(
+        ["cost", "--db", "cost.sqlite"], kwargs, DATA_FOLDER / f"expected_cost_output{suffix}.txt"
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        [],
+        ["--budget", "key1=value1:50"],
+        ["--budget", "key1=value1:100", "--terminate"],
+    ),
+    ids=("", "exceeded", "within"),
+)
+def test_cost_enforce(
+    request, f_cost_db, args: list[str], c_assert_cmd_results_equals: Callable[[list[str], Path, int], Result]
+) -> None:
+    # Act & Assert
+    param_id = request.node.callspec.id
+    suffix = f"_{param_id}" if param_id else ""
+    c_assert_cmd_results_equals(
+        ["cost", "enforce", "--db", "cost.sqlite", *args], DATA_FOLDER / f"expected_cost_enforce_output{suffix}.txt"
+    )
+
+
+def test_cost_enforce_terminates_in_one_call(httpx_mock, f_cost_db, c_assert_cmd_results_equals) -> None:
+    # Arrange
+    httpx_mock.add_response(
+        method="POST",
+        url=f"{DEFAULT_BASE_URL}/api/v1/instance-operations/terminate",
+        match_json={"instance_ids": ["0920582c7ff041399e34823a0be62549"]},
+        json=json.loads((DATA_FOLDER / "m_stop_response.json").read_text()),
+    )
+    # Act & Assert
+    c_assert_cmd_results_equals(
+        ["cost", "enforce", "--db", "cost.sqlite", "--budget", "key1=value1:50", "--terminate"],
+        DATA_FOLDER / "expected_cost_enforce_output_terminate.txt",
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        ["cost", "--db", "missing.sqlite"],
+        ["cost", "--by", "owner"],
+        ["cost", "sample", "--budget", "research:50"],
+    ),
+    ids=("no-store", "invalid-group", "invalid-budget"),
+)
+def test_cost_errors(
+    request,
+    monkeypatch,
+    tmp_path,
+    args: list[str],
+    c_assert_cmd_results_equals: Callable[[list[str], Path, int], Result],
+) -> None:
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    # Act & Assert
+    c_assert_cmd_results_equals(args, DATA_FOLDER / f"expected_cost_output_{request.node.callspec.id}.txt", 2)
@@ -0,0 +1,133 @@
+import json
+import tempfile
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from lambda_ai_cloud_api_client.cli import daemon
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.daemon_server import _DaemonServer, daemon_pid, run_command, serve
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def m_daemon(monkeypatch) -> Iterator[Path]:
+    # Unix socket paths are limited to ~100 characters, pytest's tmp_path can be longer than that.
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        path = Path(tmp) / "d.sock"
+        monkeypatch.setenv(daemon.SOCKET_ENV_VAR, str(path))
+        server = _DaemonServer(path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield path
+        server.shutdown()
+        server.server_close()
+
+
+def test_forward_runs_command_in_daemon(httpx_mock, m_daemon: Path, capsysbinary) -> None:
+    m_response = json.loads((DATA_FOLDER / "m_ssh_keys_response.json").read_text())
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/ssh-keys", json=m_response)
+
+    exit_code = daemon.forward(["keys", "--json"])
+
+    assert exit_code == 0
+    assert json.loads(capsysbinary.readouterr().out) == m_response["data"]
+
+
+def test_forward_skips_local_only_commands(m_daemon: Path) -> None:
+    assert daemon.forward(["ssh", "my-instance"]) is None
+    assert daemon.forward(["ls", "--watch"]) is None
+
+
+def test_forward_falls_back_without_daemon(monkeypatch) -> None:
+    monkeypatch.setenv(daemon.SOCKET_ENV_VAR, "/tmp/does-not-exist/d.sock")
+    assert daemon.forward(["ls"]) is None
+    assert daemon_pid() is None
+
+
+def test_forward_refuses_other_token(m_daemon: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LAMBDA_API_TOKEN", "someone-elses-token")
+    assert daemon.forward(["ls"]) is None
+
+
+def test_socket_path_prefers_xdg_runtime_dir(monkeypatch) -> None:
+    monkeypatch.delenv(daemon.SOCKET_ENV_VAR, raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", "/run/user/1000")
+    assert daemon.socket_path() == Path("/run/user/1000/lai/daemon.sock")
+
+
+def test_forward_refuses_unsafe_socket_dir(m_daemon: Path, capsys) -> None:
+    m_daemon.parent.chmod(0o755)
+    assert daemon.forward(["keys"]) is None
+    assert "has mode 755, not 700" in capsys.readouterr().err
+    assert daemon_pid() is None
+
+
+def test_serve_refuses_symlinked_socket_dir(monkeypatch) -> None:
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:
+        (Path(tmp) / "real").mkdir(mode=0o700)
+        (Path(tmp) / "link").symlink_to(Path(tmp) / "real")
+        monkeypatch.setenv(daemon.SOCKET_ENV_VAR, f"{tmp}/link/d.sock")
+        with pytest.raises(RuntimeError, match="link is a symlink"):
+            serve()
+
+
+def test_forward_reports_crashes(m_daemon: Path, monkeypatch, capsysbinary) -> None:
+    def _crash(*_args, **_kwargs):
+        raise ValueError("boom")
+
+    monkeypatch.setattr("lambda_ai_cloud_api_client.__main__.list_keys", _crash)
+
+    exit_code = daemon.forward(["keys", "--name", "laptop"])
+
+    assert exit_code == 1
+    stderr = capsysbinary.readouterr().err.decode()
+    assert "Traceback" in stderr and "ValueError: boom" in stderr
+
+
+def test_run_command_honours_callers_terminal(httpx_mock) -> None:
+    m_response = json.loads((DATA_FOLDER / "m_ssh_keys_response.json").read_text())
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/ssh-keys", json=m_response)
+
+    exit_code, stdout, _ = run_command(["keys", "--json"], {"TERM": "xterm-256color"}, isatty=True)
+
+    # Highlighted like print_json does for a terminal.
+    assert exit_code == 0
+    assert b"\x1b[" in stdout
+    # Usage errors keep click's exit code and message.
+    assert run_command(["keys", "--json", "--output", "csv"], {}, isatty=False)[::2] == (
+        2,
+        b"Usage: lai keys [OPTIONS]\nTry 'lai keys --help' for help.\n\nError: --json conflicts with --output csv.\n",
+    )
+
+
+def test_run_command_in_callers_cwd(monkeypatch, tmp_path: Path) -> None:
+    cwds = []
+
+    def _list_keys():
+        cwds.append(Path.cwd())
+        return []
+
+    monkeypatch.setattr("lambda_ai_cloud_api_client.__main__.list_keys", _list_keys)
+    cwd = Path.cwd()
+
+    assert run_command(["keys"], {}, isatty=False, cwd=str(tmp_path))[0] == 0
+    assert cwds == [tmp_path]
+    assert Path.cwd() == cwd
+
+
+def test_forward_sends_cwd(monkeypatch, m_daemon: Path, tmp_path: Path) -> None:
+    messages = []
+
+    def _request(message):
+        messages.append(message)
+        return {"exit_code": 0}, b"", b""
+
+    monkeypatch.setattr(daemon, "request", _request)
+    monkeypatch.chdir(tmp_path)
+
+    assert daemon.forward(["keys"]) == 0
+    assert messages[0]["cwd"] == str(tmp_path)
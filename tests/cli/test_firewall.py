@@ -0,0 +1,158 @@
+import json
+from collections.abc import Callable
+from ipaddress import IPv4Network
+from pathlib import Path
+
+import pytest
+from click.testing import Result
+
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.firewall import Rule, aggregate_rules, diff_rules, load_firewall_spec
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+RULES_URL = f"{DEFAULT_BASE_URL}/api/v1/firewall-rules"
+RULESETS_URL = f"{DEFAULT_BASE_URL}/api/v1/firewall-rulesets"
+RULESET_ID = "c4d291f47f9d436fa39f58493ce3b50d"
+SPEC = {
+    "rules": [
+        {"protocol": "tcp", "port_range": 22, "source_network": ["203.0.113.0/25", "203.0.113.128/25"]},
+        {"protocol": "tcp", "port_range": "23-80", "source_network": "203.0.113.0/24", "description": "web"},
+        {"protocol": "tcp", "port_range": [443, 443], "source_network": "203.0.113.7", "description": "https"},
+        {"protocol": "icmp", "source_network": "0.0.0.0/0"},
+    ],
+    "global": [{"protocol": "tcp", "port_range": [22, 22], "source_network": "0.0.0.0/0", "description": "SSH"}],
+    "rulesets": {"training": [{"protocol": "udp", "port_range": "8000-8100", "source_network": "198.51.100.0/24"}]},
+}
+ICMP = {"protocol": "icmp", "source_network": "0.0.0.0/0", "description": ""}
+
+
+def _rule(protocol: str, network: str, ports: tuple[int, int] | None, description: str = "") -> Rule:
+    return Rule(protocol, IPv4Network(network), ports, description)
+
+
+def test_aggregate_rules() -> None:
+    # Arrange
+    rules = [
+        _rule("tcp", "10.0.0.0/25", (22, 22), "a"),
+        _rule("tcp", "10.0.0.128/25", (22, 22), "b"),
+        _rule("tcp", "10.0.0.0/24", (23, 80)),
+        _rule("tcp", "10.0.0.7/32", (30, 40), "covered"),
+        _rule("udp", "10.0.0.0/24", (22, 22)),
+        _rule("icmp", "192.0.2.4/32", None),
+        _rule("icmp", "192.0.2.5/32", None),
+        _rule("icmp", "192.0.2.5/32", None),
+    ]
+    # Act
+    aggregated = aggregate_rules(rules)
+    # Assert: the halves collapse into the /24 whose adjacent port ranges then merge, swallowing the covered rule
+    assert aggregated == [
+        _rule("icmp", "192.0.2.4/31", None),
+        _rule("tcp", "10.0.0.0/24", (22, 80), "a; b"),
+        _rule("udp", "10.0.0.0/24", (22, 22)),
+    ]
+    assert aggregate_rules(reversed(aggregated)) == aggregated
+
+
+def test_diff_rules() -> None:
+    ssh, web = _rule("tcp", "0.0.0.0/0", (22, 22)), _rule("tcp", "0.0.0.0/0", (80, 80))
+    assert diff_rules([web, ssh], [ssh, web]) == ((), ())
+    assert diff_rules([ssh, ssh], [ssh, web]) == ((web,), (ssh,))
+
+
+@pytest.mark.parametrize(
+    "spec, error",
+    (
+        ({"firewall": []}, "it needs at least one of rules, global, rulesets"),
+        ({"rules": [], "other": []}, "unknown sections other"),
+        ({"rules": [{"protocol": "sctp", "source_network": "0.0.0.0/0"}]}, r"rules\[0\]: protocol must be one of"),
+        ({"rules": [{"protocol": "tcp", "source_network": "0.0.0.0/0"}]}, r"rules\[0\]: tcp rules need a port_range"),
+        (
+            {"global": [{"protocol": "icmp", "port_range": 1, "source_network": "0.0.0.0/0"}]},
+            r"global\[0\]: icmp rules take no",
+        ),
+        (
+            {"rules": [{"protocol": "udp", "port_range": "90-80", "source_network": "0.0.0.0/0"}]},
+            r"rules\[0\]: invalid port_range 90-80",
+        ),
+        (
+            {"rules": [{"protocol": "tcp", "port_range": 22, "source_network": "::/0"}]},
+            r"rules\[0\]: '::/0' is not an IPv4 network",
+        ),
+        ({"rulesets": {"training": [{"protocol": "tcp", "port_range": 22}]}}, r"rulesets.training\[0\] needs a source"),
+    ),
+)
+def test_load_firewall_spec_errors(tmp_path: Path, spec: dict, error: str) -> None:
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(spec))
+    with pytest.raises(RuntimeError, match=f"Invalid firewall spec {path}: {error}"):
+        load_firewall_spec(path)
+
+
+@pytest.fixture
+def m_firewall(httpx_mock) -> None:
+    """The account has an SSH rule and the icmp rule, the global ruleset already matches the spec."""
+    rules = [{"protocol": "tcp", "port_range": [22, 22], "source_network": "0.0.0.0/0", "description": "SSH"}]
+    httpx_mock.add_response(method="GET", url=RULES_URL, json={"data": [*rules, ICMP]})
+    httpx_mock.add_response(
+        method="GET",
+        url=f"{RULESETS_URL}/global",
+        json={"data": {"id": "global", "name": "Global Firewall Rules", "rules": rules}},
+    )
+    ruleset = {
+        "id": RULESET_ID,
+        "name": "training",
+        "region": {"name": "us-west-1", "description": "California, USA"},
+        "rules": [],
+        "created": "2025-11-01T00:00:00Z",
+        "instance_ids": [],
+    }
+    httpx_mock.add_response(method="GET", url=RULESETS_URL, json={"data": [ruleset]})
+
+
+@pytest.mark.parametrize("args", ([], ["--dry-run"]), ids=("", "dry-run"))
+def test_firewall_apply(
+    request,
+    httpx_mock,
+    m_firewall,
+    tmp_path: Path,
+    args: list[str],
+    c_assert_cmd_results_equals: Callable[[list[str], Path], Result],
+) -> None:
+    # Arrange
+    spec = tmp_path / "rules.json"
+    spec.write_text(json.dumps(SPEC))
+    if not args:
+        # Only the two lists that changed are written, with the rules aggregated.
+        rules = [
+            ICMP,
+            {"protocol": "tcp", "port_range": [22, 80], "source_network": "203.0.113.0/24", "description": "web"},
+            {"protocol": "tcp", "port_range": [443, 443], "source_network": "203.0.113.7/32", "description": "https"},
+        ]
+        httpx_mock.add_response(method="PUT", url=RULES_URL, match_json={"data": rules}, json={"data": rules})
+        ruleset_rules = [
+            {"protocol": "udp", "port_range": [8000, 8100], "source_network": "198.51.100.0/24", "description": ""}
+        ]
+        httpx_mock.add_response(
+            method="PATCH",
+            url=f"{RULESETS_URL}/{RULESET_ID}",
+            match_json={"rules": ruleset_rules},
+            json={"data": {}},
+        )
+    # Act & Assert
+    suffix = f"_{request.node.callspec.id}" if args else ""
+    c_assert_cmd_results_equals(
+        ["firewall", "apply", str(spec), *args], DATA_FOLDER / f"expected_firewall_apply_output{suffix}.txt"
+    )
+
+
+def test_firewall_apply_no_changes(
+    httpx_mock, tmp_path: Path, c_assert_cmd_results_equals: Callable[[list[str], Path], Result]
+) -> None:
+    # Arrange: the same rules in another order and split differently, only the rules are listed
+    spec = tmp_path / "rules.json"
+    spec.write_text(json.dumps({"rules": [{**ICMP, "source_network": ["0.0.0.0/1", "128.0.0.0/1"]}]}))
+    httpx_mock.add_response(method="GET", url=RULES_URL, json={"data": [ICMP]})
+    # Act & Assert, no PUT
+    c_assert_cmd_results_equals(
+        ["firewall", "apply", str(spec)], DATA_FOLDER / "expected_firewall_apply_output_no-changes.txt"
+    )
@@ -0,0 +1,214 @@
+import copy
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from click.testing import Result
+
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.fleet import FleetChange, FleetGroup, FleetSpec, load_fleet_spec, plan_fleet
+from lambda_ai_cloud_api_client.models import Instance, InstanceTypesItem
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+INSTANCES_URL = f"{DEFAULT_BASE_URL}/api/v1/instances"
+ID = "0920582c7ff041399e34823a0be62549"
+SPEC = {
+    "name": "training",
+    "instances": [
+        {
+            "name": "trainer",
+            "count": 2,
+            "where": "gpus >= 8 and gpu = H100",
+            "regions": ["us-south-3", "us-west-1"],
+            "ssh_keys": ["laptop"],
+            "tags": {"team": "research"},
+        }
+    ],
+}
+
+
+@pytest.fixture
+def m_instances() -> dict:
+    response = json.loads((DATA_FOLDER / "m_instances_response.json").read_text())
+    response["data"][0]["status"] = "active"
+    response["data"][0]["tags"] = [{"key": "fleet", "value": "training"}, {"key": "fleet-group", "value": "trainer"}]
+    return response
+
+
+@pytest.fixture
+def m_instance_types() -> dict:
+    return json.loads((DATA_FOLDER / "m_instance_types_response.json").read_text())
+
+
+def _instance(m_instances: dict, id: str, name: str, group: str = "trainer", instance_type: str | None = None):
+    raw = copy.deepcopy(m_instances["data"][0])
+    raw.update(id=id, name=name)
+    raw["tags"][1]["value"] = group
+    if instance_type:
+        raw["instance_type"]["name"] = instance_type
+        raw["instance_type"]["gpu_description"] = "A10 (24 GB PCIe)"
+    return Instance.from_dict(raw)
+
+
+def _spec(count: int = 2) -> FleetSpec:
+    return FleetSpec("training", (FleetGroup("trainer", count, ("laptop",), where="gpus >= 8 and gpu = H100"),))
+
+
+def test_load_fleet_spec(tmp_path: Path) -> None:
+    # Arrange
+    pytest.importorskip("yaml")
+    yaml_spec = tmp_path / "fleet.yaml"
+    yaml_spec.write_text(
+        "name: training\n"
+        "instances:\n"
+        "  - name: trainer\n"
+        "    count: 2\n"
+        "    where: gpus >= 8 and gpu = H100\n"
+        "    regions: [us-south-3, us-west-1]\n"
+        "    ssh_keys: [laptop]\n"
+        "    tags: {team: research}\n"
+    )
+    json_spec = tmp_path / "fleet.json"
+    json_spec.write_text(json.dumps(SPEC))
+    # Act
+    spec = load_fleet_spec(yaml_spec)
+    # Assert
+    assert spec == load_fleet_spec(json_spec)
+    assert spec.groups[0] == FleetGroup(
+        "trainer",
+        2,
+        ("laptop",),
+        where="gpus >= 8 and gpu = H100",
+        regions=("us-south-3", "us-west-1"),
+        tags=(("team", "research"),),
+    )
+    assert spec.groups[0].instance_names() == ["trainer-0", "trainer-1"]
+
+
+@pytest.mark.parametrize(
+    "group, error",
+    (
+        ({"count": 1}, "every entry of instances needs a name"),
+        ({"name": "a", "ssh_keys": ["k"]}, "a needs an instance_type or a where query"),
+        ({"name": "a", "instance_type": "t"}, "a needs ssh_keys"),
+        ({"name": "a", "instance_type": "t", "ssh_keys": ["k"], "count": -1}, "a.count must be"),
+        ({"name": "a", "where": "gpus >>", "ssh_keys": ["k"]}, "a.where: "),
+        ({"name": "a", "instance_type": "t", "ssh_keys": ["k"], "rank": "speed"}, "a.rank must be one of"),
+        ({"name": "a", "instance_type": "t", "ssh_keys": ["k"], "tags": {"fleet": "x"}}, "a.tags must be"),
+        ({"name": "a", "instance_type": "t", "ssh_keys": ["k"], "size": 3}, "a has unknown fields size"),
+        ({"name": "a", "where": 5, "ssh_keys": ["k"]}, "a.where must be a string"),
+        ({"name": "a", "instance_type": ["t"], "ssh_keys": ["k"]}, "a.instance_type must be a string"),
+        ({"name": "a", "instance_type": "t", "ssh_keys": ["k"], "image_id": 1}, "a.image_id must be a string"),
+        ({"name": "a", "instance_type": "t", "ssh_keys": ["k"], "tags": {"team": None}}, "a.tags must map strings"),
+    ),
+)
+def test_load_fleet_spec_errors(tmp_path: Path, group: dict, error: str) -> None:
+    path = tmp_path / "fleet.json"
+    path.write_text(json.dumps({"name": "training", "instances": [group]}))
+    with pytest.raises(RuntimeError, match=f"Invalid fleet spec {path}: {error}"):
+        load_fleet_spec(path)
+
+
+def test_plan_fleet(m_instances: dict, m_instance_types: dict) -> None:
+    # Arrange
+    types = [InstanceTypesItem.from_dict(item) for item in m_instance_types["data"].values()]
+    instances = [
+        _instance(m_instances, "a", "trainer-1"),
+        _instance(m_instances, "b", "old"),
+        _instance(m_instances, "c", "trainer-0", instance_type="gpu_1x_a10"),
+        _instance(m_instances, "d", "extra"),
+        _instance(m_instances, "e", "gone", group="evaluator"),
+    ]
+    # Act
+    changes = plan_fleet(_spec(count=3), instances, types)
+    # Assert: c no longer matches, d and b take the free names in name order
+    assert changes == [
+        FleetChange("terminate", "trainer", "trainer-0", "c", "gpu_1x_a10", "us-west-1", "type/region no longer match"),
+        FleetChange("rename", "trainer", "trainer-0", "d", "gpu_8x_h100_sxm5gdr", "us-west-1", "was extra"),
+        FleetChange("rename", "trainer", "trainer-2", "b", "gpu_8x_h100_sxm5gdr", "us-west-1", "was old"),
+        FleetChange("terminate", "evaluator", "gone", "e", "gpu_8x_h100_sxm5gdr", "us-west-1", "group not in the spec"),
+    ]
+    # Scaling down terminates the instances beyond the count, keeping the ones with the spec's names.
+    instances = [_instance(m_instances, "b", "old"), _instance(m_instances, "a", "trainer-0")]
+    changes = plan_fleet(_spec(count=1), instances, types)
+    assert [(c.action, c.instance_id, c.reason) for c in changes] == [("terminate", "b", "more than 1")]
+
+
+def test_plan_fleet_is_idempotent(m_instances: dict, m_instance_types: dict) -> None:
+    # Arrange
+    types = [InstanceTypesItem.from_dict(item) for item in m_instance_types["data"].values()]
+    instances = [_instance(m_instances, "a", "trainer-0"), _instance(m_instances, "b", "trainer-1")]
+    other_fleet = _instance(m_instances, "c", "trainer-0")
+    other_fleet.tags[0].value = "inference"
+    # Act & Assert: other fleets' instances are left alone
+    assert plan_fleet(_spec(), [*instances, other_fleet], types) == []
+    # Growing the fleet launches the cheapest matching type with capacity, in any region without preferences.
+    assert plan_fleet(_spec(count=3), instances, types) == [
+        FleetChange("launch", "trainer", "trainer-2", None, "gpu_8x_h100_sxm5", "us-west-3", "missing")
+    ]
+
+
+@pytest.mark.parametrize("args", ([], ["--dry-run"]), ids=("", "dry-run"))
+def test_apply(
+    request,
+    httpx_mock,
+    tmp_path: Path,
+    m_instances: dict,
+    m_instance_types: dict,
+    args: list[str],
+    c_assert_cmd_results_equals: Callable[[list[str], Path], Result],
+) -> None:
+    # Arrange
+    spec = tmp_path / "fleet.json"
+    spec.write_text(json.dumps(SPEC))
+    httpx_mock.add_response(method="GET", url=INSTANCES_URL, json=m_instances)
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/instance-types", json=m_instance_types)
+    if not args:
+        httpx_mock.add_response(
+            method="POST",
+            url=f"{INSTANCES_URL}/{ID}",
+            match_json={"name": "trainer-0"},
+            json=json.loads((DATA_FOLDER / "m_instance_post_response.json").read_text()),
+        )
+        httpx_mock.add_response(
+            method="POST",
+            url=f"{DEFAULT_BASE_URL}/api/v1/instance-operations/launch",
+            match_json={
+                "region_name": "us-south-3",
+                "instance_type_name": "gpu_8x_h100_sxm5",
+                "ssh_key_names": ["laptop"],
+                "name": "trainer-1",
+                "tags": [
+                    {"key": "team", "value": "research"},
+                    {"key": "fleet", "value": "training"},
+                    {"key": "fleet-group", "value": "trainer"},
+                ],
+            },
+            json=json.loads((DATA_FOLDER / "m_start_response.json").read_text()),
+        )
+    # Act & Assert
+    suffix = f"_{request.node.callspec.id}" if args else ""
+    c_assert_cmd_results_equals(["apply", str(spec), *args], DATA_FOLDER / f"expected_apply_output{suffix}.txt")
+
+
+def test_apply_no_changes(
+    httpx_mock, tmp_path: Path, m_instances: dict, c_assert_cmd_results_equals: Callable[[list[str], Path], Result]
+) -> None:
+    # Arrange: the fleet is complete, so the instance types aren't listed
+    spec = tmp_path / "fleet.json"
+    spec.write_text(json.dumps({**SPEC, "instances": [{**SPEC["instances"][0], "count": 1}]}))
+    m_instances["data"][0]["name"] = "trainer-0"
+    httpx_mock.add_response(method="GET", url=INSTANCES_URL, json=m_instances)
+    # Act & Assert
+    c_assert_cmd_results_equals(["apply", str(spec)], DATA_FOLDER / "expected_apply_output_no-changes.txt")
+
+
+def test_apply_invalid_spec(
+    tmp_path: Path, monkeypatch, c_assert_cmd_results_equals: Callable[[list[str], Path, int], Result]
+) -> None:
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    Path("fleet.json").write_text('{"name": "training"}')
+    # Act & Assert, before any API call
+    c_assert_cmd_results_equals(["apply", "fleet.json"], DATA_FOLDER / "expected_apply_output_invalid.txt", 2)
@@ -26,6 +26,9 @@ def m_response() -> dict:
         {"version": "22.4.5-1459"},
         {"version": "22.4.5-1459", "family": "lambda-stack-22-04", "arch": "arm64"},
         {"json": None},
+        {"output": "ndjson"},
+        {"arch": "arm64", "output": "ndjson"},
+        {"output": "csv"},
     ),
     ids=(
         "",
@@ -35,6 +38,9 @@ def m_response() -> dict:
         "version",
         "combination",
         "json",
+        "ndjson",
+        "arch-ndjson",
+        "csv",
     ),
 )
 def test_images(
@@ -23,12 +23,16 @@ def m_response() -> dict:
         {"name": "yubikey"},
         {"id": "d02cb1eda8d4s47a927ebc5da267s9a4"},
         {"json": None},
+        {"output": "ndjson"},
+        {"output": "csv"},
     ),
     ids=(
         "",
         "name",
         "id",
         "json",
+        "ndjson",
+        "csv",
     ),
 )
 def test_keys(
@@ -23,12 +23,20 @@ def m_response() -> dict:
         {"region": "us-west-1"},
         {"status": "booting"},
         {"json": None},
+        {"status": "booting", "json": None},
+        {"output": "ndjson"},
+        {"status": "booting", "output": "ndjson"},
+        {"output": "csv"},
     ),
     ids=(
         "",
         "region",
         "status",
         "json",
+        "status-json",
+        "ndjson",
+        "status-ndjson",
+        "csv",
     ),
 )
 def test_ls(
@@ -0,0 +1,27 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from lambda_ai_cloud_api_client import __main__ as cli
+from lambda_ai_cloud_api_client.cli.client import auth_client
+from lambda_ai_cloud_api_client.mock import MockApiTransport, MockCloud, MockServer
+
+
+def test_ls_records_and_replays(f_cli_runner: CliRunner, tmp_path: Path):
+    recording = tmp_path / "ls.jsonl"
+    with MockServer(MockApiTransport(MockCloud(instances=4, seed=5))) as server:
+        env = {
+            "LAMBDA_CLOUD_TOKEN": "mock",
+            "LAMBDA_CLOUD_BASE_URL": server.base_url,
+            "LAMBDA_CLOUD_RECORD": str(recording),
+        }
+        recorded = f_cli_runner.invoke(cli.main, ["ls", "--json"], env=env)
+    assert recorded.exit_code == 0, recorded.output
+    assert len(json.loads(recorded.output)) == 4
+
+    auth_client.cache_clear()
+    env = {"LAMBDA_CLOUD_TOKEN": "mock", "LAMBDA_CLOUD_REPLAY": str(recording)}
+    replayed = f_cli_runner.invoke(cli.main, ["ls", "--json"], env=env)
+    assert replayed.exit_code == 0, replayed.output
+    assert replayed.output == recorded.output
@@ -0,0 +1,78 @@
+import json
+import pstats
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from lambda_ai_cloud_api_client import __main__ as cli
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.profiling import PHASES, PhaseProfiler
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+
+
+def test_phases_are_exclusive() -> None:
+    profiler = PhaseProfiler(started_at=0.0)
+    profiler.push("parse", at=1.0)
+    profiler.push("network", at=2.0)
+    profiler.pop(at=5.0)
+    profiler.pop(at=6.0)
+    profiler.push("render", at=6.0)
+    profiler.pop(at=7.0)
+    profiler.finished_at = 10.0
+
+    assert dict(profiler.report()) == {
+        "import": 0.0,
+        "auth": 0.0,
+        "network": 3.0,
+        "parse": 2.0,
+        "filter": 0.0,
+        "render": 1.0,
+        "cli": 4.0,
+    }
+    trace = profiler.speedscope()
+    events = trace["profiles"][0]["events"]
+    assert [(e["type"], e["frame"]) for e in events] == [
+        ("O", 0),
+        ("O", 1 + PHASES.index("parse")),
+        ("O", 1 + PHASES.index("network")),
+        ("C", 1 + PHASES.index("network")),
+        ("C", 1 + PHASES.index("parse")),
+        ("O", 1 + PHASES.index("render")),
+        ("C", 1 + PHASES.index("render")),
+        ("C", 0),
+    ]
+    assert trace["profiles"][0]["endValue"] == 10_000.0
+
+
+def _mock_instances(httpx_mock) -> None:
+    m_response = json.loads((DATA_FOLDER / "m_instances_response.json").read_text())
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/instances", json=m_response)
+
+
+def test_profile_speedscope(httpx_mock, f_cli_runner: CliRunner, tmp_path: Path) -> None:
+    _mock_instances(httpx_mock)
+    trace = tmp_path / "ls.json"
+
+    result = f_cli_runner.invoke(cli.main, ["--profile-output", str(trace), "ls"], env={"COLUMNS": "170"})
+
+    assert result.exit_code == 0, result.output
+    for phase in PHASES:
+        assert phase in result.stderr
+    profile = json.loads(trace.read_text())["profiles"][0]
+    frames = {e["frame"] for e in profile["events"]}
+    assert {1 + PHASES.index(p) for p in ("auth", "network", "parse", "filter", "render")} <= frames
+
+
+def test_profile_pstats(httpx_mock, f_cli_runner: CliRunner, tmp_path: Path) -> None:
+    _mock_instances(httpx_mock)
+    stats = tmp_path / "ls.prof"
+
+    result = f_cli_runner.invoke(cli.main, ["--profile", "--profile-output", str(stats), "ls", "--json"])
+
+    assert result.exit_code == 0, result.output
+    assert "Profile" in result.stderr
+    assert any(
+        name == "render_instances_table" or name in ("print_output", "print_raw_json")
+        for _, _, name in pstats.Stats(str(stats)).stats
+    )
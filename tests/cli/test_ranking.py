@@ -0,0 +1,121 @@
+import itertools
+import json
+import math
+from pathlib import Path
+
+import pytest
+
+from lambda_ai_cloud_api_client.cli.ranking import (
+    cheapest_combination,
+    gpu_memory_gib,
+    pareto_front,
+    parse_requirements,
+    rank_instance_types,
+    score_instance_type,
+)
+from lambda_ai_cloud_api_client.models import InstanceTypes, InstanceTypesItem
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def instance_types() -> list[InstanceTypesItem]:
+    payload = json.loads((DATA_FOLDER / "m_instance_types_response.json").read_text())["data"]
+    return list(InstanceTypes.from_dict(payload).additional_properties.values())
+
+
+def _by_name(items: list[InstanceTypesItem], *names: str) -> list[InstanceTypesItem]:
+    return [i for i in items if i.instance_type.name in names]
+
+
+def test_gpu_memory_gib():
+    assert gpu_memory_gib("H100 (80 GB SXM5)") == 80
+    assert gpu_memory_gib("Tesla V100 (16 GB)") == 16
+    assert gpu_memory_gib("N/A") == 0
+
+
+def test_score_instance_type(instance_types):
+    (item,) = _by_name(instance_types, "gpu_8x_h100_sxm5")
+    score = score_instance_type(item)
+    assert score.price == 23.92
+    assert score.resources == {"gpus": 8, "gpu-memory": 640, "vcpus": 208, "memory": 1800}
+    assert score.cost_per("gpus") == pytest.approx(2.99)
+    assert score.to_dict()["price_per_gpu_memory_gib"] == 0.0374
+
+    (cpu,) = _by_name(instance_types, "cpu_4x_general")
+    assert math.isinf(score_instance_type(cpu).cost_per("gpus"))
+    assert score_instance_type(cpu).to_dict()["price_per_gpu"] is None
+
+
+def test_rank_instance_types(instance_types):
+    ranked = [s.name for s in rank_instance_types(instance_types, "gpu")]
+    assert ranked[:3] == ["gpu_1x_rtx6000", "gpu_8x_v100", "gpu_1x_a10"]
+    # Types without GPUs rank last.
+    assert ranked[-1] == "cpu_4x_general"
+    assert [s.name for s in rank_instance_types(instance_types, "price")][0] == "cpu_4x_general"
+
+
+def test_pareto_front(instance_types):
+    front = pareto_front(instance_types)
+    names = [s.name for s in front]
+    # gpu_4x_a100 is cheaper than gpu_2x_h100_sxm5 and has at least as much of everything.
+    assert "gpu_2x_h100_sxm5" not in names
+    assert "gpu_1x_a10" in names and "gpu_8x_b200_sxm6" in names
+    assert [s.price for s in front] == sorted(s.price for s in front)
+    scores = [score_instance_type(i) for i in instance_types]
+    for score in scores:
+        dominated = any(
+            other.price <= score.price
+            and all(other.resources[r] >= score.resources[r] for r in score.resources)
+            and (other.price, other.resources) != (score.price, score.resources)
+            for other in scores
+        )
+        assert (score.name in names) != dominated
+
+
+def test_parse_requirements():
+    assert parse_requirements(["gpus=8", "GPU_MEMORY=640"]) == {"gpus": 8.0, "gpu-memory": 640.0}
+    for raw in ("tpus=8", "gpus", "gpus=-1"):
+        with pytest.raises(RuntimeError, match="Invalid requirement"):
+            parse_requirements([raw])
+
+
+def _brute_force(items, requirements, max_instances):
+    scores = [score_instance_type(i) for i in items]
+    best = None
+    for counts in itertools.product(range(max_instances + 1), repeat=len(scores)):
+        if sum(counts) > max_instances:
+            continue
+        chosen = list(zip(scores, counts, strict=True))
+        if all(sum(s.resources[r] * c for s, c in chosen) >= a for r, a in requirements.items()):
+            cents = sum(s.item.instance_type.price_cents_per_hour * c for s, c in chosen)
+            best = cents if best is None else min(best, cents)
+    return best
+
+
+@pytest.mark.parametrize(
+    "requirements",
+    ({"gpus": 8}, {"gpus": 3}, {"gpu-memory": 200}, {"gpus": 4, "vcpus": 150}, {"gpus": 2, "memory": 2000}),
+)
+def test_cheapest_combination_is_optimal(instance_types, requirements):
+    items = _by_name(instance_types, "gpu_1x_a10", "gpu_1x_h100_pcie", "gpu_2x_h100_sxm5", "gpu_8x_a100")
+    combination = cheapest_combination(items, requirements, max_instances=8)
+    expected = _brute_force(items, requirements, 8)
+    assert combination is not None
+    assert round(combination.price * 100) == expected
+    assert all(combination.total(r) >= amount for r, amount in requirements.items())
+    assert combination.instances <= 8
+
+
+def test_cheapest_combination(instance_types):
+    combination = cheapest_combination(instance_types, {"gpus": 8})
+    assert [(s.name, count) for s, count in combination.counts] == [("gpu_1x_rtx6000", 8)]
+    assert combination.to_dict()["total_price_cents_per_hour"] == 400
+
+    # Fewer instances win a tie: one gpu_2x_a6000 over two gpu_1x_a6000.
+    a6000 = _by_name(instance_types, "gpu_1x_a6000", "gpu_2x_a6000")
+    assert [(s.name, c) for s, c in cheapest_combination(a6000, {"gpus": 2}).counts] == [("gpu_2x_a6000", 1)]
+
+    assert cheapest_combination(instance_types, {"gpus": 0}).instances == 0
+    assert cheapest_combination(_by_name(instance_types, "gpu_1x_a10"), {"gpus": 8}, max_instances=4) is None
+    assert cheapest_combination(_by_name(instance_types, "cpu_4x_general"), {"gpus": 1}) is None
@@ -0,0 +1,153 @@
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from click.testing import Result
+
+from lambda_ai_cloud_api_client.cli import reaper
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.reaper import IdleSample, IdleTracker, parse_probe_output, tagged_instances
+from lambda_ai_cloud_api_client.models import Instance
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+INSTANCES_URL = f"{DEFAULT_BASE_URL}/api/v1/instances"
+T0 = datetime(2025, 11, 1, tzinfo=timezone.utc)
+ID = "0920582c7ff041399e34823a0be62549"
+
+
+@pytest.fixture
+def m_instances() -> dict:
+    response = json.loads((DATA_FOLDER / "m_instances_response.json").read_text())
+    response["data"][0]["status"] = "active"
+    return response
+
+
+@pytest.fixture
+def f_ssh(monkeypatch) -> list[tuple[str, tuple[str, ...]]]:
+    """Every instance answers the probe as idle, records the SSH commands."""
+    calls = []
+
+    def _run_ssh(ip: str, command: tuple[str, ...], control_dir: str) -> str:
+        calls.append((ip, command))
+        return "gpu=0\nsessions=0\n"
+
+    monkeypatch.setattr(reaper, "_run_ssh", _run_ssh)
+    monkeypatch.setattr(reaper, "_close_ssh_masters", lambda ips, control_dir: None)
+    times = iter((T0, T0 + timedelta(minutes=10)))
+    monkeypatch.setattr(reaper, "_now", lambda: next(times))
+    return calls
+
+
+def test_parse_probe_output():
+    assert parse_probe_output("gpu=87\nsessions=2\n") == IdleSample(87.0, 2)
+    assert parse_probe_output("gpu=\nsessions=0\n") == IdleSample(None, 0)
+    assert IdleSample(None, 0).idle(5) and IdleSample(5, 0).idle(5)
+    assert not IdleSample(6, 0).idle(5) and not IdleSample(0, 1).idle(5)
+    with pytest.raises(KeyError):
+        parse_probe_output("Permission denied")
+    # Instances with GPUs that give no reading can't be judged idle.
+    assert parse_probe_output("gpu=3\nsessions=0\n", gpus=8) == IdleSample(3.0, 0)
+    with pytest.raises(ValueError, match="8 GPUs"):
+        parse_probe_output("gpu=\nsessions=0\n", gpus=8)
+
+
+def test_tagged_instances(m_instances):
+    instances = [Instance.from_dict(i) for i in m_instances["data"]]
+    assert tagged_instances(instances, [("key1", "value1")]) == instances
+    assert tagged_instances(instances, [("key1", "other")]) == []
+    instances[0].status = "booting"
+    assert tagged_instances(instances, []) == []
+
+
+def test_idle_tracker(m_instances):
+    instance = Instance.from_dict(m_instances["data"][0])
+    tracker = IdleTracker(timedelta(minutes=30), timedelta(minutes=10), threshold=5)
+    idle, busy = IdleSample(1, 0), IdleSample(90, 0)
+
+    def action(sample, minutes):
+        return tracker.update(instance, sample, T0 + timedelta(minutes=minutes)).action
+
+    assert [action(idle, m) for m in (0, 10, 20, 25)] == ["idle", "idle", "warn", "idle"]
+    # Activity starts the count over, and warns again.
+    assert [action(busy, 26), action(idle, 30), action(idle, 50), action(idle, 60)] == [
+        "active",
+        "idle",
+        "warn",
+        "terminate",
+    ]
+    # So does a failed probe: an instance that can't be seen is never terminated.
+    assert [action(None, 61), action(idle, 62)] == ["unreachable", "idle"]
+
+
+@pytest.mark.parametrize(
+    "args",
+    (
+        [],
+        ["--dry-run"],
+        ["--idle-minutes", "0", "--grace-minutes", "0"],
+    ),
+    ids=("", "dry-run", "immediately"),
+)
+def test_reap(
+    request,
+    httpx_mock,
+    m_instances: dict,
+    f_ssh,
+    args: list[str],
+    c_assert_cmd_results_equals: Callable[[list[str], Path, int], Result],
+) -> None:
+    # Arrange
+    param_id = request.node.callspec.id
+    samples = "1" if param_id == "immediately" else "2"
+    for _ in range(int(samples)):
+        httpx_mock.add_response(method="GET", url=INSTANCES_URL, json=m_instances)
+    if param_id != "dry-run":
+        httpx_mock.add_response(
+            method="POST",
+            url=f"{DEFAULT_BASE_URL}/api/v1/instance-operations/terminate",
+            match_json={"instance_ids": [ID]},
+            json=json.loads((DATA_FOLDER / "m_stop_response.json").read_text()),
+        )
+    cmd = ["reap", "--tag", "key1=value1", "--idle-minutes", "10", "--grace-minutes", "10"]
+    cmd += ["--interval", "0.01", "--samples", samples, *args]
+    # Act
+    suffix = f"_{param_id}" if param_id else ""
+    c_assert_cmd_results_equals(cmd, DATA_FOLDER / f"expected_reap_output{suffix}.txt")
+    # Assert: probed over SSH every sample, warned with wall unless dry-running
+    commands = [command[0] for _, command in f_ssh]
+    assert commands == {"": ["sh", "wall", "sh"], "dry-run": ["sh", "sh"], "immediately": ["sh"]}[param_id]
+
+
+def test_reap_busy_instance_is_kept(httpx_mock, m_instances: dict, f_ssh, monkeypatch, c_assert_cmd_results_equals):
+    # Arrange
+    monkeypatch.setattr(reaper, "_run_ssh", lambda ip, command, control_dir: "gpu=97\nsessions=0\n")
+    httpx_mock.add_response(method="GET", url=INSTANCES_URL, json=m_instances)
+    # Act & Assert, no terminate call
+    c_assert_cmd_results_equals(
+        ["reap", "--tag", "key1=value1", "--idle-minutes", "0", "--samples", "1"],
+        DATA_FOLDER / "expected_reap_output_busy.txt",
+    )
+
+
+def test_probe_gpu_instance_without_gpu_reading(m_instances: dict, f_ssh, monkeypatch) -> None:
+    # Arrange: nvidia-smi prints nothing on the 8 GPU instance
+    monkeypatch.setattr(reaper, "_run_ssh", lambda ip, command, control_dir: "gpu=\nsessions=0\n")
+    instances = [Instance.from_dict(i) for i in m_instances["data"]]
+    # Act
+    samples = reaper.probe_instances(instances, "/tmp", concurrency=1)
+    # Assert: treated like an instance that didn't answer, never as idle
+    assert samples == {ID: None}
+
+
+@pytest.mark.parametrize(
+    "args",
+    (["--tag", "key1"], ["--tag", "key1=value1", "--gpu-threshold", "101"]),
+    ids=("invalid-tag", "threshold"),
+)
+def test_reap_errors(request, args: list[str], c_assert_cmd_results_equals) -> None:
+    # Act & Assert, before any API call
+    c_assert_cmd_results_equals(
+        ["reap", *args], DATA_FOLDER / f"expected_reap_output_{request.node.callspec.id}.txt", 2
+    )
@@ -0,0 +1,47 @@
+import json
+from io import BytesIO
+
+import pytest
+
+from lambda_ai_cloud_api_client.cli.response import print_json, print_ndjson, print_output
+
+
+def test_print_json_keeps_markup_like_strings(capsysbinary) -> None:
+    data = [{"tags": [{"key": "team", "value": "[bold]ml[/bold]"}], "note": ":smile:"}]
+
+    print_json(data)
+
+    out = capsysbinary.readouterr().out
+    assert out == (json.dumps(data, indent=2) + "\n").encode()
+
+
+def test_print_ndjson_one_object_per_line(capsysbinary) -> None:
+    print_ndjson(iter([{"id": "a"}, {"id": "b", "tags": ["[x]"]}]))
+
+    out = capsysbinary.readouterr().out
+    assert out == b'{"id":"a"}\n{"id":"b","tags":["[x]"]}\n'
+
+
+def test_print_output_csv_flattens_columns(capsys) -> None:
+    items = [
+        {
+            "id": "a",
+            "region": {"name": "us-east-1"},
+            "tags": [{"key": "team", "value": "ml"}, {"key": "env", "value": "dev"}],
+        },
+        {"id": "b", "region": {"name": "us-west-1"}},
+    ]
+
+    print_output(items, "csv", columns=(("id", str), ("region.name", str), ("tags", str)))
+
+    assert capsys.readouterr().out == "id,region.name,tags\na,us-east-1,team=ml;env=dev\nb,us-west-1,\n"
+
+
+def test_print_output_parquet(capsysbinary) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    items = [{"id": "a", "specs": {"gpus": 8}}, {"id": "b", "specs": {}}]
+
+    print_output(items, "parquet", columns=(("id", str), ("specs.gpus", int)))
+
+    table = pq.read_table(BytesIO(capsysbinary.readouterr().out))
+    assert table.to_pylist() == [{"id": "a", "specs.gpus": 8}, {"id": "b", "specs.gpus": None}]
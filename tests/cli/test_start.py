@@ -45,6 +45,12 @@ def m_response() -> dict:
         {"region": "us-east-1", "instance-type": "gpu_1x_a100_sxm4", "ssh-key": "default-key", "json": None},
         {"available": None, "gpu": "A10", "max-price": "1", "ssh-key": "default-key"},
         {"region": "us-east-1", "instance-type": "gpu_1x_a100_sxm4", "ssh-key": "default-key", "dry-run": None},
+        {
+            "where": "gpus>=8 and gpu=A100 and price<12 and region in (us-west-2, me-west-1)",
+            "ssh-key": "default-key",
+            "dry-run": None,
+            "json": None,
+        },
     ),
     ids=(
         "",
@@ -54,6 +60,7 @@ def m_response() -> dict:
         "json",
         "filtered",
         "dry-run",
+        "where",
     ),
 )
 def test_start(
@@ -0,0 +1,32 @@
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from lambda_ai_cloud_api_client import __main__ as cli
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+
+
+def test_timings(httpx_mock, f_cli_runner: CliRunner) -> None:
+    m_response = json.loads((DATA_FOLDER / "m_ssh_keys_response.json").read_text())
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/ssh-keys", json=m_response)
+
+    result = f_cli_runner.invoke(cli.main, ["--timings", "keys", "--json"], env={"COLUMNS": "170"})
+
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.stdout) == m_response["data"]
+    assert "GET /ssh-keys" in result.stderr
+    assert "200" in result.stderr
+    assert "miss" in result.stderr
+
+
+def test_timings_on_error(httpx_mock, f_cli_runner: CliRunner) -> None:
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/ssh-keys", status_code=500, json={})
+
+    result = f_cli_runner.invoke(cli.main, ["--timings", "keys"], env={"COLUMNS": "170"})
+
+    assert result.exit_code != 0
+    assert "GET /ssh-keys" in result.stderr
+    assert "500" in result.stderr
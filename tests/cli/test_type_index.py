@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from lambda_ai_cloud_api_client.cli.type_index import (
+    Condition,
+    InstanceTypeIndex,
+    index_instance_types,
+    matching_regions,
+    parse_type_query,
+)
+from lambda_ai_cloud_api_client.models import InstanceTypes, InstanceTypesItem
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def instance_types() -> list[InstanceTypesItem]:
+    payload = json.loads((DATA_FOLDER / "m_instance_types_response.json").read_text())["data"]
+    return list(InstanceTypes.from_dict(payload).additional_properties.values())
+
+
+def _names(items: list[InstanceTypesItem]) -> list[str]:
+    return [i.instance_type.name for i in items]
+
+
+def test_parse_type_query():
+    assert parse_type_query("gpus>=8 and gpu~H100 AND region in (us-east-1, us-west-1) and available") == (
+        Condition("gpus", ">=", (8.0,)),
+        Condition("gpu", "~", ("H100",)),
+        Condition("region", "=", ("us-east-1", "us-west-1")),
+        Condition("available", "=", (True,)),
+    )
+    assert parse_type_query("price<=$2.5 and name == gpu_1x_a10") == (
+        Condition("price", "<=", (2.5,)),
+        Condition("name", "=", ("gpu_1x_a10",)),
+    )
+
+
+@pytest.mark.parametrize(
+    "query",
+    ("", "gpus", "gpus >= eight", "colour = red", "gpu < H100", "region in us-east-1", "gpus>=1 and", "available = 1"),
+)
+def test_parse_type_query_errors(query):
+    with pytest.raises(RuntimeError, match="Invalid instance type query"):
+        parse_type_query(query)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    (
+        ("gpus>=8 and gpu~H100", ["gpu_8x_h100_sxm5"]),
+        ("gpu = a100 and gpus = 8", ["gpu_8x_a100_80gb_sxm4", "gpu_8x_a100"]),
+        ("region in (us-west-1, asia-south-1)", ["gpu_1x_a10", "gpu_1x_a100_sxm4", "gpu_8x_a100"]),
+        ("region = us-south-3 and gpus > 2 and price < 20", ["gpu_4x_h100_sxm5"]),
+        ("region ~ australia", ["gpu_8x_b200_sxm6", "gpu_8x_a100_80gb_sxm4"]),
+        (
+            "region != us-west-3 and gpu = h100",
+            ["gpu_8x_h100_sxm5", "gpu_4x_h100_sxm5", "gpu_2x_h100_sxm5", "gpu_1x_h100_sxm5"],
+        ),
+        ("gpu != A100 and gpus >= 4 and available", ["gpu_8x_b200_sxm6", "gpu_8x_h100_sxm5", "gpu_4x_h100_sxm5"]),
+        ("vcpus in (4, 14) and memory <= 46 and storage >= 100", ["gpu_1x_rtx6000", "cpu_4x_general"]),
+        ("name = gpu_1x_a10", ["gpu_1x_a10"]),
+        ("gpus > 8", []),
+    ),
+)
+def test_select(instance_types, query, expected):
+    assert _names(InstanceTypeIndex(instance_types).select(parse_type_query(query))) == expected
+
+
+def test_select_matches_a_linear_scan(instance_types):
+    index = InstanceTypeIndex(instance_types)
+    for gpus in range(10):
+        for price in (0.5, 1.29, 5, 14.32, 50):
+            query = parse_type_query(f"gpus >= {gpus} and price <= {price} and available")
+            expected = [
+                i
+                for i in instance_types
+                if i.instance_type.specs.gpus >= gpus
+                and i.instance_type.price_cents_per_hour <= price * 100
+                and i.regions_with_capacity_available
+            ]
+            assert index.select(query) == expected
+
+
+def test_matching_regions(instance_types):
+    (item,) = [i for i in instance_types if i.instance_type.name == "gpu_8x_a100"]
+
+    regions = matching_regions(item, parse_type_query("region in (us-west-2, me-west-1) and gpus >= 8"))
+
+    assert [r.name.value for r in regions] == ["me-west-1", "us-west-2"]
+
+
+def test_index_is_reused_for_the_same_list(instance_types):
+    assert index_instance_types(instance_types) is index_instance_types(instance_types)
+    assert index_instance_types(list(instance_types)) is not index_instance_types(instance_types)
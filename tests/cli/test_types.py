@@ -7,6 +7,7 @@ import pytest
 from click.testing import Result
 
 from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.types import list_instance_types
 
 DATA_FOLDER = Path(__file__).parent.parent / "data"
 UPDATE_EXPECTED_DATA = os.environ.get("UPDATE_EXPECTED_DATA", "false").lower() == "true"
@@ -32,6 +33,20 @@ def m_response() -> dict:
         {"min-storage": "1000"},
         {"max-price": "1.00"},
         {"json": None},
+        {"output": "ndjson"},
+        {"gpu": "A10", "output": "ndjson"},
+        {"output": "csv"},
+        {"output": "tsv"},
+        {"where": "gpu~a100 and region in (us-east-1, us-west-2) and price <= 14.32"},
+        {"where": "available and gpus != 1", "cheapest": None},
+        {"rank": "gpu"},
+        {"rank": "gpu-memory", "available": None, "output": "csv"},
+        {"rank": "gpu", "cheapest": None, "available": None},
+        {"pareto": None},
+        {"pareto": None, "rank": "vcpu", "available": None},
+        {"need": "gpus=8", "available": None},
+        {"need": "gpus=16", "max-instances": "16"},
+        {"need": "gpu-memory=640", "gpu": "H100", "json": None},
     ),
     ids=(
         "",
@@ -45,6 +60,20 @@ def m_response() -> dict:
         "min-storage",
         "max-price",
         "json",
+        "ndjson",
+        "gpu-ndjson",
+        "csv",
+        "tsv",
+        "where",
+        "where-cheapest",
+        "rank",
+        "rank-csv",
+        "rank-cheapest",
+        "pareto",
+        "pareto-rank",
+        "need",
+        "need-max-instances",
+        "need-json",
     ),
 )
 def test_types(
@@ -76,3 +105,38 @@ def test_types_error(httpx_mock, c_assert_cmd_results_equals: Callable[[list[str
     httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/instance-types", status_code=500, json={})
     # Act & Assert
     c_assert_cmd_results_equals(["types"], DATA_FOLDER / "expected_types_output_error.txt", expected_exit_code=1)
+
+
+def test_types_where_error(httpx_mock, c_assert_cmd_results_equals: Callable[[list[str], Path, int], Result]) -> None:
+    c_assert_cmd_results_equals(
+        ["types", "--where", "gpus >> 8"], DATA_FOLDER / "expected_types_output_where-error.txt", 2
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    (["--need", "gpus=64", "--max-instances", "2"], ["--need", "tpus=8"]),
+    ids=("no-combination", "invalid"),
+)
+def test_types_need_error(request, httpx_mock, m_response: dict, args: list[str], c_assert_cmd_results_equals) -> None:
+    # Arrange
+    param_id = request.node.callspec.id
+    if param_id == "no-combination":
+        httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/instance-types", json=m_response)
+    # Act & Assert
+    c_assert_cmd_results_equals(["types", *args], DATA_FOLDER / f"expected_types_output_need-{param_id}.txt", 2)
+
+
+def test_list_instance_types_reuses_list_for_same_response(httpx_mock, m_response: dict) -> None:
+    url = f"{DEFAULT_BASE_URL}/api/v1/instance-types"
+    httpx_mock.add_response(method="GET", url=url, json=m_response)
+    httpx_mock.add_response(method="GET", url=url, json=m_response)
+    m_response["data"].pop("gpu_1x_a10")
+    httpx_mock.add_response(method="GET", url=url, json=m_response)
+
+    first, second, third = list_instance_types(), list_instance_types(), list_instance_types()
+
+    # The same list lets the type index be reused, a changed response gets a new one.
+    assert isinstance(first, list)
+    assert second is first
+    assert third is not first and len(third) == len(first) - 1
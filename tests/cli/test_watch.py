@@ -0,0 +1,124 @@
+import json
+from io import StringIO
+from pathlib import Path
+
+import httpx
+import pytest
+
+from lambda_ai_cloud_api_client.cli.client import DEFAULT_BASE_URL
+from lambda_ai_cloud_api_client.cli.watch import InstanceEvent, diff_instances, watch_instances
+from lambda_ai_cloud_api_client.models import Instance
+
+DATA_FOLDER = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def m_response() -> dict:
+    f = DATA_FOLDER / "m_instances_response.json"
+    return json.loads(f.read_text())
+
+
+def test_diff_instances(m_response: dict) -> None:
+    booting = dict(m_response["data"][0], status="booting")
+    booting.pop("ip")
+    active = dict(m_response["data"][0], status="active")
+    other = dict(m_response["data"][0], id="other", name="other")
+
+    previous = {"0920582c7ff041399e34823a0be62549": Instance.from_dict(booting), "other": Instance.from_dict(other)}
+    current = {"0920582c7ff041399e34823a0be62549": Instance.from_dict(active)}
+
+    assert diff_instances(previous, current) == [
+        InstanceEvent("status", "0920582c7ff041399e34823a0be62549", "My Instance", "booting -> active"),
+        InstanceEvent("ip", "0920582c7ff041399e34823a0be62549", "My Instance", "198.51.100.2"),
+        InstanceEvent("terminated", "other", "other", "booting"),
+    ]
+
+
+def test_watch_instances_logs_events(httpx_mock, monkeypatch, m_response: dict) -> None:
+    async def _no_sleep(*_args, **_kwargs) -> None:
+        return None
+
+    monkeypatch.setattr("lambda_ai_cloud_api_client.cli.watch.asyncio.sleep", _no_sleep)
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/instances", json={"data": []})
+    httpx_mock.add_response(method="GET", url=f"{DEFAULT_BASE_URL}/api/v1/instances", json=m_response)
+    events_log = StringIO()
+
+    watch_instances(region=(), status=(), interval_seconds=0, events_log=events_log, ticks=2)
+
+    events = [json.loads(line) for line in events_log.getvalue().splitlines()]
+    assert [(e["kind"], e["instance_id"]) for e in events] == [("launched", "0920582c7ff041399e34823a0be62549")]
+
+
+class _RecordingLive:
+    def __init__(self, table, console=None, auto_refresh=True) -> None:
+        self.tables, self.console, self.refreshes, self.captions = [table], console, 0, []
+        _RecordingLive.last = self
+
+    def __enter__(self) -> "_RecordingLive":
+        return self
+
+    def __exit__(self, *_args) -> None:
+        return None
+
+    def update(self, table) -> None:
+        self.tables.append(table)
+
+    def refresh(self) -> None:
+        self.refreshes += 1
+        caption = self.tables[-1].caption
+        self.captions.append(caption and caption.plain)
+
+
+def test_watch_instances_updates_changed_rows(httpx_mock, monkeypatch, m_response: dict) -> None:
+    async def _no_sleep(*_args, **_kwargs) -> None:
+        return None
+
+    monkeypatch.setattr("lambda_ai_cloud_api_client.cli.watch.asyncio.sleep", _no_sleep)
+    monkeypatch.setattr("lambda_ai_cloud_api_client.cli.watch.Live", _RecordingLive)
+    other = dict(m_response["data"][0], id="other", name="other")
+    url = f"{DEFAULT_BASE_URL}/api/v1/instances"
+    httpx_mock.add_response(method="GET", url=url, json={"data": [m_response["data"][0], other]})
+    httpx_mock.add_response(method="GET", url=url, json={"data": [dict(m_response["data"][0], status="active"), other]})
+    httpx_mock.add_response(method="GET", url=url, json={"data": [dict(m_response["data"][0], status="active"), other]})
+    httpx_mock.add_response(method="GET", url=url, json={"data": [other]})
+    events_log = StringIO()
+    events_log.name = "<stdout>"
+
+    watch_instances(region=(), status=(), interval_seconds=0, events_log=events_log, ticks=4)
+
+    live = _RecordingLive.last
+    # Events go to stdout, so the table is drawn on stderr.
+    assert live.console.stderr
+    # The status change is written into the existing table, only the termination builds a new one.
+    first, last = live.tables
+    assert first.row_count == 2 and last.row_count == 1
+    assert [cell.plain for cell in first.columns[3].cells] == ["active", "booting"]
+    assert live.refreshes == 3
+
+
+def test_watch_instances_survives_failed_polls(httpx_mock, monkeypatch, m_response: dict) -> None:
+    async def _no_sleep(*_args, **_kwargs) -> None:
+        return None
+
+    monkeypatch.setattr("lambda_ai_cloud_api_client.cli.watch.asyncio.sleep", _no_sleep)
+    monkeypatch.setattr("lambda_ai_cloud_api_client.cli.watch.Live", _RecordingLive)
+    url = f"{DEFAULT_BASE_URL}/api/v1/instances"
+    httpx_mock.add_response(method="GET", url=url, json={"data": []})
+    httpx_mock.add_exception(httpx.ReadTimeout("timed out"), method="GET", url=url)
+    httpx_mock.add_response(method="GET", url=url, status_code=500, text="oops")
+    httpx_mock.add_response(method="GET", url=url, json=m_response)
+    events_log = StringIO()
+
+    watch_instances(region=(), status=(), interval_seconds=5, events_log=events_log, ticks=4)
+
+    live = _RecordingLive.last
+    # The last snapshot stays up with the error below it, the next successful poll clears it.
+    assert [caption and caption[8:] for caption in live.captions] == [
+        None,
+        " listing instances failed (timed out), retrying in 5s",
+        " listing instances failed (HTTP 500), retrying in 5s",
+        None,
+    ]
+    assert live.tables[-1].row_count == 1
+    events = [json.loads(line) for line in events_log.getvalue().splitlines()]
+    assert [e["kind"] for e in events] == ["launched"]
@@ -0,0 +1,61 @@
+import json
+from functools import partial
+from pathlib import Path
+
+import httpx
+import pytest
+
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.mock import (
+    MockApiTransport,
+    MockCloud,
+    MockServer,
+    RecordingTransport,
+    ReplayMiss,
+    ReplayTransport,
+    load_recording,
+)
+
+
+def test_record_then_replay(tmp_path: Path):
+    path = tmp_path / "session.jsonl"
+    recording = AuthenticatedClient(
+        base_url="https://cloud.example.com",
+        token="secret-token",
+        httpx_args={"transport": MockApiTransport(MockCloud(instances=3))},
+        transport_wrappers=(partial(RecordingTransport, path=path),),
+    ).get_httpx_client()
+    recorded = recording.get("/api/v1/instances")
+    recording.post("/api/v1/ssh-keys", json={"name": "new", "public_key": "ssh-ed25519 AAAA"})
+    recording.post("/api/v1/ssh-keys", json={"name": "new", "public_key": "ssh-ed25519 AAAA"})
+
+    records = load_recording(path)
+    assert [(r["method"], r["target"], r["status_code"]) for r in records] == [
+        ("GET", "/api/v1/instances", 200),
+        ("POST", "/api/v1/ssh-keys", 200),
+        ("POST", "/api/v1/ssh-keys", 400),
+    ]
+    assert "secret-token" not in path.read_text()
+
+    replay = httpx.Client(transport=ReplayTransport(path), base_url="https://elsewhere.example.com")
+    assert replay.get("/api/v1/instances").json() == recorded.json()
+    # Identical requests get the recorded responses in order, then the last one again.
+    statuses = [replay.post("/api/v1/ssh-keys", json={"name": "new", "public_key": "ssh-ed25519 AAAA"}) for _ in "abc"]
+    assert [r.status_code for r in statuses] == [200, 400, 400]
+
+    with pytest.raises(ReplayMiss):
+        replay.get("/api/v1/images")
+    lenient = httpx.Client(transport=ReplayTransport(records, strict=False), base_url="https://x.example.com")
+    assert lenient.get("/api/v1/images").status_code == 404
+
+
+def test_mock_server_serves_over_http():
+    with MockServer(MockApiTransport(MockCloud(instances=5))) as server:
+        client = AuthenticatedClient(base_url=server.base_url, token="mock").get_httpx_client()
+        response = client.get("/api/v1/instances")
+        unauthenticated = httpx.get(f"{server.base_url}/api/v1/instances")
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 5
+    assert unauthenticated.status_code == 401
+    assert json.loads(unauthenticated.content)["error"]["code"] == "global/invalid-api-key"
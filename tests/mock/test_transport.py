@@ -0,0 +1,164 @@
+import asyncio
+import base64
+import time
+
+import httpx
+
+from lambda_ai_cloud_api_client.api.audit_events import get_audit_events
+from lambda_ai_cloud_api_client.api.images import list_images
+from lambda_ai_cloud_api_client.api.instances import (
+    get_instance,
+    launch_instance,
+    list_instance_types,
+    list_instances,
+    terminate_instance,
+)
+from lambda_ai_cloud_api_client.api.ssh_keys import list_ssh_keys
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.mock import MockApiTransport, MockCloud
+from lambda_ai_cloud_api_client.models import InstanceLaunchRequest, InstanceTerminateRequest, PublicRegionCode
+from lambda_ai_cloud_api_client.types import UNSET
+
+
+def _client(transport: MockApiTransport) -> AuthenticatedClient:
+    return AuthenticatedClient(
+        base_url="https://cloud.example.com",
+        token="mock",
+        httpx_args={"transport": transport},
+        raise_on_unexpected_status=True,
+    )
+
+
+def test_generated_api_parses_mock_payloads():
+    client = _client(MockApiTransport(MockCloud(instances=500, seed=1)))
+
+    instances = list_instances.sync(client=client)
+    assert len(instances.data) == 500
+    assert all(i.status == "active" and i.ip for i in instances.data)
+    assert list_instance_types.sync(client=client).data.additional_properties
+    assert list_images.sync(client=client).data
+    assert [k.name for k in list_ssh_keys.sync(client=client).data] == ["laptop", "ci"]
+
+
+def test_same_seed_serves_identical_payloads():
+    first = _client(MockApiTransport(MockCloud(instances=20, seed=3))).get_httpx_client().get("/api/v1/instances")
+    second = _client(MockApiTransport(MockCloud(instances=20, seed=3))).get_httpx_client().get("/api/v1/instances")
+
+    assert first.content == second.content
+
+
+def test_launch_get_terminate():
+    cloud = MockCloud(seed=2, capacity=1.0, boot_seconds=60)
+    client = _client(MockApiTransport(cloud))
+
+    launched = launch_instance.sync(
+        client=client,
+        body=InstanceLaunchRequest(
+            region_name=PublicRegionCode.US_WEST_1, instance_type_name="gpu_1x_a10", ssh_key_names=["ci"]
+        ),
+    )
+    (instance_id,) = launched.data.instance_ids
+
+    instance = get_instance.sync(instance_id, client=client).data
+    assert instance.status == "booting"
+    assert instance.ip is UNSET
+
+    terminated = terminate_instance.sync(client=client, body=InstanceTerminateRequest(instance_ids=[instance_id]))
+    assert [i.id for i in terminated.data.terminated_instances] == [instance_id]
+    assert get_instance.sync_detailed(instance_id, client=client).status_code == 404
+
+
+def test_launch_unknown_ssh_key_is_an_api_error():
+    client = _client(MockApiTransport(MockCloud(capacity=1.0))).get_httpx_client()
+
+    response = client.post(
+        "/api/v1/instance-operations/launch",
+        json={"region_name": "us-west-1", "instance_type_name": "gpu_1x_a10", "ssh_key_names": ["nope"]},
+    )
+
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "global/object-does-not-exist"
+
+
+def test_generated_api_parses_mock_errors():
+    client = _client(MockApiTransport(MockCloud(capacity=1.0)))
+
+    for ssh_key_names, instance_type_name in ((["nope"], "gpu_1x_a10"), (["ci"], "gpu_9x_nope")):
+        response = launch_instance.sync(
+            client=client,
+            body=InstanceLaunchRequest(
+                region_name=PublicRegionCode.US_WEST_1,
+                instance_type_name=instance_type_name,
+                ssh_key_names=ssh_key_names,
+            ),
+        )
+        assert response.error.code == "global/object-does-not-exist"
+        assert response.error.suggestion
+
+    unauthenticated = AuthenticatedClient(base_url="https://cloud.example.com", token="", prefix="")
+    unauthenticated.set_httpx_client(httpx.Client(transport=MockApiTransport(), base_url="https://cloud.example.com"))
+    assert list_instances.sync(client=unauthenticated).error.suggestion
+
+
+def test_unauthenticated_requests_get_401():
+    client = httpx.Client(transport=MockApiTransport(), base_url="https://cloud.example.com")
+
+    response = client.get("/api/v1/instances")
+
+    assert response.status_code == 401
+    assert response.json()["error"]["code"] == "global/invalid-api-key"
+
+
+def test_unknown_path_and_method():
+    client = _client(MockApiTransport()).get_httpx_client()
+
+    assert client.get("/api/v1/nope").status_code == 404
+    assert client.delete("/api/v1/instances").status_code == 405
+
+
+def test_error_rate_and_rate_limit():
+    failing = _client(MockApiTransport(error_rate=1.0)).get_httpx_client()
+    assert failing.get("/api/v1/instances").json()["error"]["code"] == "global/internal-error"
+
+    limited = _client(MockApiTransport(rate_limit=2)).get_httpx_client()
+    statuses = [limited.get("/api/v1/instances").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+
+
+def test_latency_is_added_to_sync_and_async_requests():
+    transport = MockApiTransport(latency=0.05)
+
+    started = time.perf_counter()
+    _client(transport).get_httpx_client().get("/api/v1/images")
+    assert time.perf_counter() - started >= 0.05
+
+    async def run() -> list[httpx.Response]:
+        async with _client(transport).get_async_httpx_client() as client:
+            return await asyncio.gather(*(client.get("/api/v1/images") for _ in range(10)))
+
+    started = time.perf_counter()
+    responses = asyncio.run(run())
+    # Concurrent requests wait out their latency in parallel.
+    assert time.perf_counter() - started < 0.25
+    assert {r.status_code for r in responses} == {200}
+    assert transport.request_count == 11
+
+
+def test_audit_events_are_paginated_and_filtered():
+    client = _client(MockApiTransport(MockCloud(audit_events=250)))
+
+    events, page_token, pages = [], UNSET, 0
+    while True:
+        page = get_audit_events.sync(client=client, page_token=page_token).data
+        events.extend(page.events)
+        pages += 1
+        if not page.page_token:
+            break
+        page_token = page.page_token
+    assert (len(events), pages) == (250, 3)
+    assert len({e.event_id for e in events}) == 250
+    assert base64.b64decode(client.get_httpx_client().get("/api/v1/audit-events").json()["data"]["page_token"])
+
+    instances = get_audit_events.sync(client=client, resource_type="cloud.instance").data.events
+    assert instances
+    assert {e.resource_name for e in instances} == {"instance"}
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+import pytest
+
+from lambda_ai_cloud_api_client.audit import (
+    aiter_audit_events,
+    export_audit_events,
+    iter_audit_event_pages,
+    iter_audit_events,
+    shard_time_range,
+)
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.errors import HttpError
+from lambda_ai_cloud_api_client.mock import MockApiTransport, MockCloud
+
+
+def _client(transport: MockApiTransport) -> AuthenticatedClient:
+    return AuthenticatedClient(base_url="https://cloud.example.com", token="mock", httpx_args={"transport": transport})
+
+
+@pytest.mark.parametrize("prefetch", (True, False), ids=("prefetch", "serial"))
+def test_iter_audit_events_follows_page_tokens(prefetch):
+    cloud = MockCloud(audit_events=250)
+    transport = MockApiTransport(cloud)
+
+    events = list(iter_audit_events(_client(transport), prefetch=prefetch))
+
+    assert [e.event_id for e in events] == [e["event_id"] for e in cloud.audit_events]
+    assert transport.request_count == 3
+
+
+def test_iter_audit_events_filters():
+    cloud = MockCloud(audit_events=300)
+    start = datetime(2025, 10, 15, tzinfo=timezone.utc)
+
+    events = list(iter_audit_events(_client(MockApiTransport(cloud)), start=start, resource_type="cloud.instance"))
+
+    assert events
+    assert all(e.resource_name == "instance" and e.event_time >= "2025-10-15" for e in events)
+
+
+def test_next_page_is_prefetched_and_abandoned_pages_are_not():
+    transport = MockApiTransport(MockCloud(audit_events=1000), latency=0.01)
+    pages = iter_audit_event_pages(_client(transport))
+
+    next(pages)
+    deadline = time.monotonic() + 5
+    while transport.request_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert transport.request_count == 2
+
+    pages.close()
+    time.sleep(0.05)
+    assert transport.request_count == 2
+
+
+def test_iter_audit_events_raises_api_errors():
+    with pytest.raises(HttpError):
+        next(iter_audit_events(_client(MockApiTransport(error_rate=1.0))))
+
+
+def test_aiter_audit_events():
+    cloud = MockCloud(audit_events=250)
+    transport = MockApiTransport(cloud, latency=0.01)
+
+    async def first(n: int) -> list[str]:
+        return [e.event_id async for e in aiter_audit_events(_client(transport))][:n]
+
+    async def take(n: int) -> list[str]:
+        ids = []
+        async for event in aiter_audit_events(_client(transport)):
+            ids.append(event.event_id)
+            if len(ids) == n:
+                break
+        return ids
+
+    assert asyncio.run(first(250)) == [e["event_id"] for e in cloud.audit_events]
+    assert transport.request_count == 3
+    assert asyncio.run(take(5)) == [e["event_id"] for e in islice(cloud.audit_events, 5)]
+
+
+def test_shard_time_range():
+    start = datetime(2025, 10, 1, tzinfo=timezone.utc)
+
+    shards = shard_time_range(start, start + timedelta(hours=60), timedelta(days=1))
+
+    assert shards == [
+        (start, start + timedelta(days=1)),
+        (start + timedelta(days=1), start + timedelta(days=2)),
+        (start + timedelta(days=2), start + timedelta(hours=60)),
+    ]
+
+
+def test_export_audit_events_matches_serial_order_without_duplicates():
+    # One event per 6 hours, so events sit exactly on the day boundaries that both neighbouring shards include.
+    cloud = MockCloud(audit_events=120, audit_page_size=3)
+    transport = MockApiTransport(cloud, latency=0.01)
+    start = datetime(2025, 10, 2, tzinfo=timezone.utc)
+
+    exported = list(export_audit_events(_client(transport), start, cloud.now, shard_duration=timedelta(days=1)))
+
+    expected = [e["event_id"] for e in cloud.audit_events]
+    assert [e.event_id for e in exported] == expected
+    assert [e.event_time for e in exported] == sorted(e.event_time for e in exported)
+
+
+def test_export_audit_events_fetches_shards_concurrently():
+    cloud = MockCloud(audit_events=200, audit_page_size=10)
+    start = datetime(2025, 10, 2, tzinfo=timezone.utc)
+    serial = MockApiTransport(cloud, latency=0.02)
+    parallel = MockApiTransport(cloud, latency=0.02)
+
+    started = time.perf_counter()
+    assert len(list(iter_audit_events(_client(serial), start, cloud.now, prefetch=False))) == 200
+    serial_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    exported = export_audit_events(
+        _client(parallel), start, cloud.now, shard_duration=timedelta(days=3), max_workers=10
+    )
+    assert len(list(exported)) == 200
+    assert time.perf_counter() - started < serial_seconds / 2
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lambda_ai_cloud_api_client.mock import MockCloud
+from lambda_ai_cloud_api_client.models import AuditEvent
+
+pa = pytest.importorskip("pyarrow")
+archive = pytest.importorskip("lambda_ai_cloud_api_client.audit.archive")
+
+
+@pytest.fixture
+def cloud() -> MockCloud:
+    return MockCloud(audit_events=3000)
+
+
+@pytest.fixture
+def root(cloud, tmp_path):
+    archive.write_audit_archive((AuditEvent.from_dict(e) for e in cloud.audit_events), tmp_path)
+    return tmp_path
+
+
+def test_archive_round_trips_events(cloud, root):
+    events = [e.to_dict() for e in archive.iter_audit_archive(root)]
+
+    assert events == cloud.audit_events
+
+
+def test_archive_is_partitioned_by_day_and_resource(root):
+    partitions = {p.relative_to(root).parent.as_posix() for p in root.rglob("*.parquet")}
+
+    assert "date=2025-10-02/resource_name=instance" in partitions
+    assert len(partitions) == 30 * 5
+
+
+def test_archive_column_encodings(root):
+    schema = archive.read_audit_archive(root).schema
+
+    assert pa.types.is_dictionary(schema.field("service_name").type)
+    assert pa.types.is_dictionary(schema.field("action").type)
+    assert schema.field("additional_details").type == pa.string()
+
+
+def test_read_audit_archive_prunes_partitions(cloud, root):
+    start, end = datetime(2025, 10, 20, tzinfo=timezone.utc), datetime(2025, 10, 21, 23, tzinfo=timezone.utc)
+
+    fragments = list(
+        archive.audit_archive_dataset(root).get_fragments(
+            filter=archive._filter(start, end, "cloud.instance", None, None)
+        )
+    )
+    table = archive.read_audit_archive(root, start=start, end=end, resource_type="cloud.instance", action="launched")
+
+    assert len(fragments) == 2
+    expected = [
+        e["event_id"]
+        for e in cloud.audit_events
+        if "2025-10-20" <= e["event_time"] <= "2025-10-21T23"
+        and e["resource_name"] == "instance"
+        and e["action"] == "launched"
+    ]
+    assert expected
+    assert table.column("event_id").to_pylist() == expected
+
+
+def test_read_audit_archive_by_actor(cloud, root):
+    event = cloud.audit_events[1234]
+
+    assert [e.to_dict() for e in archive.iter_audit_archive(root, actor=event["actor_lrn"])] == [event]
+
+
+def test_archive_appends(cloud, root):
+    archive.write_audit_archive([AuditEvent.from_dict(cloud.audit_events[0])], root)
+
+    assert archive.read_audit_archive(root, columns=["event_id"]).num_rows == 3001
+
+
+def test_archive_more_partitions_than_a_batch_may_span(cloud, tmp_path):
+    # 210 days of the 5 resource types is more than write_dataset's default max_partitions (1024).
+    templates = {e["resource_name"]: e for e in cloud.audit_events}
+    start = datetime(2024, 9, 1, tzinfo=timezone.utc)
+    events = [
+        {**event, "event_id": f"{day}-{resource}", "event_time": (start + timedelta(days=day)).isoformat()[:19] + "Z"}
+        for day in range(210)
+        for resource, event in sorted(templates.items())
+    ]
+
+    archive.write_audit_archive((AuditEvent.from_dict(e) for e in events), tmp_path)
+
+    assert len({p.parent for p in tmp_path.rglob("*.parquet")}) == 1050
+    assert [e.event_id for e in archive.iter_audit_archive(tmp_path)] == [e["event_id"] for e in events]
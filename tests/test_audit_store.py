@@ -0,0 +1,125 @@
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from lambda_ai_cloud_api_client.audit import AuditStore, default_audit_db_path
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.errors import HttpError
+from lambda_ai_cloud_api_client.mock import MockApiTransport, MockCloud
+from lambda_ai_cloud_api_client.models import AuditEvent
+
+
+def _client(transport: MockApiTransport) -> AuthenticatedClient:
+    return AuthenticatedClient(base_url="https://cloud.example.com", token="mock", httpx_args={"transport": transport})
+
+
+@pytest.mark.parametrize("workers", (1, 4), ids=("serial", "sharded"))
+def test_sync_stores_every_event_once(workers):
+    cloud = MockCloud(audit_events=1200)
+
+    with AuditStore() as store:
+        added = store.sync(
+            _client(MockApiTransport(cloud)), since=datetime(2025, 9, 1, tzinfo=timezone.utc), max_workers=workers
+        )
+
+        assert added == len(store) == 1200
+        assert [e.event_id for e in store.query()] == [e["event_id"] for e in cloud.audit_events]
+        assert store.checkpoint() == (cloud.audit_events[-1]["event_time"], cloud.audit_events[-1]["event_id"])
+
+
+def test_sync_only_fetches_events_after_the_checkpoint():
+    cloud = MockCloud(audit_events=250)
+    transport = MockApiTransport(cloud)
+
+    with AuditStore() as store:
+        store.sync(_client(transport))
+        requests = transport.request_count
+
+        assert store.sync(_client(transport)) == 0
+        assert transport.request_count == requests + 1
+
+        cloud.now = cloud.now.replace(month=12)
+        cloud.add_audit_events(10)
+        assert store.sync(_client(transport)) == 10
+        assert len(store) == 260
+
+
+class _FailingTransport(MockApiTransport):
+    def __init__(self, cloud: MockCloud, fail_after: int) -> None:
+        super().__init__(cloud)
+        self.fail_after = fail_after
+
+    def respond(self, request):
+        if self.request_count >= self.fail_after:
+            return httpx.Response(500, json={})
+        return super().respond(request)
+
+
+def test_sync_resumes_after_a_failure(tmp_path):
+    cloud = MockCloud(audit_events=1200, audit_page_size=500)
+    path = tmp_path / "audit.sqlite"
+
+    with AuditStore(path) as store:
+        store.sync(_client(MockApiTransport(cloud)))
+        checkpoint = store.checkpoint()
+        cloud.now = cloud.now.replace(month=12)
+        cloud.add_audit_events(1200)
+        with pytest.raises(HttpError):
+            store.sync(_client(_FailingTransport(cloud, fail_after=2)))
+    with AuditStore(path) as store:
+        # The two pages the failed sync got are kept (the first one starts with the checkpoint event), the checkpoint
+        # only moves once a sync completes.
+        assert len(store) == 2199
+        assert store.checkpoint() == checkpoint
+
+        assert store.sync(_client(MockApiTransport(cloud))) == 201
+        assert len(store) == 2400
+        assert store.checkpoint() == (cloud.audit_events[-1]["event_time"], cloud.audit_events[-1]["event_id"])
+
+
+def test_add_moves_the_checkpoint_after_the_last_event(monkeypatch):
+    monkeypatch.setattr("lambda_ai_cloud_api_client.audit.store._BATCH_SIZE", 1)
+    cloud = MockCloud(audit_events=3)
+    newest, *older = (AuditEvent.from_dict(e) for e in reversed(cloud.audit_events))
+
+    def _events():
+        yield newest
+        raise HttpError(500, "")
+        yield from older
+
+    with AuditStore() as store:
+        with pytest.raises(HttpError):
+            store.add(_events())
+        # Older events may still be missing, the checkpoint must not skip past them.
+        assert len(store) == 1 and store.checkpoint() is None
+
+        assert store.add([newest, *older]) == 2
+        assert store.checkpoint() == (newest.event_time, newest.event_id)
+
+
+def test_query_filters():
+    cloud = MockCloud(audit_events=500)
+    event = cloud.audit_events[123]
+    since = datetime(2025, 10, 15, tzinfo=timezone.utc)
+
+    with AuditStore() as store:
+        store.sync(_client(MockApiTransport(cloud)))
+
+        assert [e.event_id for e in store.query(actor=event["actor_lrn"])] == [event["event_id"]]
+        assert [e.event_id for e in store.query(resource=event["resource_lrns"][0])] == [event["event_id"]]
+        launched = list(store.query(action="launched", resource_type="cloud.instance", since=since))
+        assert launched
+        assert all(e.action == "launched" and e.resource_name == "instance" for e in launched)
+        assert all(e.event_time >= "2025-10-15" for e in launched)
+        assert len(list(store.query(until=since, limit=7))) == 7
+        assert store.query(actor=event["actor_lrn"]).__next__().to_dict() == event
+
+
+def test_default_audit_db_path(monkeypatch, tmp_path):
+    monkeypatch.delenv("LAMBDA_CLOUD_AUDIT_DB", raising=False)
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    assert default_audit_db_path() == tmp_path / "lai" / "audit.sqlite"
+
+    monkeypatch.setenv("LAMBDA_CLOUD_AUDIT_DB", str(tmp_path / "other.sqlite"))
+    assert default_audit_db_path() == tmp_path / "other.sqlite"
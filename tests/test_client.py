@@ -1,4 +1,5 @@
 import httpx
+import pytest
 
 from lambda_ai_cloud_api_client.client import AuthenticatedClient, Client
 
@@ -63,3 +64,47 @@ def test_authenticated_client_context_and_prefixless_token():
     auth_client.set_async_httpx_client(httpx.AsyncClient())
     auth_client.with_timeout(httpx.Timeout(3.0))
     assert auth_client.get_async_httpx_client().timeout.read == 3.0
+
+
+def test_client_http2_and_limits():
+    pytest.importorskip("h2")
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=2, keepalive_expiry=30.0)
+    auth_client = AuthenticatedClient(base_url="https://api.example.com", token="secret", http2=True, limits=limits)
+
+    pool = auth_client.get_async_httpx_client()._transport._pool
+    assert pool._http2 is True
+    assert pool._max_connections == 4
+    assert pool._max_keepalive_connections == 2
+    assert pool._keepalive_expiry == 30.0
+
+
+def test_client_transport_wrappers():
+    wrapped = []
+
+    def wrapper(transport):
+        wrapped.append(transport)
+        return transport
+
+    auth_client = AuthenticatedClient(base_url="https://api.example.com", token="secret", transport_wrappers=(wrapper,))
+    assert auth_client.get_httpx_client()._transport is wrapped[0]
+    assert isinstance(wrapped[0], httpx.HTTPTransport)
+    assert auth_client.get_async_httpx_client()._transport is wrapped[1]
+    assert isinstance(wrapped[1], httpx.AsyncHTTPTransport)
+
+
+@pytest.mark.parametrize("transport_wrappers", [(), (lambda transport: transport,)])
+def test_client_httpx_args_override(transport_wrappers):
+    limits = httpx.Limits(max_connections=4, max_keepalive_connections=2, keepalive_expiry=30.0)
+    auth_client = AuthenticatedClient(
+        base_url="https://api.example.com",
+        token="secret",
+        httpx_args={"limits": limits, "http1": False, "trust_env": False, "retries": 2},
+        transport_wrappers=transport_wrappers,
+    )
+
+    for client in (auth_client.get_httpx_client(), auth_client.get_async_httpx_client()):
+        assert client.trust_env is False
+        pool = client._transport._pool
+        assert pool._max_connections == 4
+        assert pool._http1 is False
+        assert pool._retries == 2
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lambda_ai_cloud_api_client.cost import Budget, CostStore, Launch, default_cost_db_path
+from lambda_ai_cloud_api_client.mock import MockCloud
+from lambda_ai_cloud_api_client.models import Instance
+
+T0 = datetime(2025, 11, 1, tzinfo=timezone.utc)
+
+
+def _instances(cloud: MockCloud) -> list[Instance]:
+    return [Instance.from_dict(cloud.instance_payload(i)) for i in cloud.instances.values()]
+
+
+@pytest.fixture
+def cloud() -> MockCloud:
+    cloud = MockCloud()
+    # $0.75/hr and $23.92/hr
+    cloud.add_instances(1, "gpu_1x_a10", "us-east-1", "small", tags=[{"key": "team", "value": "research"}])
+    cloud.add_instances(
+        1,
+        "gpu_8x_h100_sxm5",
+        "us-east-1",
+        "big",
+        tags=[{"key": "team", "value": "research"}, {"key": "budget", "value": "100"}],
+    )
+    return cloud
+
+
+def test_sample_accumulates_cost_between_samples(cloud):
+    with CostStore() as store:
+        first = store.sample(_instances(cloud), T0)
+        assert (first.instances, first.cents_per_hour, first.cost_cents) == (2, 75 + 2392, 0)
+
+        second = store.sample(_instances(cloud), T0 + timedelta(hours=2))
+        assert second.cost_cents == pytest.approx(2 * (75 + 2392))
+        assert store.last_sample() == T0 + timedelta(hours=2)
+
+        # A missed sample is still charged, the instances kept running in between.
+        store.sample(_instances(cloud), T0 + timedelta(hours=5))
+        assert [(r.key, r.cost_cents) for r in store.report()] == [("big", 5 * 2392), ("small", 5 * 75)]
+
+
+def test_sample_closes_terminated_instances(cloud):
+    with CostStore() as store:
+        store.sample(_instances(cloud), T0)
+        big = next(id for id, i in cloud.instances.items() if i["name"] == "big")
+        small = next(id for id in cloud.instances if id != big)
+        cloud.terminate([big, small])
+
+        # Charged up to the termination time when the audit log has it, not at all otherwise.
+        sample = store.sample([], T0 + timedelta(hours=3), terminations={big: T0 + timedelta(hours=1)})
+        assert (sample.instances, sample.cost_cents) == (0, 2392)
+        assert [(r.key, r.running) for r in store.report()] == [("big", 0), ("small", 0)]
+
+        store.sample([], T0 + timedelta(hours=4))
+        assert store.report()[0].cost_cents == 2392
+
+
+def test_sample_charges_from_the_launch_time(cloud):
+    instances = _instances(cloud)
+    launches = {instances[0].id: Launch(T0 - timedelta(hours=4), "lrn:cloud:identity:alice")}
+
+    with CostStore() as store:
+        store.sample(instances, T0, launches=launches)
+
+        assert [(r.key, r.cost_cents) for r in store.report("user")] == [("lrn:cloud:identity:alice", 4 * 75), ("-", 0)]
+
+
+def test_report_groups(cloud):
+    with CostStore() as store:
+        store.sample(_instances(cloud), T0)
+        store.sample(_instances(cloud), T0 + timedelta(hours=1))
+
+        assert store.report("tag:team") == [("research", 2, 2, 2467, 2467)]
+        assert [r.key for r in store.report("tag:budget")] == ["100", "-"]
+        assert [r.key for r in store.report("type")] == ["gpu_8x_h100_sxm5", "gpu_1x_a10"]
+        assert store.report("region")[0].to_dict() == {
+            "key": "us-east-1",
+            "instances": 2,
+            "running": 2,
+            "cents_per_hour": 2467,
+            "cost_cents": 2467,
+        }
+        with pytest.raises(ValueError, match="Can't group costs by 'owner'"):
+            store.report("owner")
+
+
+def test_check_budgets(cloud):
+    with CostStore() as store:
+        store.sample(_instances(cloud), T0)
+        store.sample(_instances(cloud), T0 + timedelta(hours=4))
+        big = next(id for id, i in cloud.instances.items() if i["name"] == "big")
+
+        # big has cost $95.68 of its own $100.
+        assert store.check_budgets() == []
+        assert store.check_budgets([Budget("team", "research", 90_00)]) == [
+            ("team=research", 4 * 2467, 90_00, tuple(sorted(cloud.instances)))
+        ]
+        assert store.check_budgets([Budget("team", "serving", 0)]) == [("team=serving", 0, 0, ())]
+
+        store.sample(_instances(cloud), T0 + timedelta(hours=5))
+        assert store.check_budgets() == [("budget=100 on big", 5 * 2392, 100_00, (big,))]
+
+
+def test_store_persists(tmp_path, cloud):
+    path = tmp_path / "nested" / "cost.sqlite"
+    with CostStore(path) as store:
+        store.sample(_instances(cloud), T0)
+    with CostStore(path) as store:
+        store.sample(_instances(cloud), T0 + timedelta(hours=1))
+        assert len(store) == 2
+        assert sum(r.cost_cents for r in store.report()) == pytest.approx(2467)
+
+
+def test_default_cost_db_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("LAMBDA_CLOUD_COST_DB", str(tmp_path / "costs.db"))
+    assert default_cost_db_path() == tmp_path / "costs.db"
+    monkeypatch.delenv("LAMBDA_CLOUD_COST_DB")
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path))
+    assert default_cost_db_path() == tmp_path / "lai" / "cost.sqlite"
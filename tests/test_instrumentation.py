@@ -0,0 +1,127 @@
+import asyncio
+
+import httpx
+import pytest
+
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.instrumentation import (
+    CACHE_MISS,
+    DECODE,
+    REQUEST_END,
+    REQUEST_START,
+    Event,
+    Histogram,
+    Instrumentation,
+    MetricsCollector,
+    opentelemetry_hook,
+    operation_name,
+)
+from lambda_ai_cloud_api_client.transport import ConditionalGetTransport
+from lambda_ai_cloud_api_client.transport.cache import CachedResponse
+
+
+def _client(handler, instrumentation: Instrumentation, *wrappers) -> AuthenticatedClient:
+    return AuthenticatedClient(
+        base_url="https://api.example.com",
+        token="secret",
+        httpx_args={"transport": httpx.MockTransport(handler)},
+        transport_wrappers=wrappers,
+        instrumentation=instrumentation,
+    )
+
+
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/api/v1/instances", "GET /instances"),
+        ("GET", "/api/v1/instances/0920582c7ff041399e34823a0be62549", "GET /instances/{id}"),
+        ("POST", "/api/v1/instance-operations/launch", "POST /instance-operations/launch"),
+        ("DELETE", "/api/v1/ssh-keys/ddf9a910ceb744a0bb95242cbba6cb50", "DELETE /ssh-keys/{id}"),
+    ],
+)
+def test_operation_name(method: str, path: str, expected: str):
+    assert operation_name(httpx.Request(method, f"https://api.example.com{path}")) == expected
+
+
+def test_events_and_collector():
+    instrumentation = Instrumentation()
+    collector = MetricsCollector().attach(instrumentation)
+    kinds = []
+    instrumentation.on("*", lambda event: kinds.append(event.kind))
+
+    @instrumentation.on(REQUEST_END)
+    def _end(event: Event) -> None:
+        assert event.decode_duration is not None
+
+    client = _client(
+        lambda request: httpx.Response(200, json={"data": [1, 2]}),
+        instrumentation,
+        ConditionalGetTransport,
+    )
+    response = client.get_httpx_client().get("/api/v1/instances")
+
+    assert response.json() == {"data": [1, 2]}
+    assert kinds == [REQUEST_START, CACHE_MISS, DECODE, REQUEST_END]
+    assert collector.requests == {("GET /instances", "200"): 1}
+    assert collector.cache == {("GET /instances", "miss"): 1}
+    assert collector.response_bytes["GET /instances"] == len(response.content)
+    assert collector.durations["GET /instances"].count == 1
+
+    text = collector.to_prometheus()
+    assert "# TYPE lai_client_request_duration_seconds histogram" in text
+    assert 'lai_client_request_duration_seconds_bucket{operation="GET /instances",le="+Inf"} 1' in text
+    assert 'lai_client_requests_total{operation="GET /instances",status="200"} 1' in text
+    assert 'lai_client_cache_total{operation="GET /instances",result="miss"} 1' in text
+
+
+def test_async_errors_are_recorded():
+    instrumentation = Instrumentation()
+    collector = MetricsCollector().attach(instrumentation)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("down", request=request)
+
+    async def get() -> None:
+        await _client(handler, instrumentation).get_async_httpx_client().get("/api/v1/images")
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(get())
+
+    (call,) = collector.calls
+    assert isinstance(call.error, httpx.ConnectError)
+    assert collector.requests == {("GET /images", "error"): 1}
+
+
+def test_unknown_event_kind():
+    with pytest.raises(ValueError, match="Unknown event kind"):
+        Instrumentation().on("request", print)
+
+
+def test_histogram():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.6, 5.0):
+        histogram.observe(value)
+    assert histogram.counts == [1, 3]
+    assert histogram.count == 4
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(0.99) is None
+
+
+def test_opentelemetry_hook():
+    pytest.importorskip("opentelemetry")
+    assert callable(opentelemetry_hook())
+
+
+def test_bodies_are_only_decoded_for_decode_hooks():
+    instrumentation = Instrumentation()
+    ends = []
+    instrumentation.on(REQUEST_END, ends.append)
+    client = _client(lambda request: httpx.Response(200, json={"data": [1, 2]}), instrumentation)
+
+    response = client.get_httpx_client().get("/api/v1/instances")
+
+    # Nobody asked for decode times, the body wasn't copied or decoded.
+    assert not isinstance(response, CachedResponse)
+    assert ends[0].decode_duration is None
+    assert instrumentation.listens() and instrumentation.listens(REQUEST_END) and not instrumentation.listens(DECODE)
+    assert not Instrumentation().listens()
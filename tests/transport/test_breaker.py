@@ -0,0 +1,167 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.errors import CircuitOpenError
+from lambda_ai_cloud_api_client.transport import (
+    HEDGED_HEADER,
+    CircuitBreaker,
+    CircuitBreakerTransport,
+    HedgingTransport,
+    LatencyTracker,
+    endpoint_group,
+)
+from lambda_ai_cloud_api_client.transport.breaker import CLOSED, HALF_OPEN, OPEN
+
+
+def _client(handler, *wrappers) -> AuthenticatedClient:
+    return AuthenticatedClient(
+        base_url="https://api.example.com",
+        token="secret",
+        httpx_args={"transport": httpx.MockTransport(handler)},
+        transport_wrappers=wrappers,
+    )
+
+
+@pytest.mark.parametrize(
+    "path, group",
+    [
+        ("/api/v1/instances", "instances"),
+        ("/api/v1/instances/abc", "instances"),
+        ("/api/v1/instance-operations/launch", "instance-operations"),
+        ("/health", "health"),
+    ],
+)
+def test_endpoint_group(path: str, group: str):
+    assert endpoint_group(httpx.Request("GET", f"https://api.example.com{path}")) == group
+
+
+def test_breaker_opens_fails_fast_and_recovers(monkeypatch):
+    status = {"code": 503}
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(status["code"], json={})
+
+    breaker = CircuitBreaker(failure_threshold=3, recovery_seconds=10)
+    client = _client(handler, lambda t: CircuitBreakerTransport(t, breaker=breaker)).get_httpx_client()
+
+    for _ in range(3):
+        assert client.get("/api/v1/instances").status_code == 503
+    assert breaker.state("instances") == OPEN
+    with pytest.raises(CircuitOpenError, match="/instances"):
+        client.get("/api/v1/instances/abc")
+    # Other groups are not affected.
+    assert client.get("/api/v1/images").status_code == 503
+    assert len(calls) == 4
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert breaker.acquire("instances") is None
+    assert breaker.state("instances") == HALF_OPEN
+    # Only one probe at a time.
+    assert breaker.acquire("instances") == 0.0
+    breaker.record("instances", None)
+
+    status["code"] = 200
+    assert client.get("/api/v1/instances").status_code == 200
+    assert breaker.state("instances") == CLOSED
+
+
+def test_failed_probe_reopens(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("down", request=request)
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=10)
+    client = _client(handler, lambda t: CircuitBreakerTransport(t, breaker=breaker)).get_async_httpx_client()
+
+    async def probe() -> None:
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/api/v1/instances")
+
+    asyncio.run(probe())
+    assert breaker.state("instances") == OPEN
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    asyncio.run(probe())
+    assert breaker.state("instances") == OPEN
+
+
+def _tracker(seconds: float) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for _ in range(20):
+        tracker.record("instances", seconds)
+    return tracker
+
+
+def test_latency_tracker_quantile():
+    tracker = LatencyTracker(history=100)
+    for ms in range(1, 101):
+        tracker.record("instances", ms / 1000)
+    assert tracker.quantile("instances", 0.95) == pytest.approx(0.096)
+    assert tracker.quantile("images", 0.95) is None
+    assert tracker.quantile("instances", 0.95, min_samples=101) is None
+
+
+def test_async_hedge_wins_over_slow_primary():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(len(calls))
+        # The first request stalls, the hedge answers immediately.
+        await asyncio.sleep(5 if len(calls) == 1 else 0)
+        return httpx.Response(200, json={"data": []})
+
+    hedging = {}
+
+    def wrap(t):
+        hedging["t"] = HedgingTransport(t, min_delay=0.01, tracker=_tracker(0.01))
+        return hedging["t"]
+
+    async def get() -> httpx.Response:
+        return await _client(handler, wrap).get_async_httpx_client().get("/api/v1/instances")
+
+    start = time.monotonic()
+    response = asyncio.run(get())
+
+    assert time.monotonic() - start < 1
+    assert response.headers[HEDGED_HEADER] == "true"
+    assert len(calls) == 2
+
+
+def test_sync_hedge_and_non_get():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1:
+            time.sleep(0.5)
+        return httpx.Response(200, json={"data": []})
+
+    client = _client(handler, lambda t: HedgingTransport(t, min_delay=0.01, tracker=_tracker(0.01)))
+    response = client.get_httpx_client().get("/api/v1/instances")
+    assert response.headers[HEDGED_HEADER] == "true"
+    assert response.json() == {"data": []}
+
+    calls.clear()
+    client.get_httpx_client().post("/api/v1/instances")
+    assert calls == ["POST"]
+
+
+def test_no_hedge_without_history():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(200, json={})
+
+    transport = {}
+    client = _client(handler, lambda t: transport.setdefault("t", HedgingTransport(t, min_samples=5)))
+    for _ in range(5):
+        assert HEDGED_HEADER not in client.get_httpx_client().get("/api/v1/instances").headers
+    assert len(calls) == 5
+    assert transport["t"].tracker.quantile("instances", 0.95, min_samples=5) is not None
@@ -0,0 +1,93 @@
+import asyncio
+from functools import partial
+from pathlib import Path
+
+import httpx
+
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.transport import CACHE_STATUS_HEADER, ConditionalGetTransport, ValidatorCache
+
+BODY = b'{"data": [{"id": "a"}]}'
+
+
+def _client(handler, cache: ValidatorCache) -> AuthenticatedClient:
+    return AuthenticatedClient(
+        base_url="https://api.example.com",
+        token="secret",
+        httpx_args={"transport": httpx.MockTransport(handler)},
+        transport_wrappers=(partial(ConditionalGetTransport, cache=cache),),
+    )
+
+
+def test_etag_revalidation_serves_cached_body():
+    seen: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(200, headers={"etag": '"v1"'}, content=BODY)
+
+    client = _client(handler, ValidatorCache()).get_httpx_client()
+
+    first = client.get("/api/v1/images")
+    second = client.get("/api/v1/images")
+
+    assert seen == [None, '"v1"']
+    assert first.headers[CACHE_STATUS_HEADER] == "miss"
+    assert second.status_code == 200
+    assert second.headers[CACHE_STATUS_HEADER] == "revalidated"
+    assert second.content == BODY
+    assert second.json() == {"data": [{"id": "a"}]}
+
+
+def test_unchanged_body_without_validators_reuses_decoded_json():
+    client = _client(lambda request: httpx.Response(200, content=BODY), ValidatorCache()).get_httpx_client()
+
+    first = client.get("/api/v1/instance-types")
+    second = client.get("/api/v1/instance-types")
+    third = client.get("/api/v1/instance-types")
+
+    assert first.headers[CACHE_STATUS_HEADER] == "miss"
+    assert second.headers[CACHE_STATUS_HEADER] == "unchanged"
+    assert second.json() is third.json()
+
+
+def test_cache_is_keyed_by_token():
+    cache = ValidatorCache()
+    handler = lambda request: httpx.Response(200, headers={"etag": '"v1"'}, content=BODY)  # noqa: E731
+
+    _client(handler, cache).get_httpx_client().get("/api/v1/images")
+    other = AuthenticatedClient(
+        base_url="https://api.example.com",
+        token="other",
+        httpx_args={"transport": httpx.MockTransport(handler)},
+        transport_wrappers=(partial(ConditionalGetTransport, cache=cache),),
+    )
+
+    assert other.get_httpx_client().get("/api/v1/images").headers[CACHE_STATUS_HEADER] == "miss"
+
+
+def test_non_get_requests_pass_through():
+    client = _client(lambda request: httpx.Response(200, content=BODY), ValidatorCache()).get_httpx_client()
+
+    response = client.post("/api/v1/instance-operations/launch")
+
+    assert CACHE_STATUS_HEADER not in response.headers
+
+
+def test_async_revalidation_and_disk_cache(tmp_path: Path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-modified-since") == "Mon, 01 Jan 2024 00:00:00 GMT":
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"last-modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, content=BODY)
+
+    async def _get(cache: ValidatorCache) -> httpx.Response:
+        return await _client(handler, cache).get_async_httpx_client().get("/api/v1/images")
+
+    # A second process only shares the directory, not the in-memory cache.
+    assert asyncio.run(_get(ValidatorCache(directory=tmp_path))).headers[CACHE_STATUS_HEADER] == "miss"
+    response = asyncio.run(_get(ValidatorCache(directory=tmp_path)))
+
+    assert response.headers[CACHE_STATUS_HEADER] == "revalidated"
+    assert response.content == BODY
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from lambda_ai_cloud_api_client.client import AuthenticatedClient
+from lambda_ai_cloud_api_client.transport import COALESCED_HEADER, SingleFlightTransport
+
+BODY = b'{"data": {"id": "a"}}'
+
+
+def _client(handler, reuse_seconds: float = 0.0) -> AuthenticatedClient:
+    return AuthenticatedClient(
+        base_url="https://api.example.com",
+        token="secret",
+        httpx_args={"transport": httpx.MockTransport(handler)},
+        transport_wrappers=(lambda t: SingleFlightTransport(t, reuse_seconds=reuse_seconds),),
+    )
+
+
+def test_concurrent_async_gets_share_one_request():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, content=BODY)
+
+    async def burst() -> list[httpx.Response]:
+        client = _client(handler).get_async_httpx_client()
+        return await asyncio.gather(*(client.get("/api/v1/instances/a") for _ in range(10)))
+
+    responses = asyncio.run(burst())
+
+    assert calls == ["/api/v1/instances/a"]
+    assert sum(COALESCED_HEADER in r.headers for r in responses) == 9
+    assert all(r.json() is responses[0].json() for r in responses)
+
+
+def test_concurrent_threaded_gets_share_one_request():
+    calls = []
+    release = threading.Event()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        release.wait(1)
+        return httpx.Response(200, content=BODY)
+
+    client = _client(handler).get_httpx_client()
+    results: list[httpx.Response] = []
+    threads = [threading.Thread(target=lambda: results.append(client.get("/api/v1/instances"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert calls == ["/api/v1/instances"]
+    assert [r.status_code for r in results] == [200] * 5
+
+
+def test_reuse_window():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, content=BODY)
+
+    client = _client(handler, reuse_seconds=60).get_httpx_client()
+    client.get("/api/v1/instances")
+    assert client.get("/api/v1/instances").headers[COALESCED_HEADER] == "true"
+    client.get("/api/v1/images")
+    client.post("/api/v1/instances")
+    assert calls == ["/api/v1/instances", "/api/v1/images", "/api/v1/instances"]
+
+    # Without a window, sequential requests are all sent.
+    calls.clear()
+    client = _client(handler).get_httpx_client()
+    client.get("/api/v1/instances")
+    client.get("/api/v1/instances")
+    assert len(calls) == 2
+
+
+def test_errors_are_shared_and_not_reused():
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        raise httpx.ConnectError("boom", request=request)
+
+    async def burst() -> list:
+        client = _client(handler, reuse_seconds=60).get_async_httpx_client()
+        first = await asyncio.gather(*(client.get("/api/v1/instances") for _ in range(3)), return_exceptions=True)
+        with pytest.raises(httpx.ConnectError):
+            await client.get("/api/v1/instances")
+        return first
+
+    results = asyncio.run(burst())
+
+    assert all(isinstance(r, httpx.ConnectError) for r in results)
+    assert len(calls) == 2